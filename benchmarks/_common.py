@@ -0,0 +1,137 @@
+"""Shared helpers for the standalone benchmark scripts.
+
+Benchmarks run against the database configured in ``.env``. Every scenario
+seeds its data inside a transaction that is rolled back afterwards, so the
+database is left untouched.
+"""
+
+import json
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    """Make the project importable and initialise Django."""
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cropscience.settings")
+
+    import django
+
+    django.setup()
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed_crops(count, category_name="Benchmark"):
+    """Insert ``count`` synthetic crops in a single server-side statement.
+
+    Rows are generated by Postgres with ``generate_series`` so seeding does
+    not inflate the memory of the benchmark process itself.
+    """
+    from django.db import connection
+
+    from crops.models import CropCategory
+
+    category = CropCategory.objects.create(name=category_name)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO crops_crop (
+                name, scientific_name, category_id, description,
+                growth_duration_days, water_requirements, created_at, updated_at
+            )
+            SELECT
+                'Bench crop ' || g,
+                'Benchus cropus ' || g,
+                %s,
+                'Synthetic crop generated for benchmarking.',
+                30 + g %% 200,
+                (ARRAY['low', 'medium', 'high'])[1 + g %% 3],
+                now(),
+                now()
+            FROM generate_series(1, %s) AS g
+            """,
+            [category.id, count],
+        )
+    return category
+
+
+def benchmark_user():
+    """Create a throwaway user to authenticate benchmark requests."""
+    from django.contrib.auth.models import User
+
+    return User.objects.create_user(username="benchmark-user", password="unused-password")
+
+
+def sync_view(view):
+    """Return ``view`` callable from synchronous code, wrapping async views."""
+    from asgiref.sync import async_to_sync, iscoroutinefunction
+
+    return async_to_sync(view) if iscoroutinefunction(view) else view
+
+
+def call(url, body=None, token=None, parse=True):
+    """Send one request; return (status, parsed body, seconds taken).
+
+    With ``parse=False`` the body is returned as bytes, for non-JSON responses.
+    """
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    data = json.dumps(body).encode() if body is not None else None
+    started = time.perf_counter()
+    try:
+        with urlopen(Request(url, data=data, headers=headers)) as response:
+            status, payload = response.status, response.read()
+    except HTTPError as exc:
+        status, payload = exc.code, exc.read()
+    elapsed = time.perf_counter() - started
+    return status, json.loads(payload or b"null") if parse else payload, elapsed
+
+
+def run_clients(count, deadline, request):
+    """Run ``count`` threads calling ``request()`` until ``deadline``; return latencies and failures."""
+    latencies, failures, lock = [], [0], threading.Lock()
+
+    def client():
+        while time.monotonic() < deadline:
+            status, _, elapsed = request()
+            with lock:
+                if status < 400:
+                    latencies.append(elapsed * 1000)
+                else:
+                    failures[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, latencies, failures
+
+
+def percentile(values, pct):
+    """Return the ``pct`` percentile of ``values``."""
+    if not values:
+        return float("nan")
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def report(label, latencies, failures, duration):
+    """Print throughput and latency percentiles for one group of clients."""
+    print(
+        f"{label:<24} {len(latencies) / duration:9.1f}/s "
+        f"p50 {percentile(latencies, 50):8.1f} ms  "
+        f"p99 {percentile(latencies, 99):8.1f} ms  "
+        f"errors {failures[0]}"
+    )
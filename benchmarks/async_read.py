@@ -0,0 +1,71 @@
+"""Crop read throughput under many concurrent connections, ASGI versus WSGI.
+
+Usage::
+
+    uvicorn cropscience.asgi:application --port 8000 --workers 2 &
+    uvicorn cropscience.wsgi:application --interface wsgi --port 8001 --workers 2 &
+    python benchmarks/async_read.py [--asgi-url http://localhost:8000]
+        [--wsgi-url http://localhost:8001] [--clients 16 64 256] [--duration 15]
+
+Both servers must share a database that already holds crops. For each
+client count the script runs ``--duration`` seconds of crop list, fuzzy
+search and detail requests against each server in turn. Under WSGI every
+connection holds a worker thread for the whole request; under ASGI the read
+views await between queries, so throughput should keep climbing with
+``--clients`` while the WSGI p99 grows with the queue for threads.
+"""
+
+import argparse
+import time
+import uuid
+from itertools import cycle
+
+from _common import call, report, run_clients
+
+# Read requests cycled through by every client.
+READ_PATHS = (
+    "/api/crops/crops/?page_size=20",
+    "/api/crops/crops/?pagination=cursor&page_size=50&ordering=name",
+    "/api/crops/crops/?fuzzy=whaet&page_size=20",
+    "/api/crops/categories/?with_counts=true&preview=3",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--asgi-url", default="http://localhost:8000")
+    parser.add_argument("--wsgi-url", default="http://localhost:8001")
+    parser.add_argument("--clients", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--duration", type=float, default=15)
+    args = parser.parse_args()
+
+    servers = {"asgi": args.asgi_url.rstrip("/"), "wsgi": args.wsgi_url.rstrip("/")}
+    username, password = f"load-{uuid.uuid4().hex[:12]}", "Load-test-pass-1!"
+    status, body, _ = call(
+        f"{servers['asgi']}/api/auth/register/",
+        {"username": username, "email": f"{username}@example.com", "password": password, "password2": password},
+    )
+    assert status == 201, body
+    access = body["tokens"]["access"]
+
+    status, body, _ = call(f"{servers['asgi']}/api/crops/crops/?page_size=1", token=access)
+    assert status == 200 and body["results"], "seed crops first: python manage.py seed_data"
+    paths = READ_PATHS + (f"/api/crops/crops/{body['results'][0]['id']}/",)
+
+    for clients in args.clients:
+        print(f"-- {clients} clients")
+        for name, base in servers.items():
+            urls = cycle([f"{base}{path}" for path in paths])
+
+            def read():
+                return call(next(urls), token=access)
+
+            deadline = time.monotonic() + args.duration
+            threads, latencies, failures = run_clients(clients, deadline, read)
+            for thread in threads:
+                thread.join()
+            report(name, latencies, failures, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Queries and latency per authenticated request, with and without the user cache.
+
+Usage::
+
+    python benchmarks/auth_cache.py [--requests 1000]
+
+Requests carry a real bearer token so the full authentication path runs. The
+category list is used because its own work is small next to authentication.
+"""
+
+import argparse
+import statistics
+import time
+
+from _common import benchmark_user, setup_django, sync_view
+
+
+def run(view, factory, header, count):
+    """Send ``count`` requests and return (queries per request, latencies in ms)."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    latencies = []
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(count):
+            request = factory.get("/api/crops/categories/", HTTP_AUTHORIZATION=header)
+            started = time.perf_counter()
+            response = view(request)
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.status_code
+    return len(queries) / count, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import transaction
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from crops.views import CropCategoryViewSet
+    from users.authentication import CachedJWTAuthentication, user_cache
+
+    factory = APIRequestFactory()
+
+    with transaction.atomic():
+        header = f"Bearer {AccessToken.for_user(benchmark_user())}"
+
+        print(f"{'backend':<24} {'queries/req':>11} {'p50 ms':>9} {'mean ms':>9}")
+        for backend in (JWTAuthentication, CachedJWTAuthentication):
+            user_cache.clear()
+            view = sync_view(CropCategoryViewSet.as_view({"get": "list"}, authentication_classes=[backend]))
+            per_request, latencies = run(view, factory, header, args.requests)
+            print(
+                f"{backend.__name__:<24} {per_request:11.2f} "
+                f"{statistics.median(latencies):9.2f} "
+                f"{statistics.mean(latencies):9.2f}"
+            )
+
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
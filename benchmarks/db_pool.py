@@ -0,0 +1,100 @@
+"""Request latency with and without the connection pool.
+
+Usage::
+
+    python benchmarks/db_pool.py [--requests 2000] [--threads 1 8 32]
+
+Each request runs the category list view and then closes the database
+connection, as Django does at the end of a request. Unpooled, that opens
+and authenticates a new Postgres connection for every request; pooled, the
+connection goes back to the pool and the next request reuses it. Nothing
+is written, so the benchmark runs against whatever the database holds.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from _common import percentile, setup_django, sync_view
+
+
+def run(view, factory, user, threads, count):
+    """Send ``count`` requests from ``threads`` threads; return latencies in ms."""
+    from django.db import connection
+    from rest_framework.test import force_authenticate
+
+    latencies, lock = [], threading.Lock()
+
+    def client(requests):
+        for _ in range(requests):
+            request = factory.get("/api/crops/categories/")
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            response = view(request)
+            connection.close()
+            elapsed = (time.perf_counter() - started) * 1000
+            assert response.status_code == 200, response.status_code
+            with lock:
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=client, args=(count // threads,)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.db import connections
+    from rest_framework.test import APIRequestFactory
+
+    from crops.views import CropCategoryViewSet
+    from cropscience.db.pool import close_pools, pool_stats
+
+    database = connections.settings["default"]
+    pool_options = database["POOL"] or {
+        "max_size": 20,
+        "max_idle": 300,
+        "max_lifetime": 3600,
+        "timeout": 10,
+        "check": True,
+    }
+    factory = APIRequestFactory()
+    view = sync_view(CropCategoryViewSet.as_view({"get": "list"}))
+    user = User(username="benchmark")
+
+    try:
+        print(f"{'mode':<10} {'threads':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+        for threads in args.threads:
+            for mode, pool in (("unpooled", None), ("pooled", pool_options)):
+                database["POOL"] = pool
+                close_pools()
+                started = time.perf_counter()
+                latencies = run(view, factory, user, threads, args.requests)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"{mode:<10} {threads:7d} {len(latencies) / elapsed:9.1f} "
+                    f"{statistics.median(latencies):9.2f} {percentile(latencies, 99):9.2f}"
+                )
+                for stats in pool_stats():
+                    print(
+                        f"{'':<10} pool: created {stats['created']}, requests {stats['requests']}, "
+                        f"wait avg {stats['wait_avg_ms']} ms, max {stats['wait_max_ms']} ms, "
+                        f"timeouts {stats['timeouts']}"
+                    )
+    finally:
+        close_pools()
+
+
+if __name__ == "__main__":
+    main()
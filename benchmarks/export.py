@@ -0,0 +1,75 @@
+"""Peak memory and time-to-first-byte of the streaming crop export.
+
+Usage::
+
+    python benchmarks/export.py [--rows 10000 100000 1000000] [--format xlsx|csv|ndjson]
+
+Each row count runs in a fresh subprocess so the peak RSS reported for it is
+not polluted by earlier, larger runs.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+from _common import benchmark_user, peak_rss_mb, seed_crops, setup_django, sync_view
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+
+
+def run_once(rows, export_format):
+    """Seed ``rows`` crops, stream one export and print its measurements."""
+    setup_django()
+
+    from django.db import transaction
+    from django.urls import resolve
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    url = "/api/crops/crops/export/"
+    view = sync_view(resolve(url).func)
+
+    with transaction.atomic():
+        seed_crops(rows)
+        request = APIRequestFactory().get(url, {"format": export_format})
+        force_authenticate(request, user=benchmark_user())
+        rss_before = peak_rss_mb()
+
+        started = time.perf_counter()
+        response = view(request)
+        content = iter(response.streaming_content)
+        size = len(next(content))
+        first_byte = time.perf_counter() - started
+        for block in content:
+            size += len(block)
+        total = time.perf_counter() - started
+
+        transaction.set_rollback(True)
+
+    print(
+        f"{export_format:<6} {rows:>10,} rows  "
+        f"ttfb {first_byte:8.2f}s  "
+        f"total {total:8.2f}s  "
+        f"size {size / 2**20:8.1f} MiB  "
+        f"peak rss {peak_rss_mb():8.1f} MiB (before export {rss_before:.1f} MiB)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--format", default="xlsx", choices=["xlsx", "csv", "ndjson"])
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_once(args.child, args.format)
+        return
+
+    for rows in args.rows:
+        command = [sys.executable, __file__, "--child", str(rows), "--format", args.format]
+        subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Throughput of the streaming crop import.
+
+Usage::
+
+    python benchmarks/import_crops.py [--rows 500000] [--format csv xlsx]
+
+For each format a file of ``--rows`` crops is generated, then imported three
+times inside a rolled-back transaction: a dry run, a first write that inserts
+every row and a second write that updates every row through the upsert.
+"""
+
+import argparse
+import tempfile
+import time
+
+from _common import peak_rss_mb, setup_django
+
+
+def synthetic_rows(count, category):
+    """Yield ``count`` import rows in the export column order."""
+    for i in range(count):
+        yield [f"Bench crop {i}", f"Benchus cropus {i}", category, "Synthetic crop.", 30 + i % 200, "medium"]
+
+
+def write_file(path, rows, import_format):
+    """Write ``rows`` to ``path`` with the export writers."""
+    from crops.exports import iter_export
+
+    columns = ["name", "scientific_name", "category", "description", "growth_duration_days", "water_requirements"]
+    with open(path, "wb") as file:
+        for block in iter_export(rows, import_format, columns):
+            file.write(block)
+
+
+def timed_import(path, import_format, dry_run):
+    """Import ``path`` once and return ``(report, seconds)``."""
+    from crops.imports import import_crops, read_rows
+
+    started = time.perf_counter()
+    with open(path, "rb") as file:
+        report = import_crops(read_rows(file, import_format), dry_run=dry_run)
+    return report, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--format", nargs="+", default=["csv", "xlsx"], choices=["csv", "xlsx"])
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import transaction
+
+    from crops.models import CropCategory
+
+    for import_format in args.format:
+        with tempfile.NamedTemporaryFile(suffix=f".{import_format}") as file:
+            started = time.perf_counter()
+            write_file(file.name, synthetic_rows(args.rows, "Benchmark"), import_format)
+            print(f"{import_format:<5} generated {args.rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+            with transaction.atomic():
+                CropCategory.objects.create(name="Benchmark")
+                for label, dry_run in [("dry run", True), ("insert", False), ("upsert", False)]:
+                    report, seconds = timed_import(file.name, import_format, dry_run)
+                    assert report["error_count"] == 0, report["errors"][:5]
+                    print(
+                        f"{import_format:<5} {label:<8} {report['rows']:>10,} rows  "
+                        f"{seconds:8.1f}s  {report['rows'] / seconds:>10,.0f} rows/s  "
+                        f"peak rss {peak_rss_mb():8.1f} MiB"
+                    )
+                transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
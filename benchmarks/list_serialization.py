@@ -0,0 +1,71 @@
+"""CPU time per crop list page: model serializer versus the values() fast path.
+
+Usage::
+
+    python benchmarks/list_serialization.py [--page-size 10 100] [--repeat 200]
+
+Each page is fetched, serialized and rendered to JSON both ways. Process
+CPU time is reported rather than wall time, so the database round trip
+(the same for both paths) does not hide the Python-side saving.
+"""
+
+import argparse
+import statistics
+import time
+
+from _common import seed_crops, setup_django
+
+
+def cpu_ms_per_page(render_page, repeat):
+    """Return the median CPU milliseconds of ``render_page()``."""
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        render_page()
+        samples.append((time.process_time() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import transaction
+    from rest_framework.renderers import JSONRenderer
+
+    from crops.models import Crop
+    from crops.rows import RowSerializer
+    from crops.serializers import CropListSerializer
+
+    renderer = JSONRenderer()
+    with transaction.atomic():
+        seed_crops(max(args.page_size))
+        queryset = Crop.objects.select_related("category").defer("search_vector").order_by("name")
+
+        for page_size in args.page_size:
+
+            def model_page():
+                page = list(queryset[:page_size])
+                return renderer.render(CropListSerializer(page, many=True).data)
+
+            def rows_page():
+                rows = RowSerializer(CropListSerializer())
+                page = list(rows.prepare(queryset)[:page_size])
+                return renderer.render(rows.serialize(page))
+
+            assert model_page() == rows_page()
+            before = cpu_ms_per_page(model_page, args.repeat)
+            after = cpu_ms_per_page(rows_page, args.repeat)
+            print(
+                f"page_size {page_size:>4}  serializer {before:7.2f} ms  values() {after:7.2f} ms  "
+                f"saving {1 - after / before:6.1%}"
+            )
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Throughput and latency of every main endpoint under concurrent load, comparable across commits.
+
+Usage::
+
+    python manage.py generate_crops --crops 1000000 --seed 1
+    uvicorn cropscience.asgi:application --workers 4 &
+    python benchmarks/load_test.py [--url http://localhost:8000] [--clients 32]
+        [--duration 20] [--warmup 3] [--scenarios list search retrieve export login refresh]
+        [--json results.json] [--compare baseline.json]
+
+Drives a running server over HTTP. Each scenario runs alone for
+``--duration`` seconds with ``--clients`` concurrent clients, after
+``--warmup`` seconds whose requests are not counted, and cycles through its
+requests: crop lists over every filter, ordering and pagination, the three
+search modes, crop details, filtered CSV exports, logins and token
+refreshes. Run it against a dataset from ``generate_crops`` so the search
+terms match. ``--json`` saves the results with the commit, dataset size and
+settings they were taken with; ``--compare`` prints each scenario's change
+against such a file.
+"""
+
+import argparse
+import json
+import platform
+import queue
+import statistics
+import subprocess
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from itertools import cycle, product
+from pathlib import Path
+
+from _common import BASE_DIR, call, percentile, run_clients
+
+SCENARIOS = ("list", "search", "retrieve", "export", "login", "refresh")
+
+# List query strings: every filter, with and without each ordering, per pagination.
+LIST_FILTERS = (
+    "",
+    "water_requirements=low",
+    "water_requirements=high",
+    "category={category}",
+    "category={category}&water_requirements=medium",
+)
+LIST_ORDERINGS = ("", "ordering=name", "ordering=-created_at", "ordering=growth_duration_days")
+LIST_PAGES = ("page_size=20", "page_size=100", "page=5&page_size=20", "pagination=cursor&page_size=50")
+
+# Search query strings; the terms match names made by ``generate_crops``.
+SEARCHES = (
+    "search=wheat&page_size=20",
+    "search=Oryza&water_requirements=high&page_size=20",
+    "search=golden%20rice&search_mode=fulltext&page_size=20",
+    "search=cassava%20-sweet&search_mode=fulltext&ordering=name&page_size=20",
+    "fuzzy=whaet&page_size=20",
+    "fuzzy=Tritcum%20aestivm&fuzzy_threshold=0.4&page_size=20",
+)
+
+# Filtered exports small enough to stream in well under a second.
+EXPORTS = (
+    "format=csv&search=golden%20rice&search_mode=fulltext&category={category}",
+    "format=csv&search=hardy%20tomato&search_mode=fulltext&water_requirements=low"
+    "&columns=name,scientific_name,growth_duration_days",
+)
+
+# Crops whose detail pages are requested.
+RETRIEVE_IDS = 200
+
+
+def git_revision():
+    """Return the checked-out commit, marked ``-dirty`` with uncommitted changes."""
+
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=BASE_DIR, capture_output=True, text=True, check=True).stdout.strip()
+
+    try:
+        revision = git("rev-parse", "--short", "HEAD")
+        dirty = git("status", "--porcelain", "--untracked-files=no")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def build_scenarios(base, username, password, access, clients, names):
+    """Return ``{scenario: request()}`` for every scenario, sharing one registered user.
+
+    Logins for the refresh tokens of ``clients`` clients happen here, before
+    any timing, when ``names`` includes ``refresh``.
+    """
+    status, body, _ = call(f"{base}/api/crops/categories/?page_size=1", token=access)
+    assert status == 200 and body["results"], "generate a dataset first: python manage.py generate_crops"
+    category = body["results"][0]["id"]
+    status, body, _ = call(f"{base}/api/crops/crops/?pagination=cursor&page_size={RETRIEVE_IDS}", token=access)
+    assert status == 200 and body["results"], "generate a dataset first: python manage.py generate_crops"
+    crop_ids = [crop["id"] for crop in body["results"]]
+
+    def query(*parts):
+        return "&".join(part for part in parts if part).format(category=category)
+
+    def cycling(paths, parse=True):
+        urls = cycle(f"{base}{path}" for path in paths)
+        lock = threading.Lock()
+
+        def request():
+            with lock:
+                url = next(urls)
+            return call(url, token=access, parse=parse)
+
+        return request
+
+    def log_in():
+        return call(f"{base}/api/auth/login/", {"username": username, "password": password})
+
+    # Refresh tokens rotated by the clients, each held by one client at a time.
+    refresh_tokens = queue.SimpleQueue()
+    for _ in range(clients if "refresh" in names else 0):
+        refresh_tokens.put(log_in()[1]["refresh"])
+
+    def refresh():
+        token = refresh_tokens.get()
+        status, body, elapsed = call(f"{base}/api/auth/token/refresh/", {"refresh": token})
+        refresh_tokens.put(body["refresh"] if status < 400 else token)
+        return status, body, elapsed
+
+    return {
+        "list": cycling(
+            f"/api/crops/crops/?{query(*combination)}"
+            for combination in product(LIST_FILTERS, LIST_ORDERINGS, LIST_PAGES)
+        ),
+        "search": cycling(f"/api/crops/crops/?{search}" for search in SEARCHES),
+        "retrieve": cycling(f"/api/crops/crops/{crop_id}/" for crop_id in crop_ids),
+        "export": cycling((f"/api/crops/crops/export/?{query(export)}" for export in EXPORTS), parse=False),
+        "login": log_in,
+        "refresh": refresh,
+    }
+
+
+def run_scenario(request, clients, duration, warmup):
+    """Run ``request`` from ``clients`` threads; return its throughput and latency summary."""
+    if warmup:
+        threads, _, _ = run_clients(clients, time.monotonic() + warmup, request)
+        for thread in threads:
+            thread.join()
+    started = time.monotonic()
+    threads, latencies, failures = run_clients(clients, started + duration, request)
+    for thread in threads:
+        thread.join()
+    # Requests in flight at the deadline finish late; count the time they took.
+    elapsed = time.monotonic() - started
+    return {
+        "requests": len(latencies),
+        "errors": failures[0],
+        "throughput": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) if latencies else float("nan"),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def print_result(name, result):
+    """Print one scenario's throughput and latency percentiles."""
+    print(
+        f"{name:<10} {result['throughput']:9.1f}/s "
+        f"p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  "
+        f"p99 {result['p99_ms']:8.1f} ms  errors {result['errors']}"
+    )
+
+
+def print_comparison(baseline, run):
+    """Print each scenario's change in throughput and latency against ``baseline``."""
+    print(f"-- against {baseline['revision']} ({baseline['timestamp']})")
+    for key in ("clients", "duration", "crops"):
+        if baseline[key] != run[key]:
+            print(f"   warning: {key} differs ({baseline[key]} then, {run[key]} now)")
+
+    def change(metric, name):
+        before, after = baseline["scenarios"][name][metric], run["scenarios"][name][metric]
+        return (after - before) / before * 100 if before else float("nan")
+
+    for name in run["scenarios"]:
+        if name not in baseline["scenarios"]:
+            continue
+        print(
+            f"{name:<10} throughput {change('throughput', name):+6.1f}%  "
+            f"p50 {change('p50_ms', name):+6.1f}%  p95 {change('p95_ms', name):+6.1f}%  "
+            f"p99 {change('p99_ms', name):+6.1f}%"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--json", type=Path, help="Save the results to this file.")
+    parser.add_argument("--compare", type=Path, help="Compare against results saved with --json.")
+    args = parser.parse_args()
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    base = args.url.rstrip("/")
+    username, password = f"load-{uuid.uuid4().hex[:12]}", "Load-test-pass-1!"
+    status, body, _ = call(
+        f"{base}/api/auth/register/",
+        {"username": username, "email": f"{username}@example.com", "password": password, "password2": password},
+    )
+    assert status == 201, body
+    access = body["tokens"]["access"]
+    scenarios = build_scenarios(base, username, password, access, args.clients, args.scenarios)
+    _, body, _ = call(f"{base}/api/crops/crops/?page_size=1", token=access)
+
+    run = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "url": base,
+        "clients": args.clients,
+        "duration": args.duration,
+        "crops": body["count"],
+        "scenarios": {},
+    }
+    print(f"-- {run['revision']}: {run['crops']:,} crops, {args.clients} clients, {args.duration:g}s per scenario")
+    for name in args.scenarios:
+        run["scenarios"][name] = run_scenario(scenarios[name], args.clients, args.duration, args.warmup)
+        print_result(name, run["scenarios"][name])
+
+    if args.json:
+        args.json.write_text(json.dumps(run, indent=2) + "\n")
+    if baseline:
+        print_comparison(baseline, run)
+
+
+if __name__ == "__main__":
+    main()
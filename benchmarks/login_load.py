@@ -0,0 +1,59 @@
+"""Login throughput, and crop endpoint latency while logins run, against a live server.
+
+Usage::
+
+    uvicorn cropscience.asgi:application --workers 4 &
+    python benchmarks/login_load.py [--url http://localhost:8000] [--duration 20]
+        [--login-clients 32] [--read-clients 8]
+
+Unlike the other benchmarks this one drives a running server over HTTP, so it
+measures the event loop and the password pool as deployed. It registers a
+throwaway user, then runs two phases of ``--duration`` seconds: crop reads
+alone, and crop reads alongside a flood of logins. A server that hashes on
+its request threads shows the crop p99 climbing in the second phase.
+"""
+
+import argparse
+import time
+import uuid
+
+from _common import call, report, run_clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--login-clients", type=int, default=32)
+    parser.add_argument("--read-clients", type=int, default=8)
+    args = parser.parse_args()
+
+    base = args.url.rstrip("/")
+    username, password = f"load-{uuid.uuid4().hex[:12]}", "Load-test-pass-1!"
+    status, body, _ = call(
+        f"{base}/api/auth/register/",
+        {"username": username, "email": f"{username}@example.com", "password": password, "password2": password},
+    )
+    assert status == 201, body
+    access = body["tokens"]["access"]
+
+    def read_crops():
+        return call(f"{base}/api/crops/crops/?page_size=20", token=access)
+
+    def log_in():
+        return call(f"{base}/api/auth/login/", {"username": username, "password": password})
+
+    for phase, login_clients in (("reads only", 0), ("reads during logins", args.login_clients)):
+        print(f"-- {phase}")
+        deadline = time.monotonic() + args.duration
+        readers, read_latencies, read_failures = run_clients(args.read_clients, deadline, read_crops)
+        logins, login_latencies, login_failures = run_clients(login_clients, deadline, log_in)
+        for thread in readers + logins:
+            thread.join()
+        report("GET /api/crops/crops/", read_latencies, read_failures, args.duration)
+        if login_clients:
+            report("POST /api/auth/login/", login_latencies, login_failures, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Per-request cost of the request metrics middleware and Server-Timing header.
+
+Usage::
+
+    python benchmarks/request_metrics.py [--requests 2000] [--rows 100]
+
+Sends the same authenticated crop list and detail requests through Django's
+full handler, alternating batches with the metrics middleware removed and
+installed so drift affects both alike, and prints the latency of each plus
+the difference.
+"""
+
+import argparse
+import statistics
+import time
+
+from _common import benchmark_user, seed_crops, setup_django
+
+MIDDLEWARE_PATH = "cropscience.metrics.RequestMetricsMiddleware"
+# Requests sent in a row before switching the middleware on or off.
+BATCH = 100
+
+
+def run(client, url, header, count):
+    """Send ``count`` GETs to ``url``; return latencies in ms."""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = client.get(url, HTTP_AUTHORIZATION=header)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.status_code
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.db import transaction
+    from django.test import Client, override_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from crops.models import Crop
+
+    without = [path for path in settings.MIDDLEWARE if path != MIDDLEWARE_PATH]
+    client = Client()
+
+    with transaction.atomic():
+        category = seed_crops(args.rows)
+        header = f"Bearer {AccessToken.for_user(benchmark_user())}"
+        crop_id = Crop.objects.filter(category=category).values_list("id", flat=True).first()
+        urls = {
+            "list (100 rows)": f"/api/crops/crops/?page_size=100&category={category.id}",
+            "detail": f"/api/crops/crops/{crop_id}/",
+        }
+
+        print(f"{'request':<18} {'middleware':<10} {'p50 ms':>9} {'mean ms':>9}")
+        for label, url in urls.items():
+            results = {"off": [], "on": []}
+            for _ in range(0, args.requests, BATCH):
+                for mode, middleware in (("off", without), ("on", settings.MIDDLEWARE)):
+                    with override_settings(MIDDLEWARE=middleware):
+                        results[mode] += run(client, url, header, BATCH)
+            for mode in results:
+                print(
+                    f"{label:<18} {mode:<10} "
+                    f"{statistics.median(results[mode]):9.3f} "
+                    f"{statistics.mean(results[mode]):9.3f}"
+                )
+            overhead = statistics.median(results["on"]) - statistics.median(results["off"])
+            print(f"{label:<18} {'overhead':<10} {overhead * 1000:8.1f} µs")
+
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
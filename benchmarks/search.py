@@ -0,0 +1,75 @@
+"""Latency of plain (ILIKE) search versus full-text search on the crop list.
+
+Usage::
+
+    python benchmarks/search.py [--rows 1000000] [--repeat 20]
+"""
+
+import argparse
+import statistics
+import time
+
+from _common import benchmark_user, seed_crops, setup_django, sync_view
+
+# A single-row match, a rare token combined with a common one, and a token every row contains.
+TERMS = ["cropus 424242", "benchus 77", "benchmarking"]
+
+
+def time_requests(view, factory, user, params, repeat):
+    """Return per-request latencies in milliseconds for ``params``."""
+    from django.core.cache import cache
+    from rest_framework.test import force_authenticate
+
+    latencies = []
+    for _ in range(repeat):
+        # Measure the full query cost, not the cached count.
+        cache.clear()
+        request = factory.get("/api/crops/crops/", params)
+        force_authenticate(request, user=user)
+        started = time.perf_counter()
+        response = view(request)
+        response.render()
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.data
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection, transaction
+    from django.urls import resolve
+    from rest_framework.test import APIRequestFactory
+
+    view = sync_view(resolve("/api/crops/crops/").func)
+    factory = APIRequestFactory()
+
+    with transaction.atomic():
+        print(f"Seeding {args.rows:,} crops …")
+        seed_crops(args.rows)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE crops_crop")
+        user = benchmark_user()
+
+        print(f"{'term':<16} {'mode':<9} {'p50 ms':>9} {'mean ms':>9} {'max ms':>9}")
+        for term in TERMS:
+            for mode in ("plain", "fulltext"):
+                params = {"search": term, "search_mode": mode}
+                latencies = time_requests(view, factory, user, params, args.repeat)
+                print(
+                    f"{term:<16} {mode:<9} "
+                    f"{statistics.median(latencies):9.1f} "
+                    f"{statistics.mean(latencies):9.1f} "
+                    f"{max(latencies):9.1f}"
+                )
+
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Refresh throughput against a token table holding millions of historical tokens.
+
+Usage::
+
+    python benchmarks/token_refresh.py [--history 2000000] [--refreshes 2000]
+
+Seeds ``--history`` outstanding tokens, half of them expired and most of them
+blacklisted, then rotates one refresh token ``--refreshes`` times through
+simplejwt's stock serializer and through the project's. Finally it times the
+batched purge of the expired half.
+"""
+
+import argparse
+import time
+
+from _common import benchmark_user, setup_django
+
+
+def seed_history(count):
+    """Insert ``count`` historical tokens in single server-side statements."""
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO token_blacklist_outstandingtoken (jti, token, created_at, expires_at)
+            SELECT
+                'history-' || g,
+                'historical token',
+                now() - interval '14 days',
+                now() + CASE WHEN g %% 2 = 0 THEN interval '-7 days' ELSE interval '7 days' END
+            FROM generate_series(1, %s) AS g
+            """,
+            [count],
+        )
+        cursor.execute(
+            """
+            INSERT INTO token_blacklist_blacklistedtoken (token_id, blacklisted_at)
+            SELECT id, now() FROM token_blacklist_outstandingtoken
+            WHERE jti LIKE 'history-%' AND id % 5 <> 0
+            """
+        )
+        cursor.execute("ANALYZE token_blacklist_outstandingtoken")
+        cursor.execute("ANALYZE token_blacklist_blacklistedtoken")
+
+
+def rotate(serializer_class, refresh, count):
+    """Rotate ``refresh`` ``count`` times; return (refreshes per second, queries per refresh)."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.views import TokenRefreshView
+
+    view = TokenRefreshView.as_view(serializer_class=serializer_class)
+    factory = APIRequestFactory()
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for _ in range(count):
+            request = factory.post("/api/auth/token/refresh/", {"refresh": refresh}, format="json")
+            response = view(request)
+            assert response.status_code == 200, response.data
+            refresh = response.data["refresh"]
+        elapsed = time.perf_counter() - started
+    return count / elapsed, len(queries) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=2_000_000)
+    parser.add_argument("--refreshes", type=int, default=2_000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import transaction
+    from rest_framework_simplejwt.serializers import TokenRefreshSerializer as StockSerializer
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from users.blacklist import purge_expired_tokens
+    from users.serializers import TokenRefreshSerializer
+
+    with transaction.atomic():
+        print(f"Seeding {args.history:,} historical tokens …")
+        seed_history(args.history)
+        user = benchmark_user()
+
+        print(f"{'serializer':<12} {'refresh/s':>10} {'queries/refresh':>16}")
+        for label, serializer_class in (("simplejwt", StockSerializer), ("project", TokenRefreshSerializer)):
+            rate, queries = rotate(serializer_class, str(RefreshToken.for_user(user)), args.refreshes)
+            print(f"{label:<12} {rate:10.0f} {queries:16.2f}")
+
+        started = time.perf_counter()
+        purged = purge_expired_tokens()
+        print(f"Purged {purged:,} expired tokens in {time.perf_counter() - started:.1f}s")
+
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from rest_framework.response import Response
+
+
+class AsyncReadMixin:
+    """Serve the read actions of a viewset as coroutines.
+
+    Actions named in ``async_actions`` run through their ``a<action>``
+    coroutine, which reads through the async ORM and awaits between
+    queries instead of holding a thread for the whole request. Filtering,
+    search, ordering, pagination and serialization reuse the sync code
+    paths, so responses are identical. Every other action runs the regular
+    sync dispatch on a worker thread, as Django does for sync views.
+    Authentication and permission checks, which may query the database,
+    run the same way. Place directly before the viewset base class.
+    """
+
+    async_actions = ("list", "retrieve")
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        """Return the view marked as a coroutine function for Django's handlers."""
+        return markcoroutinefunction(super().as_view(actions, **initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Run async actions on the event loop and the rest on a worker thread."""
+        action = self.action_map.get(request.method.lower())
+        if action not in self.async_actions:
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await getattr(self, f"a{action}")(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def afilter_queryset(self, queryset):
+        """Async ``filter_queryset``: backends with an ``afilter_queryset`` are awaited."""
+        for backend in list(self.filter_backends):
+            backend = backend()
+            if hasattr(backend, "afilter_queryset"):
+                queryset = await backend.afilter_queryset(self.request, queryset, self)
+            else:
+                queryset = backend.filter_queryset(self.request, queryset, self)
+        return queryset
+
+    async def apaginate_queryset(self, queryset):
+        """Async ``paginate_queryset``; ``None`` when pagination is off."""
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def aget_object(self):
+        """Async ``get_object``."""
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        """Async ``list`` over model instances."""
+        queryset = await self.afilter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer([obj async for obj in queryset], many=True).data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Async ``retrieve``."""
+        return Response(self.get_serializer(await self.aget_object()).data)
@@ -0,0 +1,197 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Crop, CropCategory
+from .serializers import CropBulkSerializer
+from .signals import post_bulk_save
+
+# ``atomic`` writes nothing if any item is invalid; ``best_effort`` writes the valid ones.
+BULK_MODES = ("atomic", "best_effort")
+
+# Largest number of items accepted by one bulk request.
+BULK_MAX_ITEMS = 1000
+
+# Rows per INSERT / UPDATE statement.
+BULK_BATCH_SIZE = 500
+
+# Unique constraint behind ``natural_key()``; see ``Crop.Meta.constraints``.
+NATURAL_KEY_CONSTRAINT = "uniq_crop_natural_key"
+
+# Item error for a crop whose natural key is taken.
+DUPLICATE_ERROR = {"non_field_errors": ["A crop with this name, scientific name and category already exists."]}
+
+
+def _to_pk(value):
+    """Return ``value`` as an integer primary key, or ``None`` if it is not one."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def preload_categories(items):
+    """Return ``{id: category}`` for every category referenced by ``items``, in one query."""
+    ids = {_to_pk(item.get("category_id")) for item in items if isinstance(item, dict)}
+    ids.discard(None)
+    return CropCategory.objects.in_bulk(ids)
+
+
+def natural_key(crop):
+    """Return the ``(name, scientific_name, category_id)`` natural key of ``crop``."""
+    return crop.name, crop.scientific_name, crop.category_id
+
+
+def find_duplicates(indexed_crops):
+    """Return ``{index: error}`` for crops whose natural key is already taken.
+
+    A key is taken if another crop of the batch or another stored row
+    already has it. Stored rows are checked in a single query.
+    """
+    keys = {natural_key(crop) for _, crop in indexed_crops}
+    stored = Crop.objects.filter(
+        name__in={name for name, _, _ in keys},
+        category_id__in={category for _, _, category in keys},
+    ).values_list("name", "scientific_name", "category_id", "pk")
+    owners = {(name, scientific_name, category): pk for name, scientific_name, category, pk in stored}
+
+    duplicates = {}
+    seen = set()
+    for index, crop in indexed_crops:
+        key = natural_key(crop)
+        owner = owners.get(key)
+        if key in seen or (owner is not None and owner != crop.pk):
+            duplicates[index] = DUPLICATE_ERROR
+        seen.add(key)
+    return duplicates
+
+
+def is_natural_key_violation(error):
+    """Whether the ``IntegrityError`` ``error`` comes from ``NATURAL_KEY_CONSTRAINT``."""
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == NATURAL_KEY_CONSTRAINT
+
+
+def merge_errors(errors, extra):
+    """Return ``errors`` plus ``{index: error}`` items from ``extra``, ordered by index."""
+    return sorted(
+        errors + [{"index": index, "errors": error} for index, error in extra.items()],
+        key=lambda error: error["index"],
+    )
+
+
+def write_crops(indexed_crops, errors, atomic, fields=None):
+    """Insert ``(index, crop)`` pairs, or update their ``fields``, in one transaction.
+
+    A concurrent request can take a natural key after :func:`find_duplicates`
+    ran, and the unique constraint then rejects the write. The clashing
+    items are reported as duplicates; with ``atomic`` nothing is written,
+    otherwise the rest are written again. Returns ``(crops, errors)``.
+    """
+    created = fields is None
+    while indexed_crops:
+        crops = [crop for _, crop in indexed_crops]
+        try:
+            with transaction.atomic():
+                if created:
+                    Crop.objects.bulk_create(crops, batch_size=BULK_BATCH_SIZE)
+                else:
+                    Crop.objects.bulk_update(crops, fields, batch_size=BULK_BATCH_SIZE)
+                post_bulk_save.send(sender=Crop, instances=crops, created=created)
+            return crops, errors
+        except IntegrityError as error:
+            if not is_natural_key_violation(error):
+                raise
+            # The other writer has committed by now, so its row is visible.
+            duplicates = find_duplicates(indexed_crops) or {index: DUPLICATE_ERROR for index, _ in indexed_crops}
+            errors = merge_errors(errors, duplicates)
+            if atomic:
+                return [], errors
+            indexed_crops = [(index, crop) for index, crop in indexed_crops if index not in duplicates]
+    return [], errors
+
+
+def bulk_create_crops(items, atomic=True):
+    """Validate ``items`` together and insert the valid ones with ``bulk_create``.
+
+    Returns ``(crops, errors)`` where ``errors`` lists ``{"index", "errors"}``
+    for each invalid item. With ``atomic`` any error means nothing is written.
+    """
+    context = {"categories": preload_categories(items)}
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        serializer = CropBulkSerializer(data=item, context=context)
+        if serializer.is_valid():
+            valid.append((index, Crop(**serializer.validated_data)))
+        else:
+            errors.append({"index": index, "errors": serializer.errors})
+
+    duplicates = find_duplicates(valid)
+    errors = merge_errors(errors, duplicates)
+    if errors and atomic:
+        return [], errors
+    return write_crops([(index, crop) for index, crop in valid if index not in duplicates], errors, atomic)
+
+
+def bulk_update_crops(items, atomic=True):
+    """Apply partial updates keyed by ``id`` and save them with ``bulk_update``.
+
+    Existing crops and referenced categories are each loaded in one query.
+    An ``id`` may appear once per request; repeats are item errors.
+    Returns ``(crops, errors)`` as for :func:`bulk_create_crops`.
+    """
+    ids = {_to_pk(item.get("id")) for item in items if isinstance(item, dict)}
+    ids.discard(None)
+    existing = Crop.objects.select_related("category").defer("search_vector").in_bulk(ids)
+    context = {"categories": preload_categories(items)}
+
+    now = timezone.now()
+    crops, fields, errors, seen = {}, {"updated_at"}, [], set()
+    for index, item in enumerate(items):
+        crop = existing.get(_to_pk(item.get("id"))) if isinstance(item, dict) else None
+        if crop is None:
+            errors.append({"index": index, "errors": {"id": ["Crop not found."]}})
+            continue
+        if crop.pk in seen:
+            errors.append({"index": index, "errors": {"id": ["Crop appears more than once in this request."]}})
+            continue
+        seen.add(crop.pk)
+        serializer = CropBulkSerializer(crop, data=item, partial=True, context=context)
+        if not serializer.is_valid():
+            errors.append({"index": index, "errors": serializer.errors})
+            continue
+        for attr, value in serializer.validated_data.items():
+            setattr(crop, attr, value)
+        crop.updated_at = now
+        fields.update(serializer.validated_data)
+        crops[crop.pk] = (index, crop)
+
+    duplicates = find_duplicates(crops.values())
+    errors = merge_errors(errors, duplicates)
+    if errors and atomic:
+        return [], errors
+    pending = [(index, crop) for index, crop in crops.values() if index not in duplicates]
+    return write_crops(pending, errors, atomic, fields=sorted(fields))
+
+
+def bulk_delete_crops(ids, atomic=True):
+    """Delete the crops with the given ``ids`` in one transaction.
+
+    Returns ``(deleted_ids, errors)`` as for :func:`bulk_create_crops`.
+    """
+    pks = [_to_pk(value) for value in ids]
+    found = set(Crop.objects.filter(pk__in=[pk for pk in pks if pk is not None]).values_list("pk", flat=True))
+    errors = [
+        {"index": index, "errors": {"id": ["Crop not found."]}}
+        for index, pk in enumerate(pks)
+        if pk not in found
+    ]
+
+    if errors and atomic:
+        return [], errors
+    deleted = sorted(found)
+    if deleted:
+        with transaction.atomic():
+            Crop.objects.filter(pk__in=deleted).delete()
+    return deleted, errors
@@ -0,0 +1,174 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import DataVersion
+
+
+class ConditionalGetMixin:
+    """Answer ``list`` and ``retrieve`` with ``ETag`` / ``Last-Modified`` validators.
+
+    Validators come from the ``DataVersion`` counters of ``version_models``
+    and, for detail views, the object's ``last_modified_field``. They cost
+    one or two indexed lookups, so a request carrying a matching
+    ``If-None-Match`` or ``If-Modified-Since`` gets a ``304`` before the main
+    query runs or anything is serialised.
+    """
+
+    # Models whose changes invalidate list responses (and detail responses,
+    # apart from the viewset's own model when ``last_modified_field`` is set).
+    version_models = []
+    # Per-row modification timestamp used to validate detail responses.
+    last_modified_field = None
+
+    def get_table_state(self, model_classes):
+        """Return ``(versions, last_modified)`` for ``model_classes``."""
+        labels = [model._meta.label_lower for model in model_classes]
+        return self.table_state(labels, self.version_rows(labels))
+
+    async def aget_table_state(self, model_classes):
+        """Async ``get_table_state``."""
+        labels = [model._meta.label_lower for model in model_classes]
+        return self.table_state(labels, [row async for row in self.version_rows(labels)])
+
+    def version_rows(self, labels):
+        """Return the query for the ``(label, version, changed_at)`` rows of ``labels``."""
+        return DataVersion.objects.filter(label__in=labels).values_list("label", "version", "changed_at")
+
+    def table_state(self, labels, rows):
+        """Combine version ``rows`` into ``(versions, last_modified)``."""
+        versions = dict.fromkeys(labels, 0)
+        last_modified = None
+        for label, version, changed_at in rows:
+            versions[label] = version
+            last_modified = changed_at if last_modified is None else max(last_modified, changed_at)
+        # Kept for the paginator, which keys its count cache on the same versions.
+        self.data_versions = versions
+        return versions, last_modified
+
+    def get_list_validators(self):
+        """Return ``(etag source, last_modified)`` for the list endpoint."""
+        versions, last_modified = self.get_table_state(self.version_models)
+        return sorted(versions.items()), last_modified
+
+    async def aget_list_validators(self):
+        """Async ``get_list_validators``."""
+        versions, last_modified = await self.aget_table_state(self.version_models)
+        return sorted(versions.items()), last_modified
+
+    def get_detail_validators(self):
+        """Return ``(etag source, last_modified)`` for the detail endpoint.
+
+        Returns ``None`` when the object does not exist, so the view can
+        answer normally with ``404``.
+        """
+        if self.last_modified_field is None:
+            return self.get_list_validators()
+
+        try:
+            lookup, query = self.detail_modified_query()
+            modified = query.first()
+        except (TypeError, ValueError):
+            return None
+        if modified is None:
+            return None
+        return self.detail_validators(lookup, modified, *self.get_table_state(self.detail_version_models()))
+
+    async def aget_detail_validators(self):
+        """Async ``get_detail_validators``."""
+        if self.last_modified_field is None:
+            return await self.aget_list_validators()
+
+        try:
+            lookup, query = self.detail_modified_query()
+            modified = await query.afirst()
+        except (TypeError, ValueError):
+            return None
+        if modified is None:
+            return None
+        state = await self.aget_table_state(self.detail_version_models())
+        return self.detail_validators(lookup, modified, *state)
+
+    def detail_modified_query(self):
+        """Return the URL lookup and the query for the object's ``last_modified_field``.
+
+        Raises ``TypeError`` or ``ValueError`` for lookups the field cannot hold.
+        """
+        model = self.get_queryset().model
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        query = model._default_manager.filter(**{self.lookup_field: lookup}).values_list(
+            self.last_modified_field, flat=True
+        )
+        return lookup, query
+
+    def detail_version_models(self):
+        """Return the ``version_models`` other than the object's own model."""
+        model = self.get_queryset().model
+        return [other for other in self.version_models if other is not model]
+
+    def detail_validators(self, lookup, modified, versions, last_modified):
+        """Return the detail ``(etag source, last_modified)`` from the object and table state."""
+        if last_modified is None or modified > last_modified:
+            last_modified = modified
+        return [lookup, modified.isoformat(), sorted(versions.items())], last_modified
+
+    def make_etag(self, source):
+        """Return a quoted ETag for ``source`` and the negotiated renderer."""
+        payload = repr([source, self.request.accepted_renderer.format])
+        return f'"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"'
+
+    def check_validators(self, request, validators):
+        """Return ``(etag, timestamp, response)``; ``response`` is a ``304`` if ``validators`` match."""
+        source, last_modified = validators
+        etag = self.make_etag(source)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return etag, timestamp, get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+
+    def add_validators(self, response, etag, timestamp):
+        """Set the ``ETag`` / ``Last-Modified`` headers on successful ``response``s."""
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def conditional_response(self, validators, handler, request, *args, **kwargs):
+        """Return ``304`` if ``validators`` match the request, else ``handler``'s response."""
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        etag, timestamp, response = self.check_validators(request, validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.add_validators(response, etag, timestamp)
+
+    async def aconditional_response(self, validators, handler, request, *args, **kwargs):
+        """Async ``conditional_response`` for a coroutine ``handler``."""
+        if validators is None:
+            return await handler(request, *args, **kwargs)
+
+        etag, timestamp, response = self.check_validators(request, validators)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return self.add_validators(response, etag, timestamp)
+
+    def list(self, request, *args, **kwargs):
+        """List objects, or ``304`` if the client's copy is current."""
+        return self.conditional_response(self.get_list_validators(), super().list, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        """Async ``list``."""
+        validators = await self.aget_list_validators()
+        return await self.aconditional_response(validators, super().alist, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve an object, or ``304`` if the client's copy is current."""
+        return self.conditional_response(
+            self.get_detail_validators(), super().retrieve, request, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Async ``retrieve``."""
+        validators = await self.aget_detail_validators()
+        return await self.aconditional_response(validators, super().aretrieve, request, *args, **kwargs)
@@ -0,0 +1,246 @@
+import csv
+import json
+import tempfile
+from io import StringIO
+from itertools import chain, islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from openpyxl import Workbook
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Content type of every supported export format, keyed by ``?format=`` value.
+EXPORT_FORMATS = {
+    "xlsx": XLSX_CONTENT_TYPE,
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows fetched per round trip from the server-side cursor.
+EXPORT_CHUNK_SIZE = 2000
+
+# Size of each block handed to the streaming response.
+STREAM_BLOCK_SIZE = 64 * 1024
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _format_datetime(value):
+    return value.strftime(DATETIME_FORMAT)
+
+
+# Column key -> (spreadsheet header, queryset lookup, formatter), in export order.
+EXPORT_COLUMNS = {
+    "id": ("ID", "id", None),
+    "name": ("Name", "name", None),
+    "scientific_name": ("Scientific Name", "scientific_name", None),
+    "category": ("Category", "category__name", None),
+    "description": ("Description", "description", None),
+    "growth_duration_days": ("Growth Duration (days)", "growth_duration_days", None),
+    "water_requirements": ("Water Requirements", "water_requirements", None),
+    "created_at": ("Created At", "created_at", _format_datetime),
+    "updated_at": ("Updated At", "updated_at", _format_datetime),
+}
+
+
+def parse_columns(value):
+    """Return the column keys named in a comma-separated ``?columns=`` value.
+
+    An empty value selects every column. Raises ``ValueError`` naming any
+    unknown column.
+    """
+    if not value:
+        return list(EXPORT_COLUMNS)
+    columns = list(dict.fromkeys(key.strip() for key in value.split(",") if key.strip()))
+    unknown = [key for key in columns if key not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown column(s): {', '.join(unknown)}. "
+            f"Choose from: {', '.join(EXPORT_COLUMNS)}."
+        )
+    return columns
+
+
+def iter_crop_rows(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one list of cell values per crop in ``queryset``.
+
+    Only the lookups behind ``columns`` are selected, so the database sends
+    nothing else and the category join only happens when it is exported.
+    Rows are read as plain tuples through a server-side cursor,
+    ``chunk_size`` at a time, so neither model instances nor the full result
+    set are ever held in memory.
+    """
+    lookups = [EXPORT_COLUMNS[key][1] for key in columns]
+    format_row = _row_formatter(columns)
+    for row in queryset.values_list(*lookups).iterator(chunk_size=chunk_size):
+        yield format_row(row)
+
+
+async def aiter_crop_rows(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Async ``iter_crop_rows``: read the server-side cursor ``chunk_size`` rows per thread hop.
+
+    Django 4.2's ``aiterator()`` opens the cursor of a ``values_list()``
+    query on the event loop, which the async ORM refuses, so the sync
+    iterator is driven from the database thread instead.
+    """
+    lookups = [EXPORT_COLUMNS[key][1] for key in columns]
+    format_row = _row_formatter(columns)
+    rows = queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    while chunk := await next_chunk():
+        for row in chunk:
+            yield format_row(row)
+
+
+def _row_formatter(columns):
+    """Return a function turning a ``values_list()`` row into export cell values."""
+    formatters = [EXPORT_COLUMNS[key][2] for key in columns]
+
+    def format_row(row):
+        return [
+            value if formatter is None or value is None else formatter(value)
+            for value, formatter in zip(row, formatters)
+        ]
+
+    return format_row
+
+
+def iter_xlsx(rows, columns, title="Crops", block_size=STREAM_BLOCK_SIZE):
+    """Yield an Excel workbook holding ``rows`` as byte blocks.
+
+    A write-only workbook serialises each appended row straight to a
+    temporary file instead of keeping cells in memory. The finished archive
+    is spooled to disk as well and read back ``block_size`` bytes at a time,
+    so memory use does not grow with the number of rows.
+    """
+    wb, ws = _xlsx_sheet(columns, title)
+    for row in rows:
+        ws.append(row)
+
+    with tempfile.TemporaryFile() as archive:
+        wb.save(archive)
+        yield from _iter_file_blocks(archive, block_size)
+
+
+def _xlsx_sheet(columns, title):
+    """Return a write-only workbook and its sheet, holding the header row."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    ws.append([EXPORT_COLUMNS[key][0] for key in columns])
+    return wb, ws
+
+
+def _iter_file_blocks(file, block_size):
+    """Yield the contents of ``file`` from the start, ``block_size`` bytes at a time."""
+    file.seek(0)
+    while block := file.read(block_size):
+        yield block
+
+
+def _iter_text_blocks(lines, block_size):
+    """Group text ``lines`` into UTF-8 encoded blocks of roughly ``block_size`` bytes."""
+    buffer = []
+    buffered = 0
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= block_size:
+            yield "".join(buffer).encode()
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+async def _aiter_text_blocks(lines, block_size):
+    """Async ``_iter_text_blocks`` over an async iterable of ``lines``."""
+    buffer = []
+    buffered = 0
+    async for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= block_size:
+            yield "".join(buffer).encode()
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def _csv_line_formatter():
+    """Return a function rendering one row as a CSV line."""
+    line = StringIO()
+    writer = csv.writer(line)
+
+    def format_line(row):
+        line.seek(0)
+        line.truncate()
+        writer.writerow(row)
+        return line.getvalue()
+
+    return format_line
+
+
+def _ndjson_line_formatter(columns):
+    """Return a function rendering one row as a JSON object line keyed by column."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    def format_line(row):
+        return encoder.encode(dict(zip(columns, row))) + "\n"
+
+    return format_line
+
+
+def iter_csv(rows, columns, block_size=STREAM_BLOCK_SIZE):
+    """Yield ``rows`` as CSV with a header of column keys, row by row."""
+    return _iter_text_blocks(map(_csv_line_formatter(), chain([columns], rows)), block_size)
+
+
+def iter_ndjson(rows, columns, block_size=STREAM_BLOCK_SIZE):
+    """Yield ``rows`` as newline-delimited JSON objects keyed by column."""
+    return _iter_text_blocks(map(_ndjson_line_formatter(columns), rows), block_size)
+
+
+EXPORT_WRITERS = {
+    "xlsx": iter_xlsx,
+    "csv": iter_csv,
+    "ndjson": iter_ndjson,
+}
+
+
+def iter_export(rows, export_format, columns):
+    """Yield ``rows`` encoded in ``export_format`` as byte blocks."""
+    return EXPORT_WRITERS[export_format](rows, columns)
+
+
+async def aiter_export(rows, export_format, columns, block_size=STREAM_BLOCK_SIZE):
+    """Async ``iter_export`` over an async iterable of ``rows``, as from ``aiter_crop_rows``.
+
+    Text formats are encoded as the rows arrive. A workbook can only be
+    written once complete, so ``.xlsx`` rows are appended as they arrive and
+    the archive is compressed on a worker thread before it is streamed.
+    """
+    if export_format == "xlsx":
+        wb, ws = _xlsx_sheet(columns, "Crops")
+        async for row in rows:
+            ws.append(row)
+        with tempfile.TemporaryFile() as archive:
+            await sync_to_async(wb.save, thread_sensitive=False)(archive)
+            for block in _iter_file_blocks(archive, block_size):
+                yield block
+        return
+
+    if export_format == "csv":
+        format_line, header = _csv_line_formatter(), [columns]
+    else:
+        format_line, header = _ndjson_line_formatter(columns), []
+
+    async def lines():
+        for row in header:
+            yield format_line(row)
+        async for row in rows:
+            yield format_line(row)
+
+    async for block in _aiter_text_blocks(lines(), block_size):
+        yield block
@@ -0,0 +1,104 @@
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+# Schema parameters of the views using ``SparseFieldsetMixin``.
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(FIELDS_PARAM, str, description="Comma-separated fields to return (default: all)."),
+    OpenApiParameter(OMIT_PARAM, str, description="Comma-separated fields to leave out."),
+]
+
+
+def parse_field_names(value, available, param):
+    """Return the field names in a comma-separated ``value``.
+
+    Raises ``ValidationError`` keyed by ``param`` naming any field not in
+    ``available``.
+    """
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValidationError(
+            {param: f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(available)}."}
+        )
+    return names
+
+
+class SparseFieldsetMixin:
+    """Trim list and detail responses to ``?fields=`` and ``?omit=``.
+
+    The selection removes fields from the serializer and is pushed down
+    into the query: only the columns behind the remaining fields are
+    loaded, and relations are joined only when a nested serializer still
+    needs them. It is part of the ETag, so each selection validates
+    separately. Place before ``ConditionalGetMixin``.
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    def get_fieldset(self):
+        """Return the names of the fields to render, or ``None`` for all of them."""
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = None
+            params = self.request.query_params
+            if self.action in self.sparse_actions and (params.get(FIELDS_PARAM) or params.get(OMIT_PARAM)):
+                serializer = self.get_serializer_class()(context=self.get_serializer_context())
+                available = [name for name, field in serializer.fields.items() if not field.write_only]
+                selected = available
+                if params.get(FIELDS_PARAM):
+                    selected = parse_field_names(params[FIELDS_PARAM], available, FIELDS_PARAM)
+                if params.get(OMIT_PARAM):
+                    omitted = parse_field_names(params[OMIT_PARAM], available, OMIT_PARAM)
+                    selected = [name for name in selected if name not in omitted]
+                self._fieldset = selected
+        return self._fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        """Return the serializer without the fields the request left out."""
+        serializer = super().get_serializer(*args, **kwargs)
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            fields = getattr(serializer, "child", serializer).fields
+            for name, field in list(fields.items()):
+                if name not in fieldset and not field.write_only:
+                    fields.pop(name)
+        return serializer
+
+    def get_queryset(self):
+        """Return the queryset restricted to what the selected fields read."""
+        queryset = super().get_queryset()
+        if self.get_fieldset() is None:
+            return queryset
+
+        model = queryset.model
+        only, related = {model._meta.pk.name}, []
+        for field in self.get_serializer().fields.values():
+            if field.write_only:
+                continue
+            if not field.source_attrs:
+                return queryset
+            name = field.source_attrs[0]
+            try:
+                model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return queryset
+            only.add(name)
+            if isinstance(field, serializers.BaseSerializer):
+                related.append(name)
+                only.update(
+                    f"{name}__{nested.source_attrs[0]}"
+                    for nested in field.fields.values()
+                    if not nested.write_only and nested.source_attrs
+                )
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
+
+    def make_etag(self, source):
+        """Return an ETag that also covers the field selection."""
+        return super().make_etag([source, self.get_fieldset()])
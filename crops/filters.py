@@ -1,7 +1,16 @@
 import django_filters
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
 from .models import Crop
 
+# Text search configuration used by the ``crops_crop.search_vector`` trigger.
+SEARCH_CONFIG = "english"
+
 
 class CropFilter(django_filters.FilterSet):
     """Allows filtering crops by category and water_requirements."""
@@ -18,3 +27,139 @@ class CropFilter(django_filters.FilterSet):
     class Meta:
         model = Crop
         fields = ["category", "water_requirements"]
+
+
+class CropSearchFilter(filters.SearchFilter):
+    """SearchFilter with an optional Postgres full-text mode.
+
+    ``?search_mode=plain`` (the default) keeps the ``ILIKE`` matching of
+    ``search_fields``. ``?search_mode=fulltext`` matches ``search`` as a web
+    search query against the GIN-indexed ``search_vector`` of name,
+    scientific_name and description, and orders results by relevance rank
+    unless an explicit ``ordering`` is given. Must run after
+    ``OrderingFilter`` so the rank ordering takes precedence over the
+    default one.
+    """
+
+    search_mode_param = "search_mode"
+    search_modes = ("plain", "fulltext")
+
+    def get_search_mode(self, request):
+        """Return the validated ``?search_mode=`` value."""
+        mode = request.query_params.get(self.search_mode_param) or "plain"
+        if mode not in self.search_modes:
+            raise ValidationError(
+                {self.search_mode_param: f"Choose from: {', '.join(self.search_modes)}."}
+            )
+        return mode
+
+    def filter_queryset(self, request, queryset, view):
+        """Apply plain or full-text search depending on ``?search_mode=``."""
+        if self.get_search_mode(request) == "plain":
+            return super().filter_queryset(request, queryset, view)
+
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+        query = SearchQuery(term, search_type="websearch", config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.annotate(rank=SearchRank(F("search_vector"), query)).order_by("-rank", "pk")
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        """Describe the ``search_mode`` parameter next to ``search``."""
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.search_mode_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "`plain` (default) matches substrings of name and scientific name; "
+                    "`fulltext` runs a ranked full-text search over name, scientific name "
+                    "and description."
+                ),
+                "schema": {"type": "string", "enum": list(self.search_modes)},
+            }
+        ]
+
+
+class CropFuzzyFilter(filters.BaseFilterBackend):
+    """Typo-tolerant matching of name and scientific_name with pg_trgm.
+
+    ``?fuzzy=Tritcum aestivm`` keeps crops whose name or scientific name is
+    trigram-similar to the term, ordered by similarity unless an explicit
+    ``ordering`` is given. ``?fuzzy_threshold=`` (0.3 to 1) sets the minimum
+    similarity. Matching always uses the ``%`` operator so the trigram GIN
+    indexes pick the candidates instead of computing similarity for every
+    row, which is why lower thresholds are rejected. Must run after
+    ``OrderingFilter``.
+    """
+
+    fuzzy_param = "fuzzy"
+    threshold_param = "fuzzy_threshold"
+    default_threshold = 0.3
+    # pg_trgm.similarity_threshold, the threshold ``%`` matches at and the
+    # lowest one accepted; never changed on the session.
+    trigram_operator_threshold = 0.3
+
+    def get_threshold(self, request):
+        """Return the validated similarity threshold for the request."""
+        value = request.query_params.get(self.threshold_param)
+        if value in (None, ""):
+            return self.default_threshold
+        try:
+            threshold = float(value)
+        except ValueError:
+            threshold = -1
+        if not self.trigram_operator_threshold <= threshold <= 1:
+            raise ValidationError(
+                {self.threshold_param: f"Must be a number between {self.trigram_operator_threshold} and 1."}
+            )
+        return threshold
+
+    def filter_queryset(self, request, queryset, view):
+        """Keep crops similar to ``?fuzzy=``, most similar first."""
+        term = request.query_params.get(self.fuzzy_param, "").strip()
+        if not term:
+            return queryset
+        return self.filter_similar(request, queryset, term, self.get_threshold(request))
+
+    async def afilter_queryset(self, request, queryset, view):
+        """Async ``filter_queryset``; it runs no queries of its own."""
+        return self.filter_queryset(request, queryset, view)
+
+    def filter_similar(self, request, queryset, term, threshold):
+        """Return ``queryset`` narrowed to crops at least ``threshold`` similar to ``term``.
+
+        The threshold is compared explicitly rather than set on the session,
+        which a pooled connection would carry into later requests. ``%``
+        matches at pg_trgm's default threshold, which :meth:`get_threshold`
+        never goes below, and narrows the candidates through the indexes.
+        """
+        similarity = Greatest(TrigramSimilarity("name", term), TrigramSimilarity("scientific_name", term))
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.alias(similarity=similarity)
+        else:
+            queryset = queryset.annotate(similarity=similarity).order_by("-similarity", "pk")
+        queryset = queryset.filter(Q(name__trigram_similar=term) | Q(scientific_name__trigram_similar=term))
+        return queryset.filter(similarity__gte=threshold)
+
+    def get_schema_operation_parameters(self, view):
+        """Describe the ``fuzzy`` and ``fuzzy_threshold`` parameters."""
+        return [
+            {
+                "name": self.fuzzy_param,
+                "required": False,
+                "in": "query",
+                "description": "Typo-tolerant match on name and scientific name, most similar first.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.threshold_param,
+                "required": False,
+                "in": "query",
+                "description": f"Minimum trigram similarity for `fuzzy` (default {self.default_threshold}).",
+                "schema": {"type": "number", "minimum": self.trigram_operator_threshold, "maximum": 1},
+            },
+        ]
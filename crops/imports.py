@@ -0,0 +1,186 @@
+import csv
+from contextlib import nullcontext
+from io import TextIOWrapper
+from pathlib import PurePath
+from zipfile import BadZipFile
+
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, transaction
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from .exports import EXPORT_COLUMNS
+from .models import Crop, CropCategory
+from .signals import post_bulk_save
+
+IMPORT_FORMATS = ("xlsx", "csv")
+
+# Rows validated and upserted per INSERT ... ON CONFLICT statement.
+IMPORT_BATCH_SIZE = 2000
+
+# Row errors listed in a report; the total is always counted.
+MAX_REPORTED_ERRORS = 1000
+
+# Columns an import must provide; ``description`` is optional.
+REQUIRED_COLUMNS = ("name", "scientific_name", "category", "growth_duration_days", "water_requirements")
+IMPORT_COLUMNS = REQUIRED_COLUMNS + ("description",)
+
+# Natural key imported rows are upserted on (see ``uniq_crop_natural_key``).
+NATURAL_KEY = ("name", "scientific_name", "category")
+# Row error for each row of a batch the database refused to write.
+BATCH_REJECTED_ERROR = {"non_field_errors": ["Not written: the database rejected this row's batch."]}
+
+# Columns overwritten when an imported row matches an existing crop.
+UPSERT_FIELDS = ("description", "growth_duration_days", "water_requirements", "updated_at")
+
+
+def detect_format(filename):
+    """Return the import format implied by ``filename``'s extension."""
+    suffix = PurePath(filename or "").suffix.lower().lstrip(".")
+    if suffix not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported file type. Choose from: {', '.join(IMPORT_FORMATS)}.")
+    return suffix
+
+
+def parse_header(header):
+    """Return the import column key of each cell in ``header``, ``None`` for ignored ones.
+
+    Cells may hold either the column keys of a CSV export or the headers of
+    an Excel export, in any case. Raises ``ValueError`` naming missing
+    required columns.
+    """
+    names = {}
+    for key, (title, _, _) in EXPORT_COLUMNS.items():
+        names[key] = names[title.lower()] = key
+    keys = [names.get(str(cell or "").strip().lower()) for cell in header]
+    keys = [key if key in IMPORT_COLUMNS else None for key in keys]
+    missing = [key for key in REQUIRED_COLUMNS if key not in keys]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}.")
+    return keys
+
+
+def read_rows(file, file_format):
+    """Yield ``(row_number, {column: value})`` for each non-empty row of ``file``.
+
+    ``file`` is a binary file object. Workbooks are opened read-only, so
+    rows are parsed from the sheet XML as they are reached, and CSV is
+    decoded line by line; neither is loaded into memory as a whole. Raises
+    ``ValueError`` for files that cannot be parsed.
+    """
+    if file_format == "xlsx":
+        try:
+            workbook = load_workbook(file, read_only=True, data_only=True)
+        except (BadZipFile, InvalidFileException, KeyError):
+            raise ValueError("The file is not a valid Excel workbook.")
+        try:
+            yield from _read_table(workbook.active.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+    else:
+        text = TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            yield from _read_table(csv.reader(text))
+        except csv.Error as exc:
+            raise ValueError(f"The file is not valid CSV: {exc}.")
+        finally:
+            text.detach()
+
+
+def _read_table(table):
+    """Map the rows of ``table`` onto the column keys named by its first row."""
+    table = iter(table)
+    try:
+        keys = parse_header(next(table))
+    except StopIteration:
+        raise ValueError("The file is empty.")
+    for number, row in enumerate(table, start=2):
+        if not any(cell not in (None, "") for cell in row):
+            continue
+        yield number, {key: value for key, value in zip(keys, row) if key is not None}
+
+
+def _clean_row(values, categories):
+    """Return ``(crop, None)`` for a valid row or ``(None, errors)`` otherwise."""
+    crop, errors = Crop(), {}
+    for key in IMPORT_COLUMNS:
+        value = values.get(key)
+        if key == "category":
+            category_id = categories.get(str(value or "").strip())
+            if category_id is None:
+                errors[key] = [f'Unknown category "{value}".']
+            crop.category_id = category_id
+            continue
+        if key == "description" and value is None:
+            value = ""
+        if isinstance(value, str):
+            value = value.strip()
+        try:
+            setattr(crop, key, Crop._meta.get_field(key).clean(value, crop))
+        except ValidationError as exc:
+            errors[key] = exc.messages
+    return (None, errors) if errors else (crop, None)
+
+
+def import_crops(rows, dry_run=False, atomic=True, batch_size=IMPORT_BATCH_SIZE):
+    """Validate ``rows`` from :func:`read_rows` and upsert them in batches.
+
+    Rows are upserted on their natural key with one
+    ``INSERT ... ON CONFLICT DO UPDATE`` per batch, so re-importing a file
+    updates the crops it created. Categories are resolved by name from a
+    single preloaded map. A row repeating a natural key seen earlier in the
+    same batch replaces it, as a later row would in the database.
+
+    With ``dry_run`` nothing is written. With ``atomic`` the import runs in
+    one transaction and any row error rolls it back. Otherwise each batch
+    commits on its own, so a long import holds no locks across batches and
+    keeps what it wrote if it stops; a batch the database refuses, say for a
+    category deleted meanwhile, is reported as an error on each of its rows.
+    Returns a report dict with the number of rows read and written, the
+    error count and the first :data:`MAX_REPORTED_ERRORS` errors as
+    ``{"row", "errors"}``.
+    """
+    categories = dict(CropCategory.objects.values_list("name", "id"))
+    report = {"rows": 0, "written": 0, "error_count": 0, "errors": [], "dry_run": dry_run}
+
+    def add_error(number, errors):
+        report["error_count"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": number, "errors": errors})
+
+    def flush(batch):
+        if not batch or dry_run or (atomic and report["error_count"]):
+            return
+        crops = [crop for _, crop in batch.values()]
+        try:
+            with transaction.atomic():
+                Crop.objects.bulk_create(
+                    crops,
+                    update_conflicts=True,
+                    unique_fields=list(NATURAL_KEY),
+                    update_fields=list(UPSERT_FIELDS),
+                )
+                post_bulk_save.send(sender=Crop, instances=crops, created=None)
+        except (DataError, IntegrityError):
+            for number in sorted(number for number, _ in batch.values()):
+                add_error(number, BATCH_REJECTED_ERROR)
+            return
+        report["written"] += len(crops)
+
+    with transaction.atomic() if atomic else nullcontext():
+        batch = {}
+        for number, values in rows:
+            report["rows"] += 1
+            crop, errors = _clean_row(values, categories)
+            if errors:
+                add_error(number, errors)
+                continue
+            batch[(crop.name, crop.scientific_name, crop.category_id)] = (number, crop)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = {}
+        flush(batch)
+        if atomic and report["error_count"]:
+            transaction.set_rollback(True)
+            report["written"] = 0
+    return report
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .exports import EXPORT_CHUNK_SIZE, iter_crop_rows, iter_export
+from .filters import CropFilter, CropFuzzyFilter, CropSearchFilter
+from .models import Crop, CropCategory, DataVersion, ExportJob
+
+logger = logging.getLogger(__name__)
+
+# Seconds between heartbeats of the jobs a process has enqueued; well under
+# ``EXPORT_JOB_STALE_SECONDS`` so a slow beat is not mistaken for a dead process.
+HEARTBEAT_SECONDS = 15
+
+# Error recorded on jobs whose process stopped before finishing them.
+STALE_JOB_ERROR = "The process building this export stopped before it finished."
+
+_executor = None
+_executor_lock = threading.Lock()
+# Jobs enqueued by this process and not finished yet.
+_active_jobs = set()
+
+
+def get_executor():
+    """Return the process-wide pool that builds export files.
+
+    Creating it also fails the jobs that earlier processes left stale,
+    expires old exports and starts the heartbeat that keeps this process's
+    jobs from looking stale.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            fail_stale_jobs()
+            expire_jobs()
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EXPORT_JOB_WORKERS,
+                thread_name_prefix="export-job",
+            )
+            threading.Thread(target=_beat, name="export-job-heartbeat", daemon=True).start()
+    return _executor
+
+
+def _beat():
+    """Touch ``heartbeat_at`` of this process's pending and running jobs, forever."""
+    while True:
+        time.sleep(HEARTBEAT_SECONDS)
+        with _executor_lock:
+            job_ids = list(_active_jobs)
+        if not job_ids:
+            continue
+        try:
+            ExportJob.objects.filter(pk__in=job_ids).update(heartbeat_at=timezone.now())
+        except DatabaseError:
+            logger.exception("Export job heartbeat failed")
+        finally:
+            connections.close_all()
+
+
+def stale_jobs():
+    """Return pending or running jobs whose process has not beaten for ``EXPORT_JOB_STALE_SECONDS``.
+
+    Jobs are built in the process that enqueued them, so a restart leaves
+    its unfinished jobs behind; nothing will ever finish them.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS)
+    return ExportJob.objects.filter(
+        status__in=[ExportJob.Status.PENDING, ExportJob.Status.RUNNING],
+        heartbeat_at__lt=cutoff,
+    )
+
+
+def fail_stale_jobs(**filters):
+    """Mark :func:`stale_jobs` matching ``filters`` as failed; return how many there were."""
+    return stale_jobs().filter(**filters).update(
+        status=ExportJob.Status.FAILED,
+        error=STALE_JOB_ERROR,
+        finished_at=timezone.now(),
+    )
+
+
+def expire_jobs(now=None):
+    """Expire finished jobs that are superseded or old, delete their files; return how many.
+
+    A job is superseded once a crop or category changed after it was built,
+    since the same request now gets a new fingerprint and file. Jobs
+    finished more than ``EXPORT_JOB_RETENTION_HOURS`` ago expire too. Jobs
+    of different users can share a file, so a file is only deleted once no
+    job still using it or building it is left.
+    """
+    cutoff = (now or timezone.now()) - timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)
+    versions = DataVersion.current(Crop, CropCategory)
+    succeeded = ExportJob.objects.filter(status=ExportJob.Status.SUCCEEDED)
+    expired = [
+        job
+        for job in succeeded.only("pk", "params", "fingerprint", "finished_at")
+        if job.finished_at < cutoff or export_fingerprint(job.params, versions) != job.fingerprint
+    ]
+    if not expired:
+        return 0
+    count = succeeded.filter(pk__in=[job.pk for job in expired]).update(status=ExportJob.Status.EXPIRED)
+
+    in_use = set(
+        ExportJob.objects.filter(fingerprint__in={job.fingerprint for job in expired})
+        .filter(status__in=[ExportJob.Status.PENDING, ExportJob.Status.RUNNING, ExportJob.Status.SUCCEEDED])
+        .values_list("fingerprint", flat=True)
+    )
+    for path in {job.file_path for job in expired if job.fingerprint not in in_use}:
+        path.unlink(missing_ok=True)
+    return count
+
+
+def normalize_export_params(data):
+    """Keep the export, filter, search and ordering parameters of ``data`` as strings."""
+    keys = {"format", "columns", api_settings.SEARCH_PARAM, api_settings.ORDERING_PARAM}
+    keys.update(
+        [CropSearchFilter.search_mode_param, CropFuzzyFilter.fuzzy_param, CropFuzzyFilter.threshold_param]
+    )
+    keys.update(CropFilter.base_filters)
+    return {key: str(data[key]) for key in sorted(keys) if data.get(key) not in (None, "")}
+
+
+def export_view(params):
+    """Return a ``CropViewSet`` set up as if ``params`` were the export query string.
+
+    Jobs run outside any request, so this lets them reuse the list
+    endpoint's filter, search and ordering pipeline unchanged.
+    """
+    from .views import CropViewSet
+
+    query = QueryDict(mutable=True)
+    query.update(params)
+    http_request = HttpRequest()
+    http_request.method = "GET"
+    http_request.GET = query
+
+    view = CropViewSet(action="export_crops", args=(), kwargs={}, format_kwarg=None)
+    view.request = Request(http_request)
+    return view
+
+
+def export_fingerprint(params, versions=None):
+    """Hash ``params`` together with the current crop and category data versions.
+
+    Two requests share a fingerprint only if they ask for the same export and
+    no crop or category changed in between. ``versions`` saves looking the
+    versions up again when hashing many jobs.
+    """
+    if versions is None:
+        versions = DataVersion.current(Crop, CropCategory)
+    payload = {"params": params, "versions": versions}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def find_export_job(fingerprint, owner):
+    """Return ``owner``'s job to reuse for ``fingerprint``, or ``None`` if a new one is needed.
+
+    Failed and expired jobs are never reused. Stale ones are marked failed
+    first, so the export is built again rather than waited on forever.
+    """
+    fail_stale_jobs(fingerprint=fingerprint)
+    job = (
+        ExportJob.objects.filter(owner=owner, fingerprint=fingerprint)
+        .exclude(status__in=[ExportJob.Status.FAILED, ExportJob.Status.EXPIRED])
+        .first()
+    )
+    if job is None or (job.status == ExportJob.Status.SUCCEEDED and not job.file_path.exists()):
+        return None
+    return job
+
+
+def create_export_job(params, fingerprint, owner):
+    """Create ``owner``'s job for ``params``; return it and whether it was enqueued.
+
+    Files are named by fingerprint, so when another user's job has already
+    built this export the new job succeeds at once and shares the file.
+    Nothing else of the other job is reused or revealed.
+    """
+    built = ExportJob.objects.filter(fingerprint=fingerprint, status=ExportJob.Status.SUCCEEDED).first()
+    if built is not None and built.file_path.exists():
+        now = timezone.now()
+        job = ExportJob.objects.create(
+            owner=owner,
+            params=params,
+            fingerprint=fingerprint,
+            status=ExportJob.Status.SUCCEEDED,
+            rows_written=built.rows_written,
+            rows_total=built.rows_total,
+            file_size=built.file_size,
+            started_at=now,
+            finished_at=now,
+        )
+        return job, False
+    job = ExportJob.objects.create(owner=owner, params=params, fingerprint=fingerprint)
+    enqueue_export_job(job)
+    return job, True
+
+
+def enqueue_export_job(job):
+    """Build ``job`` on the worker pool once the surrounding transaction commits."""
+
+    def submit():
+        executor = get_executor()
+        with _executor_lock:
+            _active_jobs.add(job.pk)
+        executor.submit(run_export_job, job.pk)
+
+    transaction.on_commit(submit)
+
+
+def _track_progress(job_id, rows):
+    """Pass ``rows`` through, recording how many were written every chunk."""
+    written = 0
+    for written, row in enumerate(rows, start=1):
+        yield row
+        if written % EXPORT_CHUNK_SIZE == 0:
+            ExportJob.objects.filter(pk=job_id).update(rows_written=written)
+    ExportJob.objects.filter(pk=job_id).update(rows_written=written)
+
+
+def run_export_job(job_id):
+    """Write the export described by job ``job_id`` to disk.
+
+    The file is written under a temporary name and moved into place once
+    complete, so a finished path never points at a partial file. Only a
+    job still running is finished, so one failed as stale in the meantime
+    is not revived.
+    """
+    jobs = ExportJob.objects.filter(pk=job_id)
+    partial = None
+    try:
+        # A job failed as stale meanwhile has been replaced; leave it failed.
+        if not jobs.filter(status=ExportJob.Status.PENDING).update(
+            status=ExportJob.Status.RUNNING, started_at=timezone.now(), heartbeat_at=timezone.now()
+        ):
+            return
+        job = jobs.get()
+
+        view = export_view(job.params)
+        export_format, columns = view.get_export_options(job.params)
+        queryset = view.filter_queryset(view.get_queryset())
+        jobs.update(rows_total=queryset.count())
+
+        path = job.file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.{job.pk}.part")
+        rows = _track_progress(job.pk, iter_crop_rows(queryset, columns))
+        with open(partial, "wb") as out:
+            for block in iter_export(rows, export_format, columns):
+                out.write(block)
+        os.replace(partial, path)
+
+        # A job failed as stale while it ran stays failed; its replacement owns the outcome.
+        jobs.filter(status=ExportJob.Status.RUNNING).update(
+            status=ExportJob.Status.SUCCEEDED,
+            file_size=path.stat().st_size,
+            finished_at=timezone.now(),
+        )
+    except Exception as exc:
+        logger.exception("Export job %s failed", job_id)
+        if partial is not None:
+            partial.unlink(missing_ok=True)
+        jobs.filter(status=ExportJob.Status.RUNNING).update(
+            status=ExportJob.Status.FAILED, error=str(exc), finished_at=timezone.now()
+        )
+    finally:
+        with _executor_lock:
+            _active_jobs.discard(job_id)
+        connections.close_all()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from crops.jobs import expire_jobs
+
+
+class Command(BaseCommand):
+    help = "Expire export jobs superseded by data changes or past EXPORT_JOB_RETENTION_HOURS; delete their files."
+
+    def handle(self, *args, **options):
+        expired = expire_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} export jobs."))
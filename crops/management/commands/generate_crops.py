@@ -0,0 +1,114 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from crops.models import Crop
+from crops.synthetic import GENERATE_BATCH_SIZE, generate_categories, generate_crops
+
+
+def parse_shares(value):
+    """Parse ``low=30,medium=50,high=20`` into a ``{requirement: weight}`` dict."""
+    shares = {}
+    for part in value.split(","):
+        key, _, weight = part.partition("=")
+        key = key.strip()
+        if key not in Crop.WaterRequirement.values:
+            raise CommandError(f"Unknown water requirement {key!r}; use low, medium or high.")
+        try:
+            shares[key] = float(weight)
+        except ValueError:
+            raise CommandError(f"Invalid weight for {key!r}: {weight!r}.")
+        if shares[key] < 0:
+            raise CommandError(f"Weight for {key!r} must not be negative.")
+    if not sum(shares.values()):
+        raise CommandError("At least one water requirement needs a positive weight.")
+    return shares
+
+
+def parse_reference_time(value):
+    """Parse an ISO 8601 date or datetime; naive values are in the current time zone."""
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid --reference-time {value!r}; use ISO 8601, e.g. 2024-01-01T00:00:00Z.")
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic categories and crops for load tests and benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--crops", type=int, default=100_000, help="Crops to add.")
+        parser.add_argument("--categories", type=int, default=17, help="Categories to spread them over.")
+        parser.add_argument(
+            "--water",
+            type=parse_shares,
+            default=None,
+            help="Relative weight of each water requirement, e.g. low=30,medium=50,high=20.",
+        )
+        parser.add_argument("--duration-mean", type=int, default=120)
+        parser.add_argument("--duration-stddev", type=int, default=45)
+        parser.add_argument("--duration-min", type=int, default=20)
+        parser.add_argument("--duration-max", type=int, default=365)
+        parser.add_argument(
+            "--category-skew",
+            type=float,
+            default=1.0,
+            help="1 spreads crops evenly; higher values crowd them into the first categories.",
+        )
+        parser.add_argument("--age-days", type=int, default=3 * 365, help="Spread created_at over this many days.")
+        parser.add_argument("--batch-size", type=int, default=GENERATE_BATCH_SIZE)
+        parser.add_argument("--seed", type=int, help="Make the generated crops reproducible.")
+        parser.add_argument(
+            "--reference-time",
+            type=parse_reference_time,
+            help="Spread created_at over the --age-days before this time; defaults to now, "
+            "or to a fixed date with --seed.",
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Drop the crop indexes during the load and rebuild them after; about twice as fast.",
+        )
+
+    def handle(self, *args, **options):
+        if options["crops"] < 0 or options["categories"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--crops must not be negative; --categories and --batch-size must be positive.")
+        if not 0 < options["duration_min"] <= options["duration_max"]:
+            raise CommandError("--duration-min must be positive and at most --duration-max.")
+        if options["category_skew"] <= 0:
+            raise CommandError("--category-skew must be positive.")
+        if options["reference_time"] and options["reference_time"] > timezone.now():
+            raise CommandError("--reference-time must not be in the future.")
+
+        started = time.perf_counter()
+        categories = generate_categories(options["categories"])
+
+        def progress(done):
+            rate = done / max(time.perf_counter() - started, 1e-9)
+            self.stdout.write(f"{done:,} / {options['crops']:,} crops ({rate:,.0f} rows/s)")
+
+        written = generate_crops(
+            options["crops"],
+            categories,
+            water_shares=options["water"],
+            duration_mean=options["duration_mean"],
+            duration_stddev=options["duration_stddev"],
+            duration_range=(options["duration_min"], options["duration_max"]),
+            category_skew=options["category_skew"],
+            age_days=options["age_days"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            reference_time=options["reference_time"],
+            defer_indexes=options["defer_indexes"],
+            progress=progress if options["verbosity"] > 0 else None,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{written:,} crops generated in {len(categories)} categories "
+                f"in {elapsed:.1f}s ({written / max(elapsed, 1e-9):,.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crops.imports import IMPORT_BATCH_SIZE, detect_format, import_crops, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import crops from an Excel or CSV file laid out like the crop export."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a .xlsx or .csv file.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate rows without writing.")
+        parser.add_argument(
+            "--best-effort",
+            action="store_true",
+            help="Write valid rows even if some rows are invalid.",
+        )
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options["path"], "rb") as file:
+                report = import_crops(
+                    read_rows(file, detect_format(options["path"])),
+                    dry_run=options["dry_run"],
+                    atomic=not options["best_effort"],
+                    batch_size=options["batch_size"],
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if report["error_count"] > len(report["errors"]):
+            self.stderr.write(f"... and {report['error_count'] - len(report['errors'])} more.")
+
+        summary = (
+            f"{report['rows']} rows read, {report['written']} written, {report['error_count']} invalid "
+            f"in {elapsed:.1f}s ({report['rows'] / max(elapsed, 1e-9):,.0f} rows/s)."
+        )
+        if report["error_count"]:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from crops.sync import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete change feed tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Tombstones deleted per transaction.")
+
+    def handle(self, *args, **options):
+        purged = purge_tombstones(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} tombstones."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from crops.statistics import rebuild_statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the crop statistics summary table from the crops table."
+
+    def handle(self, *args, **options):
+        groups = rebuild_statistics()
+        self.stdout.write(self.style.SUCCESS(f"Crop statistics rebuilt: {groups} groups."))
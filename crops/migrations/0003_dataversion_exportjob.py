@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0002_alter_growth_duration_days_to_integerfield'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(help_text='Model label, e.g. crops.crop.', max_length=100, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('params', models.JSONField(default=dict, help_text='Normalised format, columns, filter, search and ordering parameters.')),
+                ('fingerprint', models.CharField(help_text='Hash of the parameters and the data versions they were requested against.', max_length=64)),
+                ('rows_written', models.PositiveBigIntegerField(default=0)),
+                ('rows_total', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('file_size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['fingerprint'], name='idx_exportjob_fingerprint')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0003_dataversion_exportjob'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='crop',
+            name='idx_crop_name',
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['name', 'id'], name='idx_crop_name_id'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['created_at', 'id'], name='idx_crop_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['growth_duration_days', 'id'], name='idx_crop_duration_id'),
+        ),
+    ]
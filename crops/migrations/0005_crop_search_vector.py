@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE FUNCTION crops_crop_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(NEW.scientific_name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER crops_crop_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, scientific_name, description ON crops_crop
+    FOR EACH ROW EXECUTE FUNCTION crops_crop_search_vector_update();
+
+UPDATE crops_crop SET name = name;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS crops_crop_search_vector_trigger ON crops_crop;
+DROP FUNCTION IF EXISTS crops_crop_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0004_crop_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crop',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted tsvector of name, scientific_name and description, maintained by a trigger.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='idx_crop_search_vector'),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_TRIGGER, DROP_SEARCH_VECTOR_TRIGGER),
+    ]
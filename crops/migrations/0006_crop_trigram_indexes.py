@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:58
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0005_crop_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='crop',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='idx_crop_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['scientific_name'], name='idx_crop_sci_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
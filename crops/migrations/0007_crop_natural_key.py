@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0006_crop_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='crop',
+            constraint=models.UniqueConstraint(fields=('name', 'scientific_name', 'category'), name='uniq_crop_natural_key'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:20
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0007_crop_natural_key'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='crop',
+            name='idx_crop_category',
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='idx_crop_name_upper_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('scientific_name'), name='gin_trgm_ops'), name='idx_crop_sci_upper_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['category', 'name', 'id'], name='idx_crop_cat_name_id'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='idx_crop_cat_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['category', 'growth_duration_days', 'id'], name='idx_crop_cat_duration_id'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['water_requirements', 'name', 'id'], name='idx_crop_water_name_id'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['water_requirements', 'created_at', 'id'], name='idx_crop_water_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['water_requirements', 'growth_duration_days', 'id'], name='idx_crop_water_duration_id'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+TOMBSTONE_TRIGGERS = """
+CREATE FUNCTION crops_record_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO crops_tombstone (label, object_id, deleted_at)
+    SELECT TG_ARGV[0], id, clock_timestamp() FROM deleted_rows;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER crops_crop_tombstone_trigger
+    AFTER DELETE ON crops_crop
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION crops_record_tombstones('crops.crop');
+
+CREATE TRIGGER crops_cropcategory_tombstone_trigger
+    AFTER DELETE ON crops_cropcategory
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION crops_record_tombstones('crops.cropcategory');
+"""
+
+DROP_TOMBSTONE_TRIGGERS = """
+DROP TRIGGER IF EXISTS crops_crop_tombstone_trigger ON crops_crop;
+DROP TRIGGER IF EXISTS crops_cropcategory_tombstone_trigger ON crops_cropcategory;
+DROP FUNCTION IF EXISTS crops_record_tombstones();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0008_crop_filter_order_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cropcategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='cropcategory',
+            index=models.Index(fields=['updated_at', 'id'], name='idx_category_updated_id'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['updated_at', 'id'], name='idx_crop_updated_id'),
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(help_text='Model label of the deleted row, e.g. crops.crop.', max_length=100)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['deleted_at', 'id'],
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='idx_tombstone_deleted_id')],
+            },
+        ),
+        migrations.RunSQL(TOMBSTONE_TRIGGERS, DROP_TOMBSTONE_TRIGGERS),
+    ]
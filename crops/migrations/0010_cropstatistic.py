@@ -0,0 +1,160 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Per-group deltas of one statement are collected as JSON and applied in
+# three set-based statements: counts and totals take the delta, min / max
+# widen with added rows, and groups that lost a row on a boundary re-read
+# it through the (category, growth_duration_days, id) index. Transition
+# tables cannot be shared between events, so each event gets a trigger.
+STATISTICS_TRIGGERS = """
+CREATE FUNCTION crops_apply_crop_statistics(changes jsonb) RETURNS void AS $$
+BEGIN
+    INSERT INTO crops_cropstatistic AS s (
+        category_id, water_requirements, crop_count, duration_total, duration_min, duration_max
+    )
+    SELECT d.category_id, d.water_requirements, d.n, d.total, d.lo, d.hi
+    FROM jsonb_to_recordset(changes) AS d(
+        category_id bigint, water_requirements varchar, n bigint, total bigint,
+        lo int, hi int, lo_removed int, hi_removed int
+    )
+    ON CONFLICT (category_id, water_requirements) DO UPDATE SET
+        crop_count = s.crop_count + EXCLUDED.crop_count,
+        duration_total = s.duration_total + EXCLUDED.duration_total,
+        duration_min = LEAST(s.duration_min, EXCLUDED.duration_min),
+        duration_max = GREATEST(s.duration_max, EXCLUDED.duration_max);
+
+    UPDATE crops_cropstatistic AS s SET
+        duration_min = (
+            SELECT c.growth_duration_days FROM crops_crop c
+            WHERE c.category_id = s.category_id AND c.water_requirements = s.water_requirements
+            ORDER BY c.growth_duration_days LIMIT 1
+        ),
+        duration_max = (
+            SELECT c.growth_duration_days FROM crops_crop c
+            WHERE c.category_id = s.category_id AND c.water_requirements = s.water_requirements
+            ORDER BY c.growth_duration_days DESC LIMIT 1
+        )
+    FROM jsonb_to_recordset(changes) AS d(
+        category_id bigint, water_requirements varchar, lo_removed int, hi_removed int
+    )
+    WHERE s.category_id = d.category_id
+        AND s.water_requirements = d.water_requirements
+        AND s.crop_count > 0
+        AND (d.lo_removed <= s.duration_min OR d.hi_removed >= s.duration_max);
+
+    DELETE FROM crops_cropstatistic AS s
+    USING jsonb_to_recordset(changes) AS d(category_id bigint, water_requirements varchar)
+    WHERE s.category_id = d.category_id
+        AND s.water_requirements = d.water_requirements
+        AND s.crop_count <= 0;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION crops_crop_statistics_update() RETURNS trigger AS $$
+DECLARE
+    changes jsonb;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT jsonb_agg(d) INTO changes FROM (
+            SELECT category_id, water_requirements, count(*) AS n, sum(growth_duration_days) AS total,
+                   min(growth_duration_days) AS lo, max(growth_duration_days) AS hi,
+                   NULL::int AS lo_removed, NULL::int AS hi_removed
+            FROM new_rows
+            GROUP BY category_id, water_requirements
+        ) d;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT jsonb_agg(d) INTO changes FROM (
+            SELECT category_id, water_requirements, -count(*) AS n, -sum(growth_duration_days) AS total,
+                   NULL::int AS lo, NULL::int AS hi,
+                   min(growth_duration_days) AS lo_removed, max(growth_duration_days) AS hi_removed
+            FROM old_rows
+            GROUP BY category_id, water_requirements
+        ) d;
+    ELSE
+        -- Only rows whose group or duration changed affect the statistics.
+        SELECT jsonb_agg(d) INTO changes FROM (
+            SELECT category_id, water_requirements, sum(n) AS n, sum(total) AS total,
+                   min(lo) AS lo, max(hi) AS hi, min(removed) AS lo_removed, max(removed) AS hi_removed
+            FROM (
+                SELECT a.category_id, a.water_requirements, 1 AS n, a.growth_duration_days AS total,
+                       a.growth_duration_days AS lo, a.growth_duration_days AS hi, NULL::int AS removed
+                FROM new_rows a JOIN old_rows b USING (id)
+                WHERE (b.category_id, b.water_requirements, b.growth_duration_days)
+                    IS DISTINCT FROM (a.category_id, a.water_requirements, a.growth_duration_days)
+                UNION ALL
+                SELECT b.category_id, b.water_requirements, -1, -b.growth_duration_days,
+                       NULL, NULL, b.growth_duration_days
+                FROM new_rows a JOIN old_rows b USING (id)
+                WHERE (b.category_id, b.water_requirements, b.growth_duration_days)
+                    IS DISTINCT FROM (a.category_id, a.water_requirements, a.growth_duration_days)
+            ) moved
+            GROUP BY category_id, water_requirements
+        ) d;
+    END IF;
+
+    IF changes IS NOT NULL THEN
+        PERFORM crops_apply_crop_statistics(changes);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER crops_crop_statistics_insert
+    AFTER INSERT ON crops_crop
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION crops_crop_statistics_update();
+
+CREATE TRIGGER crops_crop_statistics_update
+    AFTER UPDATE ON crops_crop
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION crops_crop_statistics_update();
+
+CREATE TRIGGER crops_crop_statistics_delete
+    AFTER DELETE ON crops_crop
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION crops_crop_statistics_update();
+
+INSERT INTO crops_cropstatistic (
+    category_id, water_requirements, crop_count, duration_total, duration_min, duration_max
+)
+SELECT category_id, water_requirements, count(*), sum(growth_duration_days),
+       min(growth_duration_days), max(growth_duration_days)
+FROM crops_crop
+GROUP BY category_id, water_requirements;
+"""
+
+DROP_STATISTICS_TRIGGERS = """
+DROP TRIGGER IF EXISTS crops_crop_statistics_insert ON crops_crop;
+DROP TRIGGER IF EXISTS crops_crop_statistics_update ON crops_crop;
+DROP TRIGGER IF EXISTS crops_crop_statistics_delete ON crops_crop;
+DROP FUNCTION IF EXISTS crops_crop_statistics_update();
+DROP FUNCTION IF EXISTS crops_apply_crop_statistics(jsonb);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0009_sync_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CropStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('water_requirements', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=10)),
+                ('crop_count', models.BigIntegerField()),
+                ('duration_total', models.BigIntegerField(help_text='Sum of growth_duration_days.')),
+                ('duration_min', models.IntegerField(null=True)),
+                ('duration_max', models.IntegerField(null=True)),
+                ('category', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='crops.cropcategory')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('category', 'water_requirements'), name='uniq_cropstatistic_group')],
+            },
+        ),
+        migrations.RunSQL(STATISTICS_TRIGGERS, DROP_STATISTICS_TRIGGERS),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0010_cropstatistic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Last sign of life from the process that enqueued the job.'),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:30
+
+from django.db import migrations, models
+
+# ``updated_at`` is taken when a row is saved, so a long transaction commits
+# rows behind positions the feed has already handed out. The writing
+# transaction's ID instead lets the feed serve only rows whose transaction
+# has finished: everything below the oldest running transaction. Existing
+# rows keep 0 and come first.
+SYNC_XID_TRIGGERS = """
+CREATE FUNCTION crops_stamp_sync_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.sync_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER crops_crop_sync_xid_trigger
+    BEFORE INSERT OR UPDATE ON crops_crop
+    FOR EACH ROW EXECUTE FUNCTION crops_stamp_sync_xid();
+
+CREATE TRIGGER crops_cropcategory_sync_xid_trigger
+    BEFORE INSERT OR UPDATE ON crops_cropcategory
+    FOR EACH ROW EXECUTE FUNCTION crops_stamp_sync_xid();
+
+CREATE OR REPLACE FUNCTION crops_record_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO crops_tombstone (label, object_id, deleted_at, sync_xid)
+    SELECT TG_ARGV[0], id, clock_timestamp(), pg_current_xact_id()::text::bigint FROM deleted_rows;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_SYNC_XID_TRIGGERS = """
+CREATE OR REPLACE FUNCTION crops_record_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO crops_tombstone (label, object_id, deleted_at)
+    SELECT TG_ARGV[0], id, clock_timestamp() FROM deleted_rows;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS crops_crop_sync_xid_trigger ON crops_crop;
+DROP TRIGGER IF EXISTS crops_cropcategory_sync_xid_trigger ON crops_cropcategory;
+DROP FUNCTION IF EXISTS crops_stamp_sync_xid();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0011_exportjob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TombstonePurge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('purged_at', models.DateTimeField()),
+                ('through_xid', models.BigIntegerField(help_text='Highest sync_xid among the purged tombstones.')),
+                ('tombstones', models.PositiveIntegerField(help_text='Tombstones purged in the batch.')),
+            ],
+        ),
+        migrations.AlterModelOptions(
+            name='tombstone',
+            options={'ordering': ['sync_xid', 'id']},
+        ),
+        migrations.RemoveIndex(
+            model_name='crop',
+            name='idx_crop_updated_id',
+        ),
+        migrations.RemoveIndex(
+            model_name='cropcategory',
+            name='idx_category_updated_id',
+        ),
+        migrations.AddField(
+            model_name='crop',
+            name='sync_xid',
+            field=models.BigIntegerField(default=0, editable=False, help_text='Transaction that last wrote the row, set by a trigger; orders the change feed.'),
+        ),
+        migrations.AddField(
+            model_name='cropcategory',
+            name='sync_xid',
+            field=models.BigIntegerField(default=0, editable=False, help_text='Transaction that last wrote the row, set by a trigger; orders the change feed.'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='sync_xid',
+            field=models.BigIntegerField(default=0, editable=False, help_text='Transaction that last wrote the row, set by a trigger; orders the change feed.'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['sync_xid', 'id'], name='idx_crop_sync_id'),
+        ),
+        migrations.AddIndex(
+            model_name='cropcategory',
+            index=models.Index(fields=['sync_xid', 'id'], name='idx_category_sync_id'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['sync_xid', 'id'], name='idx_tombstone_sync_id'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstonepurge',
+            index=models.Index(fields=['through_xid'], name='idx_tombstonepurge_xid'),
+        ),
+        migrations.RunSQL(SYNC_XID_TRIGGERS, DROP_SYNC_XID_TRIGGERS),
+    ]
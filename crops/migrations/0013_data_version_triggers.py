@@ -0,0 +1,57 @@
+from django.db import migrations
+
+# ``post_save`` / ``post_delete`` receivers missed ``QuerySet.update()``, raw
+# SQL and repeated ``delete()`` calls on one queryset, leaving validators,
+# cached counts and export fingerprints stale. Statement-level triggers see
+# every write. Transition tables cannot be shared between events, so each
+# event gets a trigger; statements that touched no row bump nothing.
+DATA_VERSION_TRIGGERS = """
+CREATE FUNCTION crops_bump_data_version() RETURNS trigger AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM changed_rows) THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO crops_dataversion AS v (label, version, changed_at)
+    VALUES (TG_ARGV[0], 1, clock_timestamp())
+    ON CONFLICT (label) DO UPDATE SET version = v.version + 1, changed_at = clock_timestamp();
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_DATA_VERSION_TRIGGERS = """
+DROP FUNCTION IF EXISTS crops_bump_data_version();
+"""
+
+# (table, label) pairs whose writes bump a data version.
+TRACKED_TABLES = [
+    ("crops_crop", "crops.crop"),
+    ("crops_cropcategory", "crops.cropcategory"),
+]
+
+# Event -> transition table it exposes.
+EVENTS = {"INSERT": "NEW", "UPDATE": "NEW", "DELETE": "OLD"}
+
+for table, label in TRACKED_TABLES:
+    for event, transition in EVENTS.items():
+        DATA_VERSION_TRIGGERS += f"""
+CREATE TRIGGER {table}_version_{event.lower()}_trigger
+    AFTER {event} ON {table}
+    REFERENCING {transition} TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION crops_bump_data_version('{label}');
+"""
+        DROP_DATA_VERSION_TRIGGERS = (
+            f"DROP TRIGGER IF EXISTS {table}_version_{event.lower()}_trigger ON {table};\n"
+            + DROP_DATA_VERSION_TRIGGERS
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0012_sync_feed_commit_order'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DATA_VERSION_TRIGGERS, DROP_DATA_VERSION_TRIGGERS),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('crops', '0013_data_version_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='owner',
+            field=models.ForeignKey(help_text='User who requested the export; only they can see and download the job.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -1,4 +1,11 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
 
 
 class CropCategory(models.Model):
@@ -15,12 +22,20 @@ class CropCategory(models.Model):
         help_text="Optional description of the category.",
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sync_xid = models.BigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Transaction that last wrote the row, set by a trigger; orders the change feed.",
+    )
 
     class Meta:
         verbose_name_plural = "crop categories"
         ordering = ["name"]
         indexes = [
             models.Index(fields=["name"], name="idx_category_name"),
+            # Change feed: rows written since a sync position.
+            models.Index(fields=["sync_xid", "id"], name="idx_category_sync_id"),
         ]
 
     def __str__(self):
@@ -67,15 +82,254 @@ class Crop(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Weighted tsvector of name, scientific_name and description, maintained by a trigger.",
+    )
+    sync_xid = models.BigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Transaction that last wrote the row, set by a trigger; orders the change feed.",
+    )
 
     class Meta:
         ordering = ["name"]
+        constraints = [
+            # Natural key used to upsert imported crops.
+            models.UniqueConstraint(
+                fields=["name", "scientific_name", "category"],
+                name="uniq_crop_natural_key",
+            ),
+        ]
         indexes = [
-            models.Index(fields=["name"], name="idx_crop_name"),
+            GinIndex(fields=["search_vector"], name="idx_crop_search_vector"),
+            GinIndex(fields=["name"], opclasses=["gin_trgm_ops"], name="idx_crop_name_trgm"),
+            GinIndex(fields=["scientific_name"], opclasses=["gin_trgm_ops"], name="idx_crop_sci_name_trgm"),
+            # Plain ``?search=`` compiles to ``UPPER(column::text) LIKE UPPER('%term%')``.
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="idx_crop_name_upper_trgm"),
+            GinIndex(OpClass(Upper("scientific_name"), name="gin_trgm_ops"), name="idx_crop_sci_upper_trgm"),
             models.Index(fields=["scientific_name"], name="idx_crop_sci_name"),
-            models.Index(fields=["category"], name="idx_crop_category"),
+            # Each ordering field with ``id`` as tie-breaker, alone for unfiltered
+            # lists and keyset pagination, and behind each equality filter of
+            # ``CropFilter`` so filtered pages are read in order instead of sorted.
+            # Filtering on both walks the category index and checks the water
+            # requirement per row. (name, id) also serves lookups on name alone,
+            # and the category ones lookups on category alone.
+            models.Index(fields=["name", "id"], name="idx_crop_name_id"),
+            models.Index(fields=["created_at", "id"], name="idx_crop_created_id"),
+            models.Index(fields=["growth_duration_days", "id"], name="idx_crop_duration_id"),
+            models.Index(fields=["category", "name", "id"], name="idx_crop_cat_name_id"),
+            models.Index(fields=["category", "created_at", "id"], name="idx_crop_cat_created_id"),
+            models.Index(fields=["category", "growth_duration_days", "id"], name="idx_crop_cat_duration_id"),
+            models.Index(fields=["water_requirements", "name", "id"], name="idx_crop_water_name_id"),
+            models.Index(fields=["water_requirements", "created_at", "id"], name="idx_crop_water_created_id"),
+            models.Index(fields=["water_requirements", "growth_duration_days", "id"], name="idx_crop_water_duration_id"),
+            # Change feed: rows written since a sync position.
+            models.Index(fields=["sync_xid", "id"], name="idx_crop_sync_id"),
         ]
 
     def __str__(self):
         """Return the crop's common and scientific name."""
         return f"{self.name} ({self.scientific_name})"
+
+
+class DataVersion(models.Model):
+    """Monotonic change counter for a model's table.
+
+    Bumped whenever a row of the tracked model is created, updated or
+    deleted, so callers can tell whether data changed without scanning it.
+    Statement-level database triggers on the crop and category tables bump
+    it once per statement that changed rows, whatever issued it.
+    """
+
+    label = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="Model label, e.g. crops.crop.",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """Return the label and current version."""
+        return f"{self.label} v{self.version}"
+
+    @classmethod
+    def bump(cls, *model_classes):
+        """Increment the version of every model in ``model_classes``."""
+        labels = [model._meta.label_lower for model in model_classes]
+        updated = cls.objects.filter(label__in=labels).update(
+            version=models.F("version") + 1,
+            changed_at=timezone.now(),
+        )
+        if updated < len(labels):
+            for label in labels:
+                cls.objects.get_or_create(label=label, defaults={"version": 1})
+
+    @classmethod
+    def current(cls, *model_classes):
+        """Return ``{label: version}`` for every model in ``model_classes``."""
+        labels = [model._meta.label_lower for model in model_classes]
+        versions = dict.fromkeys(labels, 0)
+        versions.update(cls.objects.filter(label__in=labels).values_list("label", "version"))
+        return versions
+
+
+class CropStatistic(models.Model):
+    """Crop count and growth duration aggregates per category and water requirement.
+
+    Kept current by statement-level database triggers on ``crops_crop``, so
+    every write path, bulk ones included, applies its delta in one
+    statement. ``rebuild_crop_statistics`` recomputes the table from scratch.
+    """
+
+    # No database constraint: the triggers remove a category's rows as its
+    # crops are deleted, before the category itself goes.
+    category = models.ForeignKey(
+        CropCategory,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    water_requirements = models.CharField(max_length=10, choices=Crop.WaterRequirement.choices)
+    crop_count = models.BigIntegerField()
+    duration_total = models.BigIntegerField(help_text="Sum of growth_duration_days.")
+    # Nullable so a delta that only removes rows leaves them unchanged.
+    duration_min = models.IntegerField(null=True)
+    duration_max = models.IntegerField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "water_requirements"],
+                name="uniq_cropstatistic_group",
+            ),
+        ]
+
+    def __str__(self):
+        """Return the group and its crop count."""
+        return f"{self.category_id}/{self.water_requirements}: {self.crop_count}"
+
+
+class Tombstone(models.Model):
+    """Record of a deleted crop or category for the change feed.
+
+    Written by a statement-level database trigger, so every delete is
+    recorded in one ``INSERT`` per statement, including the crops removed
+    by cascade when their category is deleted and deletes that bypass the
+    ORM. ``purge_tombstones`` deletes those older than
+    ``SYNC_TOMBSTONE_RETENTION_DAYS``.
+    """
+
+    label = models.CharField(
+        max_length=100,
+        help_text="Model label of the deleted row, e.g. crops.crop.",
+    )
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+    sync_xid = models.BigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Transaction that last wrote the row, set by a trigger; orders the change feed.",
+    )
+
+    class Meta:
+        ordering = ["sync_xid", "id"]
+        indexes = [
+            # Purges: tombstones past the retention period.
+            models.Index(fields=["deleted_at", "id"], name="idx_tombstone_deleted_id"),
+            # Change feed: tombstones written since a sync position.
+            models.Index(fields=["sync_xid", "id"], name="idx_tombstone_sync_id"),
+        ]
+
+    def __str__(self):
+        """Return the label and ID of the deleted row."""
+        return f"Deleted {self.label} {self.object_id}"
+
+
+class TombstonePurge(models.Model):
+    """A batch of tombstones deleted by ``purge_tombstones``.
+
+    A sync token positioned at or before ``through_xid`` may not have seen
+    every purged deletion, so the feed makes its client start over.
+    """
+
+    purged_at = models.DateTimeField()
+    through_xid = models.BigIntegerField(help_text="Highest sync_xid among the purged tombstones.")
+    tombstones = models.PositiveIntegerField(help_text="Tombstones purged in the batch.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["through_xid"], name="idx_tombstonepurge_xid"),
+        ]
+
+    def __str__(self):
+        """Return how many tombstones were purged and up to which transaction."""
+        return f"Purged {self.tombstones} tombstones through {self.through_xid}"
+
+
+class ExportJob(models.Model):
+    """A crop export built in the background and stored on disk."""
+
+    class Status(models.TextChoices):
+        """Lifecycle states of an export job."""
+
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+        EXPIRED = "expired", "Expired"
+
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="export_jobs",
+        help_text="User who requested the export; only they can see and download the job.",
+    )
+    params = models.JSONField(
+        default=dict,
+        help_text="Normalised format, columns, filter, search and ordering parameters.",
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        help_text="Hash of the parameters and the data versions they were requested against.",
+    )
+    rows_written = models.PositiveBigIntegerField(default=0)
+    rows_total = models.PositiveBigIntegerField(null=True, blank=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Last sign of life from the process that enqueued the job.",
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["fingerprint"], name="idx_exportjob_fingerprint"),
+        ]
+
+    def __str__(self):
+        """Return the job ID and status."""
+        return f"Export job {self.pk} ({self.status})"
+
+    @property
+    def export_format(self):
+        """File format of the export."""
+        return self.params["format"]
+
+    @property
+    def file_path(self):
+        """Location of the finished export on disk."""
+        return Path(settings.EXPORT_ROOT) / f"{self.fingerprint}.{self.export_format}"
@@ -0,0 +1,15 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class ExportContentNegotiation(DefaultContentNegotiation):
+    """Content negotiation for views that stream their own file formats.
+
+    Such views read ``?format=`` themselves to pick the file type, so it must
+    not be treated as a renderer override. Errors are rendered with the
+    view's first renderer.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        """Always choose the first renderer, ignoring ``?format=``."""
+        renderer = renderers[0]
+        return renderer, renderer.media_type
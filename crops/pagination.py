@@ -1,12 +1,418 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import DataVersion
+
+
+def estimate_row_count(model, using="default"):
+    """Return Postgres' planner estimate of the rows in ``model``'s table.
+
+    Scales ``pg_class.reltuples`` by the table's current size the way the
+    planner does, so the estimate tracks growth between ``ANALYZE`` runs.
+    Returns ``None`` when the table has never been analysed.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT CASE
+                WHEN c.reltuples < 0 THEN NULL
+                WHEN c.relpages = 0 THEN c.reltuples
+                ELSE c.reltuples / c.relpages
+                    * (pg_relation_size(c.oid) / current_setting('block_size')::int)
+            END
+            FROM pg_class c
+            WHERE c.oid = %s::regclass
+            """,
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return None if row is None or row[0] is None else int(row[0])
+
+
+class CountedPaginator(DjangoPaginator):
+    """Django paginator that obtains its total from ``count_func``."""
+
+    def __init__(self, object_list, per_page, count_func, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_func = count_func
+
+    @cached_property
+    def count(self):
+        """Return the total number of objects, as computed by ``count_func``."""
+        return self.count_func(self.object_list)
 
 
 class StandardPagination(PageNumberPagination):
     """Standard pagination with configurable page size.
 
     Supports ``page`` and ``page_size`` query parameters.
+
+    Exact ``COUNT(*)`` queries are avoided where possible. An unfiltered list
+    of a large table reports the planner's row estimate, and filtered
+    counts are cached per filter parameters and data version, so they stay
+    exact and are only recomputed after the data changes. The response's
+    ``count_estimated`` flag tells clients which one they got.
     """
 
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+
+    # Unfiltered tables estimated above this many rows skip the exact count.
+    estimate_count_threshold = 100_000
+    # Seconds a filtered count stays cached.
+    count_cache_timeout = 300
+    # Query parameters that never change the count; sparse fieldsets only
+    # shape each object.
+    count_ignored_params = {"page", "page_size", "ordering", "pagination", "cursor", "format", "fields", "omit"}
+    count_estimated = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Remember the view so its already-fetched data versions can be reused."""
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async ``paginate_queryset``: count and fetch the page with the async ORM."""
+        self.view = view
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await self.acount_queryset(queryset)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return [row async for row in self.page.object_list]
+
+    def django_paginator_class(self, queryset, page_size):
+        """Build the paginator with this class's count strategy."""
+        return CountedPaginator(queryset, page_size, count_func=self.count_queryset)
+
+    def count_queryset(self, queryset):
+        """Return the total for ``queryset``, estimated or cached where possible."""
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, using=queryset.db)
+            if estimate is not None and estimate > self.estimate_count_threshold:
+                self.count_estimated = True
+                return estimate
+            return queryset.count()
+
+        key = self.get_count_cache_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    async def acount_queryset(self, queryset):
+        """Async ``count_queryset``."""
+        if not queryset.query.where:
+            estimate = await sync_to_async(estimate_row_count)(queryset.model, using=queryset.db)
+            if estimate is not None and estimate > self.estimate_count_threshold:
+                self.count_estimated = True
+                return estimate
+            return await queryset.acount()
+
+        label = queryset.model._meta.label_lower
+        known = getattr(self.view, "data_versions", {})
+        version = known[label] if label in known else None
+        if version is None:
+            version = (await sync_to_async(DataVersion.current)(queryset.model))[label]
+        key = self.get_count_cache_key(queryset, version)
+        count = await cache.aget(key)
+        if count is None:
+            count = await queryset.acount()
+            await cache.aset(key, count, self.count_cache_timeout)
+        return count
+
+    def get_count_cache_key(self, queryset, version=None):
+        """Return a cache key for the normalised filter parameters and data version."""
+        params = sorted(
+            (key, sorted(values))
+            for key, values in self.request.query_params.lists()
+            if key not in self.count_ignored_params
+        )
+        label = queryset.model._meta.label_lower
+        if version is None:
+            known = getattr(self.view, "data_versions", {})
+            version = known[label] if label in known else DataVersion.current(queryset.model)[label]
+        payload = json.dumps([label, version, params])
+        return f"crops:count:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    def get_paginated_response(self, data):
+        """Return the standard response plus the ``count_estimated`` flag."""
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_estimated": self.count_estimated,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the ``count_estimated`` flag in the OpenAPI schema."""
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_estimated"] = {
+            "type": "boolean",
+            "description": "True when `count` is a planner estimate rather than an exact count.",
+        }
+        return response_schema
+
+
+class OwnedPagination(StandardPagination):
+    """Standard pagination for lists scoped to the requesting user.
+
+    Counts are always exact. The shared count cache is keyed by query
+    parameters and data version, neither of which tells one user's list
+    from another's.
+    """
+
+    def count_queryset(self, queryset):
+        """Return the exact total for ``queryset``."""
+        return queryset.count()
+
+    async def acount_queryset(self, queryset):
+        """Async ``count_queryset``."""
+        return await queryset.acount()
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (seek) pagination over a single ordering field plus ``id``.
+
+    Each page continues from the ``(field, id)`` of the last row seen, so
+    deep pages cost the same as the first one, nothing is counted, and rows
+    inserted or deleted between requests never make a page skip or repeat a
+    row. ``id`` breaks ties between rows sharing the same field value; an
+    index on ``(field, id)`` lets the database seek straight to the page.
+
+    The ordering comes from the view's ``OrderingFilter`` setup and may
+    name a single field. Cursors are opaque and only valid for the ordering
+    they were issued for. Rows may be model instances or ``values()`` dicts
+    carrying ``id`` and the ordering field.
+    """
+
+    page_size = StandardPagination.page_size
+    page_size_query_param = StandardPagination.page_size_query_param
+    max_page_size = StandardPagination.max_page_size
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+
+    def get_page_size(self, request):
+        """Return the requested page size, clamped to ``max_page_size``."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """Return ``(field, descending)`` for the request's single ordering field."""
+        ordering = OrderingFilter().get_ordering(request, queryset, view) or ["id"]
+        if len(ordering) != 1:
+            raise ValidationError({"ordering": "Cursor pagination supports ordering by a single field."})
+        field = ordering[0]
+        return field.lstrip("-"), field.startswith("-")
+
+    def decode_cursor(self, request):
+        """Return the ``(ordering, value, id, reverse)`` position encoded in ``?cursor=``."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            token = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            return token["o"], token["v"], int(token["id"]), bool(token["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row, reverse):
+        """Return the page URL continuing after (or, if ``reverse``, before) ``row``."""
+        if isinstance(row, dict):
+            # Pages of ``values()`` rows, as served by ``RowListMixin``.
+            value, pk = row[self.field], row["id"]
+        else:
+            value, pk = getattr(row, self.field), row.pk
+        token = {
+            "o": self.ordering,
+            "v": value.isoformat() if hasattr(value, "isoformat") else value,
+            "id": pk,
+            "r": int(reverse),
+        }
+        encoded = urlsafe_b64encode(json.dumps(token, separators=(",", ":")).encode()).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page of ``queryset`` following the request's cursor."""
+        return self.paginate_rows(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async ``paginate_queryset``: fetch the page with the async ORM."""
+        page = self.get_page_queryset(queryset, request, view)
+        return self.paginate_rows([row async for row in page])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return ``queryset`` narrowed to the rows of the request's page, plus one."""
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.field, descending = self.get_ordering(request, queryset, view)
+        self.ordering = f"-{self.field}" if descending else self.field
+
+        cursor = self.decode_cursor(request)
+        reverse = False
+        if cursor is not None:
+            ordering, value, pk, reverse = cursor
+            if ordering != self.ordering:
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                value = queryset.model._meta.get_field(self.field).to_python(value)
+            except Exception:
+                raise NotFound(self.invalid_cursor_message)
+            # Rows strictly past the cursor in the direction being read, written as
+            # ``field >= value AND NOT (field = value AND id <= pk)`` so the planner
+            # gets an index range to seek to.
+            ascending = descending == reverse
+            bound, seen = ("gte", "lte") if ascending else ("lte", "gte")
+            queryset = queryset.filter(**{f"{self.field}__{bound}": value}).exclude(
+                **{self.field: value, f"pk__{seen}": pk}
+            )
+        # Read back by ``paginate_rows`` once the page is fetched.
+        self.cursor, self.reverse = cursor, reverse
+
+        descending_read = descending != reverse
+        prefix = "-" if descending_read else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}pk")
+        return queryset[: self.page_size + 1]
+
+    def paginate_rows(self, rows):
+        """Return the page from the ``rows`` fetched for it, and set the page links."""
+        cursor, reverse = self.cursor, self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = has_more if not reverse else cursor is not None
+        has_previous = has_more if reverse else cursor is not None
+        self.next_link = self.encode_cursor(rows[-1], reverse=False) if rows and has_next else None
+        self.previous_link = self.encode_cursor(rows[0], reverse=True) if rows and has_previous else None
+        if not rows and cursor is not None:
+            # Paging past the end returns an empty page that links back to the start.
+            self.previous_link = remove_query_param(self.base_url, self.cursor_query_param)
+        return rows
+
+    def get_paginated_response(self, data):
+        """Wrap ``data`` with links to the neighbouring pages."""
+        return Response(
+            {
+                "next": self.next_link,
+                "previous": self.previous_link,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the paginated response for the OpenAPI schema."""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        """Describe the cursor and page size query parameters."""
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor returned in the next/previous links of a cursor page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class CropPagination(BasePagination):
+    """Page-number pagination by default, keyset pagination on request.
+
+    Clients opt in to keyset pagination per request with
+    ``?pagination=cursor`` (implied by ``?cursor=``); the page-number mode
+    used by the UI stays the default.
+    """
+
+    mode_query_param = "pagination"
+    page_number_class = StandardPagination
+    keyset_class = KeysetPagination
+
+    def get_paginator(self, request):
+        """Return the paginator selected by the request's query parameters."""
+        params = request.query_params
+        if params.get(self.mode_query_param) == "cursor" or params.get(self.keyset_class.cursor_query_param):
+            return self.keyset_class()
+        return self.page_number_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate ``queryset`` with the mode the request selected."""
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async ``paginate_queryset``."""
+        self.paginator = self.get_paginator(request)
+        return await self.paginator.apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Wrap ``data`` the way the selected mode does."""
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the default page-number response for the OpenAPI schema."""
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        """Describe the query parameters of both modes."""
+        parameters = [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` for keyset pagination instead of page numbers.",
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+        ]
+        parameters += self.page_number_class().get_schema_operation_parameters(view)
+        parameters += self.keyset_class().get_schema_operation_parameters(view)[:1]
+        return parameters
@@ -0,0 +1,20 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from cropscience.db.routers import read_from_replica
+
+
+class ReplicaReadMixin:
+    """Serve the read-only actions in ``replica_actions`` from a read replica.
+
+    Once authentication and permission checks pass, the rest of the
+    request reads from a replica within ``DB_REPLICA_MAX_LAG`` of the
+    primary, or from the primary when none qualifies. Writes always go to
+    the primary, and so does every read after one.
+    """
+
+    replica_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and self.action in self.replica_actions:
+            read_from_replica()
@@ -0,0 +1,81 @@
+import re
+
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .exports import STREAM_BLOCK_SIZE
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """Return the inclusive ``(start, end)`` byte range requested by ``header``.
+
+    Only a single range is supported. Returns ``None`` when the header should
+    be ignored and the whole file served, and raises ``ValueError`` when the
+    range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size:
+        raise ValueError("Range not satisfiable.")
+    return start, end
+
+
+def _iter_file(path, offset, length, block_size=STREAM_BLOCK_SIZE):
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        while length > 0:
+            block = handle.read(min(block_size, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def ranged_file_response(request, path, content_type, filename, etag):
+    """Stream the file at ``path``, honouring ``Range`` and ``If-Range`` headers.
+
+    A partial ``206`` response lets an interrupted download resume where it
+    stopped. ``etag`` identifies the file's content, so a client resuming
+    against a different file gets the whole file back instead.
+    """
+    size = path.stat().st_size
+    start, end = 0, size - 1
+    status = 200
+
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (if_range is None or if_range == etag):
+        try:
+            requested = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        if requested is not None:
+            start, end = requested
+            status = 206
+
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        _iter_file(path, start, length),
+        status=status,
+        content_type=content_type,
+    )
+    response["Content-Length"] = str(max(length, 0))
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if status == 206:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
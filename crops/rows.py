@@ -0,0 +1,151 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from cropscience.metrics import timed_serialization
+
+# Fields whose ``to_representation`` returns database values unchanged.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ChoiceField,
+    serializers.ReadOnlyField,
+)
+
+# Fields that need a model instance or a related object to render.
+UNSUPPORTED_FIELDS = (
+    serializers.BaseSerializer,
+    serializers.SerializerMethodField,
+    serializers.ManyRelatedField,
+    serializers.HiddenField,
+)
+
+
+def _iso_datetime(timezone):
+    """Return a formatter rendering aware datetimes like DRF's ISO 8601 output."""
+
+    def format_datetime(value):
+        value = value.astimezone(timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+def compile_field(field):
+    """Return ``(lookup, formatter)`` reproducing ``field`` from a ``values()`` row.
+
+    ``formatter`` is ``None`` when the database value is already what the
+    field would output. Raises ``ImproperlyConfigured`` for fields that need
+    model instances.
+    """
+    if isinstance(field, UNSUPPORTED_FIELDS) or field.source == "*":
+        raise ImproperlyConfigured(f"Field {field.field_name!r} cannot be rendered from values() rows.")
+    lookup = "__".join(field.source_attrs)
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # ``values("category")`` already yields the primary key.
+        if field.pk_field is not None:
+            return lookup, field.pk_field.to_representation
+        return lookup, None
+    if isinstance(field, serializers.RelatedField):
+        raise ImproperlyConfigured(f"Field {field.field_name!r} cannot be rendered from values() rows.")
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        if output_format is not None and output_format.lower() == ISO_8601 and timezone is not None:
+            return lookup, _iso_datetime(timezone)
+        return lookup, field.to_representation
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return lookup, None
+    return lookup, field.to_representation
+
+
+class RowSerializer:
+    """Render ``values()`` rows exactly as ``serializer`` renders instances.
+
+    The serializer's readable fields are compiled once into
+    ``(name, lookup, formatter)`` triples, so a page of rows is turned into
+    output dicts without building model instances or walking the field
+    machinery per row.
+    """
+
+    def __init__(self, serializer):
+        fields = serializer.fields.values()
+        self.fields = [
+            (field.field_name, *compile_field(field)) for field in fields if not field.write_only
+        ]
+        self.lookups = list(dict.fromkeys(lookup for _, lookup, _ in self.fields))
+
+    def prepare(self, queryset):
+        """Return ``queryset`` reduced to the columns this serializer reads.
+
+        The primary key and plain ordering fields are always selected so
+        paginators can build cursors from the rows, even when the
+        serializer does not output them.
+        """
+        opts = queryset.model._meta
+        extra = [opts.pk.attname]
+        for name in queryset.query.order_by:
+            if not isinstance(name, str):
+                continue
+            try:
+                extra.append(opts.get_field(name.lstrip("-")).attname)
+            except FieldDoesNotExist:
+                pass
+        return queryset.values(*dict.fromkeys(self.lookups + extra))
+
+    def serialize(self, rows):
+        """Return the output dict of each row in ``rows``."""
+        return timed_serialization(self._serialize, rows)
+
+    def _serialize(self, rows):
+        fields = self.fields
+        output = []
+        for row in rows:
+            item = {}
+            for name, lookup, formatter in fields:
+                value = row[lookup]
+                item[name] = value if formatter is None or value is None else formatter(value)
+            output.append(item)
+        return output
+
+
+class RowListMixin:
+    """Serve ``list`` from ``values()`` rows through a :class:`RowSerializer`.
+
+    Read-only lists are the hot path; detail views and writes keep using
+    the regular serializers, whose output the rows reproduce byte for byte.
+    Paginators receive a ``values()`` queryset, so pages hold dicts. Lists
+    whose serializer needs model instances, such as one with nested
+    serializers, fall back to the regular instance-based list.
+    """
+
+    def get_row_serializer(self):
+        """Return the row serializer for the list's serializer."""
+        return RowSerializer(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        """List objects from ``values()`` rows."""
+        try:
+            rows = self.get_row_serializer()
+        except ImproperlyConfigured:
+            return super().list(request, *args, **kwargs)
+        queryset = rows.prepare(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.serialize(page))
+        return Response(rows.serialize(queryset))
+
+    async def alist(self, request, *args, **kwargs):
+        """Async ``list``."""
+        try:
+            rows = self.get_row_serializer()
+        except ImproperlyConfigured:
+            return await super().alist(request, *args, **kwargs)
+        queryset = rows.prepare(await self.afilter_queryset(self.get_queryset()))
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.serialize(page))
+        return Response(rows.serialize([row async for row in queryset]))
@@ -1,9 +1,12 @@
+from django.urls import reverse
 from rest_framework import serializers
 
-from .models import Crop, CropCategory
+from cropscience.metrics import TimedSerializerMixin
 
+from .models import Crop, CropCategory, ExportJob
 
-class CropCategorySerializer(serializers.ModelSerializer):
+
+class CropCategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for CropCategory model — used for both list and detail views."""
 
     class Meta:
@@ -12,7 +15,35 @@ class CropCategorySerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
-class CropListSerializer(serializers.ModelSerializer):
+class CropPreviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """A few identifying fields of a crop, shown inside its category."""
+
+    class Meta:
+        model = Crop
+        fields = ["id", "name", "scientific_name", "water_requirements", "growth_duration_days"]
+        read_only_fields = fields
+
+
+class CropCategoryOverviewSerializer(CropCategorySerializer):
+    """Category with its crop count and a preview of its first crops.
+
+    ``crop_count`` and ``preview_crops`` are loaded by the view, as an
+    annotation and a prefetch.
+    """
+
+    crop_count = serializers.IntegerField(read_only=True, help_text="Number of crops in the category.")
+    crops = CropPreviewSerializer(
+        many=True,
+        read_only=True,
+        source="preview_crops",
+        help_text="First crops of the category by name.",
+    )
+
+    class Meta(CropCategorySerializer.Meta):
+        fields = CropCategorySerializer.Meta.fields + ["crop_count", "crops"]
+
+
+class CropListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Compact serializer for listing crops (category as ID)."""
 
     class Meta:
@@ -29,7 +60,7 @@ class CropListSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
-class CropDetailSerializer(serializers.ModelSerializer):
+class CropDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Detailed serializer for a single crop — includes nested category data."""
 
     category = CropCategorySerializer(read_only=True)
@@ -55,3 +86,111 @@ class CropDetailSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+
+
+class CategorySyncSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Full category representation sent by the change feed."""
+
+    class Meta:
+        model = CropCategory
+        fields = ["id", "name", "description", "created_at", "updated_at"]
+        read_only_fields = fields
+
+
+class CropSyncSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Full crop representation sent by the change feed (category as ID)."""
+
+    class Meta:
+        model = Crop
+        fields = [
+            "id",
+            "name",
+            "scientific_name",
+            "category",
+            "description",
+            "water_requirements",
+            "growth_duration_days",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class ExportJobSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Read-only representation of a background export job."""
+
+    progress = serializers.SerializerMethodField(help_text="Fraction of rows written, from 0 to 1.")
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id",
+            "status",
+            "params",
+            "rows_written",
+            "rows_total",
+            "progress",
+            "file_size",
+            "error",
+            "download_url",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj) -> float | None:
+        """Return the fraction of rows written so far."""
+        if obj.status == ExportJob.Status.SUCCEEDED:
+            return 1.0
+        if not obj.rows_total:
+            return None
+        return min(obj.rows_written / obj.rows_total, 1.0)
+
+    def get_download_url(self, obj) -> str | None:
+        """Return the download URL once the export file is ready."""
+        if obj.status != ExportJob.Status.SUCCEEDED:
+            return None
+        url = reverse("export-job-download", args=[obj.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class PreloadedCategoryField(serializers.PrimaryKeyRelatedField):
+    """Category ID field resolved from ``context["categories"]``.
+
+    Bulk writes load every referenced category in one query up front, so
+    validating an item must not query the database again.
+    """
+
+    def to_internal_value(self, data):
+        """Return the preloaded category with primary key ``data``."""
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        category = self.context["categories"].get(pk)
+        if category is None:
+            self.fail("does_not_exist", pk_value=data)
+        return category
+
+
+class CropBulkSerializer(CropDetailSerializer):
+    """Crop serializer for bulk writes; validates items without database queries.
+
+    The natural-key uniqueness check is left to the bulk writer, which
+    checks the whole batch in one query.
+    """
+
+    category_id = PreloadedCategoryField(
+        queryset=CropCategory.objects.none(),
+        source="category",
+        write_only=True,
+        help_text="ID of the category this crop belongs to.",
+    )
+
+    class Meta(CropDetailSerializer.Meta):
+        validators = []
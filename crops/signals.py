@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent after bulk_create / bulk_update, which bypass post_save.
+# Arguments: ``instances`` (the saved objects) and ``created`` (bool, or ``None``
+# for upserts that may have done either).
+post_bulk_save = Signal()
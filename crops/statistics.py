@@ -0,0 +1,90 @@
+from django.db import connection, transaction
+
+from .models import Crop, CropStatistic
+
+REBUILD_SQL = """
+INSERT INTO crops_cropstatistic (
+    category_id, water_requirements, crop_count, duration_total, duration_min, duration_max
+)
+SELECT category_id, water_requirements, count(*), sum(growth_duration_days),
+       min(growth_duration_days), max(growth_duration_days)
+FROM crops_crop
+GROUP BY category_id, water_requirements
+"""
+
+
+def rebuild_statistics():
+    """Recompute ``CropStatistic`` from the crops table; return the number of groups.
+
+    Crop writes are blocked while the table is rebuilt, so no delta applied
+    by the triggers can be lost in between; reads carry on.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {Crop._meta.db_table} IN SHARE MODE")
+        CropStatistic.objects.all().delete()
+        cursor.execute(REBUILD_SQL)
+        return cursor.rowcount
+
+
+def _durations(count, total, low, high):
+    """Return the growth duration summary of ``count`` crops."""
+    return {
+        "avg": round(total / count, 2) if count else None,
+        "min": low,
+        "max": high,
+    }
+
+
+def crop_statistics(category=None, water_requirements=None):
+    """Return crop counts and growth durations overall, per water requirement and per category.
+
+    Reads only the summary table, one row per category and water
+    requirement, so the cost does not depend on the number of crops.
+    """
+    groups = CropStatistic.objects.order_by("category__name", "water_requirements")
+    if category is not None:
+        groups = groups.filter(category=category)
+    if water_requirements:
+        groups = groups.filter(water_requirements=water_requirements)
+    rows = groups.values_list(
+        "category_id",
+        "category__name",
+        "water_requirements",
+        "crop_count",
+        "duration_total",
+        "duration_min",
+        "duration_max",
+    )
+
+    water_levels = list(Crop.WaterRequirement.values)
+    totals = [0, 0, None, None]
+    water = dict.fromkeys(water_levels, 0)
+    categories = {}
+    for category_id, name, level, count, total, low, high in rows:
+        entry = categories.setdefault(
+            category_id,
+            {"id": category_id, "name": name, "water": dict.fromkeys(water_levels, 0), "totals": [0, 0, None, None]},
+        )
+        entry["water"][level] += count
+        water[level] += count
+        for bucket in (entry["totals"], totals):
+            bucket[0] += count
+            bucket[1] += total
+            bucket[2] = low if bucket[2] is None else min(bucket[2], low)
+            bucket[3] = high if bucket[3] is None else max(bucket[3], high)
+
+    return {
+        "crop_count": totals[0],
+        "water_requirements": water,
+        "growth_duration_days": _durations(*totals),
+        "categories": [
+            {
+                "id": entry["id"],
+                "name": entry["name"],
+                "crop_count": entry["totals"][0],
+                "water_requirements": entry["water"],
+                "growth_duration_days": _durations(*entry["totals"]),
+            }
+            for entry in categories.values()
+        ],
+    }
@@ -0,0 +1,206 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Crop, CropCategory, Tombstone, TombstonePurge
+from .rows import RowSerializer
+from .serializers import CategorySyncSerializer, CropSyncSerializer
+
+# Changes returned per stream and page unless ``?limit=`` asks otherwise.
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 5000
+
+# Tombstones deleted per statement by ``purge_tombstones``.
+TOMBSTONE_PURGE_BATCH_SIZE = 5000
+
+# Response key -> (model, serializer), in the order clients apply them:
+# categories before the crops that reference them, deletions last.
+SYNC_STREAMS = {
+    "categories": (CropCategory, CategorySyncSerializer),
+    "crops": (Crop, CropSyncSerializer),
+    "deleted": (Tombstone, None),
+}
+
+# Stream -> the stream its rows reference. A page holds the stream back while
+# the one it references has more to send, so a row never arrives before the
+# rows it points at.
+STREAM_DEPENDENCIES = {"crops": "categories"}
+
+# Type reported for each tombstone label.
+DELETED_TYPES = {
+    CropCategory._meta.label_lower: "category",
+    Crop._meta.label_lower: "crop",
+}
+
+# Oldest transaction still running; every transaction before it has committed or rolled back.
+HORIZON_SQL = "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+# Deletes one batch of expired tombstones and records how far the purge reached.
+PURGE_SQL = """
+WITH purged AS (
+    DELETE FROM crops_tombstone
+    WHERE id IN (
+        SELECT id FROM crops_tombstone WHERE deleted_at < %s ORDER BY deleted_at, id LIMIT %s
+    )
+    RETURNING sync_xid
+)
+INSERT INTO crops_tombstonepurge (purged_at, through_xid, tombstones)
+SELECT now(), max(sync_xid), count(*) FROM purged HAVING count(*) > 0
+RETURNING tombstones
+"""
+
+
+class SyncTokenExpired(Exception):
+    """The token predates deletions that have since been purged; the client must start over."""
+
+
+def encode_token(positions):
+    """Return the opaque sync token for ``{stream: (xid, id)}``."""
+    token = {stream: list(position) for stream, position in positions.items()}
+    return urlsafe_b64encode(json.dumps(token, separators=(",", ":")).encode()).decode("ascii")
+
+
+def decode_token(token):
+    """Return the ``{stream: (xid, id)}`` positions encoded in ``token``.
+
+    An empty token starts from the beginning. Raises ``ValueError`` for
+    tokens this module did not issue, and ``SyncTokenExpired`` for tokens
+    of the earlier timestamp-ordered feed.
+    """
+    if not token:
+        return {}
+    try:
+        data = json.loads(urlsafe_b64decode(token.encode("ascii")))
+        if any(isinstance(xid, str) for xid, _ in data.values()):
+            raise SyncTokenExpired("This sync token is no longer supported; sync again without a token.")
+        positions = {stream: (int(xid), int(pk)) for stream, (xid, pk) in data.items()}
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError("Invalid sync token.")
+    if set(positions) != set(SYNC_STREAMS):
+        raise ValueError("Invalid sync token.")
+    return positions
+
+
+def committed_horizon():
+    """Return the ID of the oldest transaction still running.
+
+    Transaction IDs are assigned when a transaction first writes, not when
+    it commits, so a row can appear behind rows already served. Below the
+    horizon every transaction has finished, so no row can appear there any
+    more: the feed serves only rows written below it.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(HORIZON_SQL)
+        return cursor.fetchone()[0]
+
+
+def check_retention(positions):
+    """Raise ``SyncTokenExpired`` if tombstones the token has not seen were purged."""
+    purged = TombstonePurge.objects.aggregate(through=Max("through_xid"))["through"]
+    if purged is not None and positions["deleted"][0] <= purged:
+        raise SyncTokenExpired(
+            f"Deletions older than {settings.SYNC_TOMBSTONE_RETENTION_DAYS} days were purged "
+            "after this token was issued; sync again without a token."
+        )
+
+
+def _stream_page(model, position, horizon):
+    """Return the rows of ``model`` written after ``position`` by transactions before ``horizon``.
+
+    Rows come in ``(sync_xid, id)`` order, read straight from the
+    ``(sync_xid, id)`` index.
+    """
+    queryset = model.objects.filter(sync_xid__lt=horizon)
+    if position is not None:
+        xid, pk = position
+        # ``sync_xid >= xid AND NOT (sync_xid = xid AND id <= pk)`` keeps an index range to seek to.
+        queryset = queryset.filter(sync_xid__gte=xid).exclude(sync_xid=xid, pk__lte=pk)
+    return queryset.order_by("sync_xid", "pk")
+
+
+def _render_tombstones(rows):
+    """Return the ``{"type", "id"}`` of each deleted row in ``rows``."""
+    return [{"type": DELETED_TYPES.get(row["label"], row["label"]), "id": row["object_id"]} for row in rows]
+
+
+def changes_since(token, limit=SYNC_PAGE_SIZE):
+    """Return the page of the change feed following ``token``.
+
+    Each stream (categories, crops, deletions) continues from its own
+    ``(sync_xid, id)`` position, so a page costs as much as the changes it
+    returns, however large the catalog. Rows are served once the
+    transaction that wrote them and every earlier one have finished (see
+    :func:`committed_horizon`), so a long-running write delays the feed but
+    never slips behind a token. A stream with nothing left moves to the
+    horizon. Crops wait while categories have more to send (see
+    ``STREAM_DEPENDENCIES``), so the client holds every category a crop
+    references. ``has_more`` is true while any stream has further changes.
+    Raises ``SyncTokenExpired`` when :func:`check_retention` fails.
+    """
+    positions = decode_token(token)
+    if positions:
+        check_retention(positions)
+    horizon = committed_horizon()
+    if not positions:
+        # A full load holds no deleted rows; only deletions still in flight concern it.
+        positions["deleted"] = (horizon, 0)
+    body = {}
+    has_more = False
+    behind = set()
+
+    for stream, (model, serializer_class) in SYNC_STREAMS.items():
+        position = positions.get(stream)
+        if position is not None and position[0] >= horizon:
+            # Caught up: nothing below the horizon is left to read.
+            body[stream] = []
+            continue
+        if STREAM_DEPENDENCIES.get(stream) in behind:
+            # Held back until the stream it references catches up.
+            positions.setdefault(stream, (0, 0))
+            body[stream] = []
+            continue
+        queryset = _stream_page(model, position, horizon)
+        if serializer_class is None:
+            rows, render = queryset.values("id", "label", "object_id", "sync_xid"), _render_tombstones
+        else:
+            serializer = RowSerializer(serializer_class())
+            rows, render = serializer.prepare(queryset), serializer.serialize
+
+        rows = list(rows[: limit + 1])
+        if len(rows) > limit:
+            has_more = True
+            behind.add(stream)
+            rows = rows[:limit]
+            positions[stream] = (rows[-1]["sync_xid"], rows[-1]["id"])
+        else:
+            positions[stream] = max(positions.get(stream, (0, 0)), (horizon, 0))
+        body[stream] = render(rows)
+
+    body["token"] = encode_token(positions)
+    body["has_more"] = has_more
+    return body
+
+
+def purge_tombstones(batch_size=None, now=None):
+    """Delete tombstones older than ``SYNC_TOMBSTONE_RETENTION_DAYS``; return how many.
+
+    Rows go in batches of ``batch_size`` (default
+    ``TOMBSTONE_PURGE_BATCH_SIZE``), each committed on its own together with
+    the :class:`TombstonePurge` that makes older tokens resync.
+    """
+    batch_size = batch_size or TOMBSTONE_PURGE_BATCH_SIZE
+    cutoff = (now or timezone.now()) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    purged = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(PURGE_SQL, [cutoff, batch_size])
+            row = cursor.fetchone()
+        deleted = row[0] if row else 0
+        purged += deleted
+        if deleted < batch_size:
+            return purged
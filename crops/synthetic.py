@@ -0,0 +1,254 @@
+import random
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+from django.db import connection, transaction
+
+from .models import CropCategory
+
+# Crops inserted per transaction; each batch is one INSERT ... SELECT.
+GENERATE_BATCH_SIZE = 50_000
+
+# Memory each index rebuild may sort in after a load with deferred indexes.
+REBUILD_MAINTENANCE_WORK_MEM = "512MB"
+
+# What seeded runs date ``created_at`` back from, so their crops match exactly.
+SEED_REFERENCE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Default share of crops per water requirement.
+WATER_SHARES = {"low": 0.3, "medium": 0.45, "high": 0.25}
+
+CATEGORY_NAMES = [
+    ("Cereals", "Grasses grown for their edible grain."),
+    ("Legumes", "Pulses and beans that fix nitrogen."),
+    ("Oilseeds", "Crops pressed for edible and industrial oils."),
+    ("Root Vegetables", "Crops grown for their swollen roots."),
+    ("Tubers", "Starchy underground stems."),
+    ("Leafy Greens", "Vegetables harvested for their leaves."),
+    ("Fruit Vegetables", "Vegetables harvested for their fruit."),
+    ("Gourds", "Trailing cucurbits."),
+    ("Tree Fruits", "Orchard fruit crops."),
+    ("Berries", "Small soft fruit."),
+    ("Nuts", "Tree and ground nuts."),
+    ("Beverage Crops", "Crops brewed or infused into drinks."),
+    ("Sugar Crops", "Crops grown for sugar extraction."),
+    ("Fibre Crops", "Crops grown for textile fibre."),
+    ("Forage", "Crops grown to feed livestock."),
+    ("Spices", "Aromatic seeds, barks and roots."),
+    ("Herbs", "Culinary and medicinal leafy herbs."),
+]
+
+# (common name, scientific name) the synthetic crops are varieties of.
+PLANTS = [
+    ("Wheat", "Triticum aestivum"),
+    ("Durum Wheat", "Triticum durum"),
+    ("Rice", "Oryza sativa"),
+    ("Maize", "Zea mays"),
+    ("Barley", "Hordeum vulgare"),
+    ("Sorghum", "Sorghum bicolor"),
+    ("Pearl Millet", "Pennisetum glaucum"),
+    ("Oats", "Avena sativa"),
+    ("Rye", "Secale cereale"),
+    ("Soybean", "Glycine max"),
+    ("Chickpea", "Cicer arietinum"),
+    ("Lentil", "Lens culinaris"),
+    ("Pea", "Pisum sativum"),
+    ("Common Bean", "Phaseolus vulgaris"),
+    ("Peanut", "Arachis hypogaea"),
+    ("Sunflower", "Helianthus annuus"),
+    ("Rapeseed", "Brassica napus"),
+    ("Sesame", "Sesamum indicum"),
+    ("Potato", "Solanum tuberosum"),
+    ("Cassava", "Manihot esculenta"),
+    ("Sweet Potato", "Ipomoea batatas"),
+    ("Yam", "Dioscorea alata"),
+    ("Carrot", "Daucus carota"),
+    ("Onion", "Allium cepa"),
+    ("Cabbage", "Brassica oleracea"),
+    ("Lettuce", "Lactuca sativa"),
+    ("Spinach", "Spinacia oleracea"),
+    ("Tomato", "Solanum lycopersicum"),
+    ("Pepper", "Capsicum annuum"),
+    ("Cucumber", "Cucumis sativus"),
+    ("Pumpkin", "Cucurbita maxima"),
+    ("Apple", "Malus domestica"),
+    ("Mango", "Mangifera indica"),
+    ("Banana", "Musa acuminata"),
+    ("Grape", "Vitis vinifera"),
+    ("Strawberry", "Fragaria ananassa"),
+    ("Almond", "Prunus dulcis"),
+    ("Coffee", "Coffea arabica"),
+    ("Tea", "Camellia sinensis"),
+    ("Cocoa", "Theobroma cacao"),
+    ("Sugarcane", "Saccharum officinarum"),
+    ("Cotton", "Gossypium hirsutum"),
+    ("Alfalfa", "Medicago sativa"),
+    ("Ginger", "Zingiber officinale"),
+    ("Basil", "Ocimum basilicum"),
+]
+
+VARIETY_WORDS = [
+    "Golden", "Red", "Early", "Late", "Dwarf", "Giant", "Wild", "Hardy",
+    "Sweet", "Black", "White", "Northern", "Coastal", "Highland", "Desert",
+    "Royal", "Silver", "Spring", "Winter", "Prairie",
+]
+
+# Draws each crop's random values once, in the subquery, so the columns built
+# from them (name and description, say) agree with each other. ``updated_at``
+# is the insert time, so sync feeds report the new crops to existing clients.
+GENERATE_SQL = """
+INSERT INTO crops_crop (
+    name, scientific_name, category_id, description,
+    growth_duration_days, water_requirements, created_at, updated_at
+)
+SELECT
+    variety || ' ' || (%(plants)s::text[])[plant] || ' ' || n,
+    (%(species)s::text[])[plant] || ' var. ' || lower(variety) || '-' || n,
+    category_id,
+    'Synthetic ' || lower(variety) || ' ' || lower((%(plants)s::text[])[plant])
+        || ', harvested ' || duration || ' days after planting.',
+    duration,
+    CASE WHEN water < %(low)s THEN 'low' WHEN water < %(low_medium)s THEN 'medium' ELSE 'high' END,
+    created_at,
+    now()
+FROM (
+    SELECT
+        n,
+        (%(varieties)s::text[])[1 + floor(random() * %(variety_count)s)::int] AS variety,
+        1 + floor(random() * %(plant_count)s)::int AS plant,
+        (%(categories)s::bigint[])[1 + floor(%(category_count)s * power(random(), %(skew)s))::int] AS category_id,
+        -- Normally distributed through the Box-Muller transform, then clamped.
+        greatest(%(duration_min)s, least(%(duration_max)s, round(
+            %(duration_mean)s + %(duration_stddev)s * sqrt(-2 * ln(1 - random())) * cos(2 * pi() * random())
+        )))::int AS duration,
+        random() AS water,
+        coalesce(%(reference)s, now()) - random() * %(age_days)s * interval '1 day' AS created_at
+    FROM generate_series(%(start)s, %(stop)s) AS n
+) AS draws
+"""
+
+
+@contextmanager
+def deferred_indexes():
+    """Drop the crop table's secondary indexes for the block and rebuild them after.
+
+    Keeping 17 B-tree, trigram and full-text indexes current row by row
+    dominates the cost of a large load; building them once at the end is
+    about twice as fast. Indexes behind constraints stay in place. Reads
+    relying on the dropped indexes are slow until the rebuild finishes, so
+    use it on benchmark databases only.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'crops_crop'::regclass
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = i.indexrelid)
+            """
+        )
+        indexes = cursor.fetchall()
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+    try:
+        yield
+    finally:
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Deferred foreign key checks would block the rebuild inside a transaction.
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute("SELECT set_config('maintenance_work_mem', %s, true)", [REBUILD_MAINTENANCE_WORK_MEM])
+            for _, definition in indexes:
+                cursor.execute(definition)
+
+
+def generate_categories(count):
+    """Return ``count`` categories, creating the ones that do not exist yet.
+
+    Names come from ``CATEGORY_NAMES``, numbered once the list runs out, so
+    repeated runs reuse the same categories.
+    """
+    categories = []
+    for i in range(count):
+        name, description = CATEGORY_NAMES[i % len(CATEGORY_NAMES)]
+        if i >= len(CATEGORY_NAMES):
+            name = f"{name} {i // len(CATEGORY_NAMES) + 1}"
+        category, _ = CropCategory.objects.get_or_create(name=name, defaults={"description": description})
+        categories.append(category)
+    return categories
+
+
+def generate_crops(
+    count,
+    categories,
+    water_shares=None,
+    duration_mean=120,
+    duration_stddev=45,
+    duration_range=(20, 365),
+    category_skew=1.0,
+    age_days=3 * 365,
+    batch_size=GENERATE_BATCH_SIZE,
+    seed=None,
+    reference_time=None,
+    defer_indexes=False,
+    progress=None,
+):
+    """Insert ``count`` synthetic crops spread over ``categories``; return how many.
+
+    Rows are generated by Postgres, ``batch_size`` per transaction, so
+    memory stays flat at any scale and an interrupted run keeps the batches
+    already committed. ``water_shares`` maps each water requirement to its
+    share of the crops. Growth durations are normally distributed around
+    ``duration_mean`` and clamped to ``duration_range``. A ``category_skew``
+    above 1 crowds crops into the first categories, as real catalogues are
+    uneven. ``created_at`` spreads over the ``age_days`` days before
+    ``reference_time``, which defaults to now, or to ``SEED_REFERENCE_TIME``
+    with a ``seed``; the same seed then produces the same crops.
+    ``updated_at`` is always the insert time. ``defer_indexes`` loads under
+    ``deferred_indexes()``. ``progress`` is called with the running total
+    after each batch.
+    """
+    if reference_time is None and seed is not None:
+        reference_time = SEED_REFERENCE_TIME
+    shares = water_shares or WATER_SHARES
+    total = sum(shares.values())
+    low = shares.get("low", 0) / total
+    params = {
+        "plants": [plant for plant, _ in PLANTS],
+        "species": [species for _, species in PLANTS],
+        "plant_count": len(PLANTS),
+        "varieties": VARIETY_WORDS,
+        "variety_count": len(VARIETY_WORDS),
+        "categories": [category.id for category in categories],
+        "category_count": len(categories),
+        "skew": category_skew,
+        "low": low,
+        "low_medium": low + shares.get("medium", 0) / total,
+        "duration_mean": duration_mean,
+        "duration_stddev": duration_stddev,
+        "duration_min": duration_range[0],
+        "duration_max": duration_range[1],
+        "age_days": age_days,
+        "reference": reference_time,
+    }
+    seeds = random.Random(seed)
+    with connection.cursor() as cursor:
+        # Numbering after the highest id keeps names unique across runs.
+        cursor.execute("SELECT coalesce(max(id), 0) FROM crops_crop")
+        first = cursor.fetchone()[0] + 1
+
+    done = 0
+    with deferred_indexes() if defer_indexes else nullcontext():
+        while done < count:
+            size = min(batch_size, count - done)
+            with transaction.atomic(), connection.cursor() as cursor:
+                if seed is not None:
+                    cursor.execute("SELECT setseed(%s)", [seeds.uniform(-1, 1)])
+                cursor.execute(GENERATE_SQL, {**params, "start": first + done, "stop": first + done + size - 1})
+            done += size
+            if progress is not None:
+                progress(done)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE crops_crop")
+    return done
@@ -1,12 +1,15 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import CropCategoryViewSet, CropViewSet
+from .views import CropCategoryViewSet, CropViewSet, ExportJobViewSet, SyncView
 
 router = DefaultRouter()
 router.register(r"categories", CropCategoryViewSet, basename="category")
+# Registered before "crops" so its prefix is not captured as a crop ID.
+router.register(r"crops/export-jobs", ExportJobViewSet, basename="export-job")
 router.register(r"crops", CropViewSet, basename="crop")
 
 urlpatterns = [
+    path("sync/", SyncView.as_view(), name="sync"),
     path("", include(router.urls)),
 ]
@@ -1,59 +1,216 @@
 from datetime import datetime
-from io import BytesIO
 
-from django.http import HttpResponse
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from openpyxl import Workbook
-from rest_framework import viewsets
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from .filters import CropFilter
-from .models import Crop, CropCategory
-from .serializers import CropCategorySerializer, CropDetailSerializer, CropListSerializer
+from .asyncviews import AsyncReadMixin
+from .bulk import BULK_MAX_ITEMS, BULK_MODES, bulk_create_crops, bulk_delete_crops, bulk_update_crops
+from .conditional import ConditionalGetMixin
+from .exports import (
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    aiter_crop_rows,
+    aiter_export,
+    iter_crop_rows,
+    iter_export,
+    parse_columns,
+)
+from .fieldsets import FIELDSET_PARAMETERS, SparseFieldsetMixin
+from .filters import CropFilter, CropFuzzyFilter, CropSearchFilter
+from .imports import IMPORT_FORMATS, detect_format, import_crops, read_rows
+from .jobs import create_export_job, export_fingerprint, export_view, find_export_job, normalize_export_params
+from .models import Crop, CropCategory, CropStatistic, ExportJob
+from .negotiation import ExportContentNegotiation
+from .pagination import CropPagination, OwnedPagination
+from .replicas import ReplicaReadMixin
+from .responses import ranged_file_response
+from .rows import RowListMixin
+from .serializers import (
+    CropBulkSerializer,
+    CropCategoryOverviewSerializer,
+    CropCategorySerializer,
+    CropDetailSerializer,
+    CropListSerializer,
+    CropPreviewSerializer,
+    ExportJobSerializer,
+)
+from .statistics import crop_statistics
+from .sync import SYNC_MAX_PAGE_SIZE, SYNC_PAGE_SIZE, SyncTokenExpired, changes_since
+
+# Most crops ``?preview=`` may include per category.
+CATEGORY_PREVIEW_MAX = 10
+
+CATEGORY_OVERVIEW_PARAMETERS = [
+    OpenApiParameter("with_counts", bool, description="Include each category's `crop_count`."),
+    OpenApiParameter(
+        "preview",
+        int,
+        description=f"Include each category's first N `crops` by name (0 to {CATEGORY_PREVIEW_MAX}).",
+    ),
+]
 
 
 @extend_schema_view(
-    list=extend_schema(description="List all crop categories."),
+    list=extend_schema(
+        description="List all crop categories.",
+        parameters=FIELDSET_PARAMETERS + CATEGORY_OVERVIEW_PARAMETERS,
+        responses=CropCategoryOverviewSerializer(many=True),
+    ),
     create=extend_schema(description="Create a new crop category."),
-    retrieve=extend_schema(description="Retrieve a crop category by ID."),
+    retrieve=extend_schema(
+        description="Retrieve a crop category by ID.",
+        parameters=FIELDSET_PARAMETERS + CATEGORY_OVERVIEW_PARAMETERS,
+        responses=CropCategoryOverviewSerializer,
+    ),
     update=extend_schema(description="Update a crop category."),
     partial_update=extend_schema(description="Partially update a crop category."),
     destroy=extend_schema(description="Delete a crop category."),
 )
-class CropCategoryViewSet(viewsets.ModelViewSet):
+class CropCategoryViewSet(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    RowListMixin,
+    ReplicaReadMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
     """ViewSet for managing crop categories.
 
-    Provides list, create, retrieve, update, and delete operations.
+    Provides list, create, retrieve, update, and delete operations. List
+    and detail responses carry ETag / Last-Modified validators, can be
+    trimmed with ``?fields=`` / ``?omit=``, and lists are serialized from
+    ``values()`` rows. ``?with_counts=true`` adds each category's crop
+    count from the statistics table and ``?preview=N`` its first N crops,
+    prefetched in one window-function query, so a page costs the same
+    number of queries however many categories it holds. Reads are served
+    asynchronously (see ``AsyncReadMixin``) from a read replica when one is
+    configured (see ``ReplicaReadMixin``).
     """
 
     queryset = CropCategory.objects.all()
     serializer_class = CropCategorySerializer
+    overview_actions = ("list", "retrieve")
+
+    @property
+    def version_models(self):
+        """Counts and previews also change with the crops."""
+        with_counts, preview = self.get_overview_options()
+        return [CropCategory, Crop] if with_counts or preview else [CropCategory]
+
+    def get_overview_options(self):
+        """Return the validated ``(with_counts, preview)`` options of the request."""
+        if self.action not in self.overview_actions:
+            return False, 0
+        params = self.request.query_params
+        with_counts = params.get("with_counts", "").lower() in ("1", "true", "yes")
+        try:
+            preview = int(params.get("preview") or 0)
+        except ValueError:
+            preview = -1
+        if not 0 <= preview <= CATEGORY_PREVIEW_MAX:
+            raise ValidationError({"preview": f"Must be between 0 and {CATEGORY_PREVIEW_MAX}."})
+        return with_counts, preview
+
+    def get_queryset(self):
+        """Annotate crop counts and prefetch preview crops when requested."""
+        queryset = super().get_queryset()
+        with_counts, preview = self.get_overview_options()
+        if with_counts:
+            counts = (
+                CropStatistic.objects.filter(category=OuterRef("pk"))
+                .values("category")
+                .annotate(total=Sum("crop_count"))
+                .values("total")
+            )
+            queryset = queryset.annotate(crop_count=Coalesce(Subquery(counts), 0))
+        if preview:
+            crops = Crop.objects.only(*CropPreviewSerializer.Meta.fields, "category").order_by("name", "id")
+            # A sliced prefetch is limited per category with ROW_NUMBER() in one query.
+            queryset = queryset.prefetch_related(
+                Prefetch("crops", queryset=crops[:preview], to_attr="preview_crops")
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        """Use the overview serializer when counts or previews are requested."""
+        if any(self.get_overview_options()):
+            return CropCategoryOverviewSerializer
+        return CropCategorySerializer
+
+    def get_serializer(self, *args, **kwargs):
+        """Drop whichever of ``crop_count`` and ``crops`` was not requested."""
+        serializer = super().get_serializer(*args, **kwargs)
+        with_counts, preview = self.get_overview_options()
+        fields = getattr(serializer, "child", serializer).fields
+        if not with_counts:
+            fields.pop("crop_count", None)
+        if not preview:
+            fields.pop("crops", None)
+        return serializer
 
 
 @extend_schema_view(
-    list=extend_schema(description="List all crops with filtering, search, and pagination."),
+    list=extend_schema(
+        description="List all crops with filtering, search, and pagination.",
+        parameters=FIELDSET_PARAMETERS,
+    ),
     create=extend_schema(description="Create a new crop."),
-    retrieve=extend_schema(description="Retrieve a crop by ID with nested category data."),
+    retrieve=extend_schema(
+        description="Retrieve a crop by ID with nested category data.",
+        parameters=FIELDSET_PARAMETERS,
+    ),
     update=extend_schema(description="Update a crop."),
     partial_update=extend_schema(description="Partially update a crop."),
     destroy=extend_schema(description="Delete a crop."),
 )
-class CropViewSet(viewsets.ModelViewSet):
+class CropViewSet(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    RowListMixin,
+    ReplicaReadMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
     """ViewSet for managing crops.
 
     Supports filtering by category and water_requirements, searching
     by name and scientific_name, and ordering by name, created_at,
-    and growth_duration_days.
+    and growth_duration_days. ``?search_mode=fulltext`` switches search to
+    ranked full-text search, and ``?fuzzy=`` matches names despite typos.
+    Lists are paginated by page number, or by keyset with
+    ``?pagination=cursor`` and serialized from ``values()`` rows rather
+    than model instances. List and detail responses carry ETag /
+    Last-Modified validators and can be trimmed with ``?fields=`` /
+    ``?omit=``, which also narrows the query and drops the category join
+    when no category data is requested. List, detail and export reads are
+    served asynchronously (see ``AsyncReadMixin``); they and the statistics
+    read from a replica when one is configured (see ``ReplicaReadMixin``).
     """
 
+    # ``SparseFieldsetMixin`` narrows this to the requested fields.
+    queryset = Crop.objects.select_related("category").defer("search_vector")
+    filter_backends = [DjangoFilterBackend, OrderingFilter, CropSearchFilter, CropFuzzyFilter]
     filterset_class = CropFilter
+    pagination_class = CropPagination
     search_fields = ["name", "scientific_name"]
     ordering_fields = ["name", "created_at", "growth_duration_days"]
     ordering = ["name"]
-
-    def get_queryset(self):
-        """Return crops with optimized category prefetch."""
-        return Crop.objects.select_related("category").all()
+    version_models = [Crop, CropCategory]
+    last_modified_field = "updated_at"
+    async_actions = ("list", "retrieve", "export_crops")
+    replica_actions = ("list", "retrieve", "export_crops", "statistics")
 
     def get_serializer_class(self):
         """Use compact serializer for list, detailed serializer otherwise."""
@@ -62,56 +219,303 @@ class CropViewSet(viewsets.ModelViewSet):
         return CropDetailSerializer
 
     @extend_schema(
-        description="Export all crops to an Excel (.xlsx) file.",
-        responses={(200, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"): bytes},
+        description=(
+            "Bulk create (POST), partially update (PATCH, items need `id`) or delete "
+            "(DELETE, body `{\"ids\": [...]}`) crops. `mode=atomic` (default) writes nothing "
+            "if any item is invalid; `mode=best_effort` writes the valid items. Errors are "
+            "reported per item index."
+        ),
+        parameters=[OpenApiParameter("mode", str, enum=list(BULK_MODES), description="Default: atomic.")],
+        request=CropBulkSerializer(many=True),
+        responses={200: OpenApiTypes.OBJECT, 201: OpenApiTypes.OBJECT, 207: OpenApiTypes.OBJECT},
     )
-    @action(detail=False, methods=["get"], url_path="export")
-    def export_crops(self, request):
-        """Export the full list of crops as an Excel spreadsheet."""
-        crops = Crop.objects.select_related("category").all()
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Crops"
-
-        # Header row
-        headers = [
-            "ID",
-            "Name",
-            "Scientific Name",
-            "Category",
-            "Description",
-            "Growth Duration (days)",
-            "Water Requirements",
-            "Created At",
-            "Updated At",
-        ]
-        ws.append(headers)
-
-        # Data rows
-        for crop in crops:
-            ws.append(
-                [
-                    crop.id,
-                    crop.name,
-                    crop.scientific_name,
-                    crop.category.name,
-                    crop.description,
-                    crop.growth_duration_days,
-                    crop.water_requirements,
-                    crop.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    crop.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-                ]
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        """Create, update or delete many crops in one transaction."""
+        mode = request.query_params.get("mode") or "atomic"
+        if mode not in BULK_MODES:
+            raise ValidationError({"mode": f"Choose from: {', '.join(BULK_MODES)}."})
+        atomic = mode == "atomic"
+
+        items = request.data
+        if request.method == "DELETE" and isinstance(items, dict):
+            items = items.get("ids")
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"detail": "Expected a non-empty list."})
+        if len(items) > BULK_MAX_ITEMS:
+            raise ValidationError({"detail": f"At most {BULK_MAX_ITEMS} items per request."})
+
+        if request.method == "DELETE":
+            deleted, errors = bulk_delete_crops(items, atomic=atomic)
+            body = {"deleted": deleted, "errors": errors}
+            success = status.HTTP_200_OK
+        else:
+            if request.method == "POST":
+                crops, errors = bulk_create_crops(items, atomic=atomic)
+                success = status.HTTP_201_CREATED
+            else:
+                crops, errors = bulk_update_crops(items, atomic=atomic)
+                success = status.HTTP_200_OK
+            body = {"results": CropDetailSerializer(crops, many=True).data, "errors": errors}
+
+        if errors:
+            failure = status.HTTP_400_BAD_REQUEST if atomic else status.HTTP_207_MULTI_STATUS
+            return Response(body, status=failure)
+        return Response(body, status=success)
+
+    @extend_schema(
+        description=(
+            "Import crops from an Excel or CSV file laid out like the export, upserting on "
+            "name, scientific name and category. `dry_run=true` only validates. "
+            "`mode=atomic` (default) writes nothing if any row is invalid; `mode=best_effort` "
+            "writes the valid rows. Errors are reported per spreadsheet row."
+        ),
+        parameters=[
+            OpenApiParameter("dry_run", bool, description="Validate without writing."),
+            OpenApiParameter("mode", str, enum=list(BULK_MODES), description="Default: atomic."),
+        ],
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+                "required": ["file"],
+            }
+        },
+        responses={200: OpenApiTypes.OBJECT, 207: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser])
+    def import_crops(self, request):
+        """Stream an uploaded spreadsheet into the crops table in batches."""
+        mode = request.query_params.get("mode") or "atomic"
+        if mode not in BULK_MODES:
+            raise ValidationError({"mode": f"Choose from: {', '.join(BULK_MODES)}."})
+        dry_run = request.query_params.get("dry_run", "").lower() in ("1", "true", "yes")
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": f"Upload a {' or '.join(IMPORT_FORMATS)} file."})
+
+        try:
+            rows = read_rows(upload.file, detect_format(upload.name))
+            report = import_crops(rows, dry_run=dry_run, atomic=mode == "atomic")
+        except ValueError as exc:
+            raise ValidationError({"file": str(exc)})
+
+        if report["error_count"] and not dry_run:
+            failure = status.HTTP_400_BAD_REQUEST if mode == "atomic" else status.HTTP_207_MULTI_STATUS
+            return Response(report, status=failure)
+        return Response(report, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        description=(
+            "Crop counts, water requirement distribution and growth duration average / min / max, "
+            "overall and per category, optionally scoped by `category` and `water_requirements`. "
+            "Served from an incrementally maintained summary table."
+        ),
+        parameters=[
+            OpenApiParameter("category", int, description="Only crops of this category."),
+            OpenApiParameter(
+                "water_requirements",
+                str,
+                enum=list(Crop.WaterRequirement.values),
+                description="Only crops with this water requirement.",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"], url_path="statistics")
+    def statistics(self, request):
+        """Return crop aggregates from the summary table."""
+        filterset = CropFilter(request.query_params, queryset=Crop.objects.none())
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        params = filterset.form.cleaned_data
+        return Response(crop_statistics(params.get("category"), params.get("water_requirements")))
+
+    def get_export_options(self, params):
+        """Return the ``(format, columns)`` pair requested in ``params``."""
+        export_format = params.get("format") or "xlsx"
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"format": f"Unsupported format. Choose from: {', '.join(EXPORT_FORMATS)}."}
             )
+        try:
+            columns = parse_columns(params.get("columns"))
+        except ValueError as exc:
+            raise ValidationError({"columns": str(exc)})
+        return export_format, columns
+
+    @extend_schema(
+        description=(
+            "Export crops matching the list filters, search and ordering as an Excel, "
+            "CSV or NDJSON file, streamed in constant memory."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "format",
+                str,
+                enum=list(EXPORT_FORMATS),
+                description="File format (default: xlsx).",
+            ),
+            OpenApiParameter(
+                "columns",
+                str,
+                description=f"Comma-separated columns to export (default: all): {', '.join(EXPORT_COLUMNS)}.",
+            ),
+        ],
+        responses={(200, content_type): bytes for content_type in EXPORT_FORMATS.values()},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        content_negotiation_class=ExportContentNegotiation,
+    )
+    def export_crops(self, request):
+        """Stream the filtered list of crops in the requested file format."""
+        export_format, columns = self.get_export_options(request.query_params)
+        crops = self.filter_queryset(self.get_queryset())
+        content = iter_export(iter_crop_rows(crops, columns), export_format, columns)
+        return self.export_response(content, export_format)
 
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
+    async def aexport_crops(self, request):
+        """Async ``export_crops``, reading the rows with the async ORM under ASGI."""
+        export_format, columns = self.get_export_options(request.query_params)
+        crops = await self.afilter_queryset(self.get_queryset())
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_export(aiter_crop_rows(crops, columns), export_format, columns)
+        else:
+            # WSGI servers would buffer an async iterator whole; keep streaming in sync.
+            content = iter_export(iter_crop_rows(crops, columns), export_format, columns)
+        return self.export_response(content, export_format)
 
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+    def export_response(self, content, export_format):
+        """Return a streaming attachment response serving ``content``."""
+        response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
         now = datetime.now().strftime("%Y-%m-%d_%H%M")
-        response["Content-Disposition"] = f'attachment; filename="crops_export_{now}.xlsx"'
+        response["Content-Disposition"] = f'attachment; filename="crops_export_{now}.{export_format}"'
         return response
+
+
+@extend_schema_view(
+    list=extend_schema(description="List background export jobs, newest first."),
+    retrieve=extend_schema(description="Retrieve an export job with its progress."),
+)
+class ExportJobViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
+    """ViewSet for background crop exports.
+
+    A job is built on a local worker pool and written to disk; once it has
+    succeeded its file can be downloaded, with ``Range`` support so an
+    interrupted download can resume. Users only see their own jobs.
+    """
+
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+    pagination_class = OwnedPagination
+    filter_backends = []
+
+    def get_queryset(self):
+        """Return the requesting user's jobs."""
+        return super().get_queryset().filter(owner=self.request.user)
+
+    @extend_schema(
+        description=(
+            "Enqueue a crop export. The body takes `format`, `columns` and the same filter, "
+            "`search` and `ordering` parameters as the crop list. An identical export of "
+            "unchanged data returns the existing job, or a finished one sharing a file "
+            "another user already built, instead of building a new file."
+        ),
+        request=OpenApiTypes.OBJECT,
+        responses={200: ExportJobSerializer, 202: ExportJobSerializer},
+    )
+    def create(self, request, *args, **kwargs):
+        """Validate the export parameters and enqueue a job, reusing an identical one."""
+        params = normalize_export_params(request.data)
+        view = export_view(params)
+        export_format, columns = view.get_export_options(params)
+        view.filter_queryset(view.get_queryset())
+        params.update(format=export_format, columns=",".join(columns))
+
+        fingerprint = export_fingerprint(params)
+        existing = find_export_job(fingerprint, request.user)
+        if existing:
+            return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
+
+        job, enqueued = create_export_job(params, fingerprint, request.user)
+        response_status = status.HTTP_202_ACCEPTED if enqueued else status.HTTP_200_OK
+        return Response(self.get_serializer(job).data, status=response_status)
+
+    @extend_schema(
+        description="Download the file of a finished export job. Supports `Range` requests.",
+        responses={(200, content_type): bytes for content_type in EXPORT_FORMATS.values()},
+    )
+    @action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, pk=None):
+        """Stream the export file, honouring ``Range`` so downloads can resume."""
+        job = self.get_object()
+        if job.status == ExportJob.Status.EXPIRED:
+            return Response(
+                {"detail": "Export job has expired; request the export again."},
+                status=status.HTTP_410_GONE,
+            )
+        if job.status != ExportJob.Status.SUCCEEDED or not job.file_path.exists():
+            return Response(
+                {"detail": "Export job has not finished yet."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return ranged_file_response(
+            request,
+            job.file_path,
+            content_type=EXPORT_FORMATS[job.export_format],
+            filename=f"crops_export_{job.pk}.{job.export_format}",
+            etag=f'"{job.fingerprint}"',
+        )
+
+
+class SyncView(APIView):
+    """Incremental change feed of crops and categories.
+
+    **GET /api/crops/sync/**
+
+    Returns what was created, updated or deleted since ``?token=`` together
+    with the token to pass next time. Without a token the feed starts from
+    the beginning, which doubles as the initial full load. A token older
+    than the tombstone retention period answers ``410 Gone``.
+    """
+
+    @extend_schema(
+        description=(
+            "Return crops and categories created or updated, and IDs deleted, since `token`. "
+            "Apply categories, then crops, then deletions, and request again with the returned "
+            "`token` until `has_more` is false. A `410` means deletions since `token` were "
+            "purged: discard local data and sync again without a token."
+        ),
+        parameters=[
+            OpenApiParameter("token", str, description="Token from the previous response; omit to start over."),
+            OpenApiParameter(
+                "limit",
+                int,
+                description=f"Changes per stream and page (default {SYNC_PAGE_SIZE}, max {SYNC_MAX_PAGE_SIZE}).",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 410: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        """Return the page of changes following the request's token."""
+        try:
+            limit = int(request.query_params.get("limit") or SYNC_PAGE_SIZE)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= SYNC_MAX_PAGE_SIZE:
+            raise ValidationError({"limit": f"Must be between 1 and {SYNC_MAX_PAGE_SIZE}."})
+        try:
+            body = changes_since(request.query_params.get("token"), limit=limit)
+        except SyncTokenExpired as exc:
+            return Response({"detail": str(exc), "code": "resync_required"}, status=status.HTTP_410_GONE)
+        except ValueError as exc:
+            raise ValidationError({"token": str(exc)})
+        return Response(body)
@@ -0,0 +1,57 @@
+from functools import partial
+
+from django.db.backends.postgresql import base, creation
+
+from ..metrics import record_query
+from .pool import close_pools, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """Close pooled connections before a test database is created or dropped."""
+
+    def _create_test_db(self, verbosity, autoclobber, keepdb=False):
+        close_pools()
+        return super()._create_test_db(verbosity, autoclobber, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that borrows connections from a per-process pool.
+
+    ``DATABASES[alias]["POOL"]`` holds the ``ConnectionPool`` options;
+    without it the backend behaves exactly like Django's. Closing the
+    connection, which Django does at the end of every request when
+    ``CONN_MAX_AGE`` is 0, returns it to the pool instead.
+    """
+
+    creation_class = DatabaseCreation
+
+    # The pool the current connection was borrowed from.
+    pool = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Count every query toward the current request's metrics.
+        self.execute_wrappers.append(record_query)
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict.get("POOL")
+        if not options:
+            self.pool = None
+            return super().get_new_connection(conn_params)
+        self.pool = get_pool(self.alias, conn_params, options)
+        return self.pool.getconn(partial(super().get_new_connection, conn_params))
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django keeps this wrapper pointing at a connection closed
+                # inside an atomic block, so it must never be handed out again.
+                self.pool.discard(self.connection)
+            else:
+                self.pool.putconn(self.connection)
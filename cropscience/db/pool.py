@@ -0,0 +1,268 @@
+import os
+import threading
+import time
+from collections import deque
+
+from psycopg2 import Error, OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR, TRANSACTION_STATUS_INTRANS
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    """No pooled connection became free within the pool's timeout."""
+
+
+class ConnectionPool:
+    """A bounded, thread-safe pool of open database connections.
+
+    At most ``max_size`` connections are open at once; callers beyond that
+    wait up to ``timeout`` seconds for one to be returned. Idle connections
+    are handed out most recently used first, so surplus ones stay idle and
+    are closed after ``max_idle`` seconds. Connections older than
+    ``max_lifetime`` seconds are closed instead of reused. With ``check``,
+    an idle connection runs ``SELECT 1`` before it is handed out and is
+    replaced if that fails.
+    """
+
+    def __init__(self, max_size=20, max_idle=300, max_lifetime=3600, timeout=10, check=True):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.check = check
+        self.closed = False
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        # (connection, returned at) pairs, most recently returned last.
+        self._idle = deque()
+        # Creation time of every open connection, keyed by ``id()``.
+        self._born = {}
+        self._size = 0
+        self._waiting = 0
+        self._requests = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def getconn(self, connect):
+        """Return an open connection, calling ``connect()`` when a new one is needed."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            conn, stale = self._acquire(deadline)
+            self._close_all(stale)
+            waited = time.monotonic() - started
+            if conn is None:
+                try:
+                    conn = connect()
+                except BaseException:
+                    self._release_slot()
+                    raise
+                with self._lock:
+                    self._born[id(conn)] = time.monotonic()
+                    self._created += 1
+            elif self.check and not self._is_usable(conn):
+                self.discard(conn)
+                continue
+            with self._lock:
+                self._requests += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            return conn
+
+    def putconn(self, conn):
+        """Return ``conn`` to the pool, or close it if it cannot be reused."""
+        if self.closed or self._expired(conn, time.monotonic()) or not self._reset(conn):
+            self.discard(conn)
+            return
+        with self._available:
+            self._idle.append((conn, time.monotonic()))
+            stale = self._prune(time.monotonic())
+            self._available.notify()
+        self._close_all(stale)
+
+    def discard(self, conn):
+        """Close ``conn`` and free its slot."""
+        with self._lock:
+            self._born.pop(id(conn), None)
+            self._discarded += 1
+        self._close_all([conn])
+        self._release_slot()
+
+    def close(self):
+        """Close idle connections; connections in use are closed when returned."""
+        with self._lock:
+            self.closed = True
+            stale = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            for conn in stale:
+                self._born.pop(id(conn), None)
+            self._size -= len(stale)
+        self._close_all(stale)
+
+    def stats(self):
+        """Return the pool's size, usage and wait statistics."""
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "waiting": self._waiting,
+                "requests": self._requests,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "wait_avg_ms": round(self._wait_total / self._requests * 1000, 3) if self._requests else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+    def _acquire(self, deadline):
+        """Take an idle connection, or reserve a slot for a new one (``None``).
+
+        Also returns the stale idle connections found on the way, which
+        the caller closes outside the lock.
+        """
+        stale = []
+        with self._available:
+            while True:
+                now = time.monotonic()
+                stale.extend(self._prune(now))
+                while self._idle:
+                    conn, _ = self._idle.pop()
+                    if not self._expired(conn, now):
+                        return conn, stale
+                    self._forget(conn)
+                    stale.append(conn)
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, stale
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._timeouts += 1
+                    self._close_all(stale)
+                    raise PoolTimeout(
+                        f"No database connection became free within {self.timeout} seconds; "
+                        f"all {self.max_size} are in use."
+                    )
+                self._waiting += 1
+                try:
+                    self._available.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+    def _prune(self, now):
+        """Drop connections idle for more than ``max_idle``; return them. Hold the lock."""
+        stale = []
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.popleft()
+            self._forget(conn)
+            stale.append(conn)
+        return stale
+
+    def _forget(self, conn):
+        """Stop counting idle ``conn``, which the caller closes. Hold the lock."""
+        self._born.pop(id(conn), None)
+        self._size -= 1
+        self._discarded += 1
+
+    def _expired(self, conn, now):
+        """Whether ``conn`` has outlived ``max_lifetime``."""
+        born = self._born.get(id(conn))
+        return born is None or now - born > self.max_lifetime
+
+    def _release_slot(self):
+        """Free the slot of a connection that was closed or never opened."""
+        with self._available:
+            self._size -= 1
+            self._available.notify()
+
+    @staticmethod
+    def _reset(conn):
+        """Roll back any open transaction and clear session state; return whether ``conn`` can be reused.
+
+        ``DISCARD ALL`` resets settings, drops temporary tables and releases
+        advisory locks and prepared statements, so nothing one borrower set
+        leaks into the next. Django sets up the session again on every borrow.
+        """
+        if conn.closed:
+            return False
+        status = conn.info.transaction_status
+        if status not in (TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS, TRANSACTION_STATUS_INERROR):
+            return False
+        try:
+            if status != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            # DISCARD ALL refuses to run inside a transaction block.
+            autocommit = conn.autocommit
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute("DISCARD ALL")
+            conn.autocommit = autocommit
+        except Error:
+            return False
+        return True
+
+    @staticmethod
+    def _is_usable(conn):
+        """Whether ``conn`` still answers a query."""
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not conn.autocommit:
+                conn.rollback()
+        except Error:
+            return False
+        return True
+
+    @staticmethod
+    def _close_all(conns):
+        """Close ``conns``, ignoring connections that are already broken."""
+        for conn in conns:
+            try:
+                conn.close()
+            except Error:
+                pass
+
+
+def get_pool(alias, conn_params, options):
+    """Return this process's pool for ``alias`` connecting with ``conn_params``.
+
+    Pools are keyed by process so a forked worker never reuses its
+    parent's sockets, and by connection parameters and options so a
+    changed database name (as in tests) gets its own pool.
+    """
+    key = (
+        os.getpid(),
+        alias,
+        tuple(sorted((name, str(value)) for name, value in conn_params.items())),
+        tuple(sorted(options.items())),
+    )
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(**options)
+    return pool
+
+
+def pool_stats():
+    """Return statistics for each pool of this process."""
+    with _pools_lock:
+        pools = [(key, pool) for key, pool in _pools.items() if key[0] == os.getpid()]
+    return [
+        {"alias": alias, "database": dict(params).get("database", ""), **pool.stats()}
+        for (_, alias, params, _), pool in pools
+    ]
+
+
+def close_pools():
+    """Close and forget every pool of this process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
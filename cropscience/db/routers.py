@@ -0,0 +1,180 @@
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Seconds a replica trails the primary: 0 on a server that is not in
+# recovery, or on a standby that has replayed everything it received.
+LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+class RoutingState:
+    """Where the current request reads from.
+
+    ``replica`` is the alias chosen for the request's reads, or ``None``
+    while they go to the primary. ``wrote`` is set by the first write, after
+    which every read goes to the primary too.
+    """
+
+    __slots__ = ("replica", "wrote")
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+
+def routing_state():
+    """Return the current request's ``RoutingState``; ``None`` outside requests."""
+    return _state.get()
+
+
+def reset_routing_state(**kwargs):
+    """Forget the routing state once the response, streamed or not, is finished."""
+    _state.set(None)
+
+
+request_finished.connect(reset_routing_state)
+
+
+def replica_lag(alias):
+    """Measure how many seconds the replica ``alias`` trails the primary."""
+    with connections[alias].cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        return float(cursor.fetchone()[0])
+
+
+class ReplicaMonitor:
+    """Per-process record of which replicas are close enough to the primary.
+
+    Each replica's lag is measured at most every
+    ``DB_REPLICA_CHECK_INTERVAL`` seconds. Replicas trailing by more than
+    ``DB_REPLICA_MAX_LAG`` seconds, or failing the measurement, are left out
+    until a later measurement clears them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # alias -> (measured at, lag in seconds or None when unreachable)
+        self._lags = {}
+
+    def available(self):
+        """Return the configured replicas currently fit to serve reads."""
+        return [alias for alias in settings.DATABASE_REPLICAS if self.within_limit(alias)]
+
+    def within_limit(self, alias):
+        """Whether ``alias`` answered its last lag check within ``DB_REPLICA_MAX_LAG``."""
+        lag = self.lag(alias)
+        return lag is not None and lag <= settings.DB_REPLICA_MAX_LAG
+
+    def lag(self, alias):
+        """Return the recently measured lag of ``alias``, or ``None`` if it is unreachable."""
+        now = time.monotonic()
+        with self._lock:
+            measured = self._lags.get(alias)
+        if measured is not None and now - measured[0] < settings.DB_REPLICA_CHECK_INTERVAL:
+            return measured[1]
+        try:
+            lag = replica_lag(alias)
+        except DatabaseError:
+            logger.warning("Replica %s is unreachable; reading from the primary.", alias, exc_info=True)
+            connections[alias].close()
+            lag = None
+        with self._lock:
+            self._lags[alias] = (now, lag)
+        return lag
+
+    def clear(self):
+        """Forget every measurement."""
+        with self._lock:
+            self._lags.clear()
+
+
+replica_monitor = ReplicaMonitor()
+
+
+def read_from_replica():
+    """Send the rest of the current request's reads to a replica.
+
+    Picks one of the replicas within the lag limit and returns its alias,
+    or ``None`` when the request already wrote or no replica qualifies, in
+    which case reads stay on the primary. Outside a request handled by
+    ``ReplicaRoutingMiddleware`` reads always stay on the primary.
+    """
+    state = routing_state()
+    if state is None or state.wrote:
+        return None
+    if state.replica is None:
+        replicas = replica_monitor.available()
+        state.replica = random.choice(replicas) if replicas else None
+    return state.replica
+
+
+class ReplicaRouter:
+    """Route reads to the request's replica and everything else to the primary.
+
+    Reads use the primary unless the view called ``read_from_replica()``,
+    and again once the request has written anything (read-your-writes).
+    Replicas are never migrated; they receive the schema from the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None:
+            return None
+        if state.wrote:
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Start every request reading from the primary, with nothing written.
+
+    The state lasts until ``request_finished``, so streamed responses,
+    whose queries run after the view returns, keep reading from the
+    request's replica.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        _state.set(RoutingState())
+        return self.get_response(request)
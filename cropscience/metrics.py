@@ -0,0 +1,290 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import request_finished
+
+# Upper bounds, in seconds, of the duration histogram buckets.
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the queries-per-request histogram buckets.
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Phases reported in ``Server-Timing`` and the phase histogram, besides ``total``.
+PHASES = ("db", "serialize", "render", "app")
+
+_metrics = ContextVar("request_metrics", default=None)
+
+
+class Histogram:
+    """A thread-safe Prometheus histogram with one series per label combination."""
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self, label_values):
+        """Return ``(cumulative bucket counts, sum)`` of one series, or ``None``."""
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                return None
+            counts, total = list(series[0]), series[1]
+        cumulative, running = [], 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return cumulative, total
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def expose(self):
+        """Return the histogram in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            label_sets = sorted(self._series)
+        bounds = [_format_number(bound) for bound in self.buckets] + ["+Inf"]
+        for label_values in label_sets:
+            cumulative, total = self.samples(label_values)
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values)]
+            for bound, count in zip(bounds, cumulative):
+                bucket_labels = ",".join(labels + [f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {count}")
+            series = "{" + ",".join(labels) + "}" if labels else ""
+            lines.append(f"{self.name}_sum{series} {_format_number(total)}")
+            lines.append(f"{self.name}_count{series} {cumulative[-1]}")
+        return "\n".join(lines)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REQUEST_DURATION = Histogram(
+    "cropscience_request_duration_seconds",
+    "Time from the request entering the middleware stack to the last byte of its response.",
+    ("view", "method", "status"),
+    DURATION_BUCKETS,
+)
+PHASE_DURATION = Histogram(
+    "cropscience_request_phase_seconds",
+    "Time each request spent in the database, serializing, rendering, and in the rest of the app.",
+    ("view", "phase"),
+    DURATION_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "cropscience_request_queries",
+    "Database queries run per request.",
+    ("view",),
+    QUERY_BUCKETS,
+)
+
+HISTOGRAMS = (REQUEST_DURATION, PHASE_DURATION, REQUEST_QUERIES)
+
+
+class RequestMetrics:
+    """Where the current request's time went, in seconds.
+
+    ``db`` and ``queries`` cover every query the request ran. ``serialize``
+    and ``render`` exclude queries run while serializing or rendering, so
+    the phases add up to at most ``total``.
+    """
+
+    __slots__ = ("started", "queries", "db", "serialize", "render", "serializing", "view", "method", "status")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.serializing = False
+        self.view = None
+        self.method = None
+        self.status = None
+
+    def phases(self, total):
+        """Return each of ``PHASES`` with its seconds, given the ``total`` so far."""
+        app = max(total - self.db - self.serialize - self.render, 0.0)
+        return dict(zip(PHASES, (self.db, self.serialize, self.render, app)))
+
+    def server_timing(self):
+        """Return the ``Server-Timing`` header value for the request so far."""
+        total = time.perf_counter() - self.started
+        entries = []
+        for phase, seconds in self.phases(total).items():
+            entry = f"{phase};dur={seconds * 1000:.2f}"
+            if phase == "db":
+                entry += f';desc="{self.queries} queries"'
+            entries.append(entry)
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+def request_metrics():
+    """Return the current request's ``RequestMetrics``; ``None`` outside requests."""
+    return _metrics.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query's time to the current request."""
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def timed_serialization(serialize, *args):
+    """Call ``serialize(*args)``, adding its time, less its queries, to the ``serialize`` phase.
+
+    Nested calls, such as the fields of a nested serializer, are counted
+    once as part of the outermost call.
+    """
+    metrics = _metrics.get()
+    if metrics is None or metrics.serializing:
+        return serialize(*args)
+    metrics.serializing = True
+    started, db = time.perf_counter(), metrics.db
+    try:
+        return serialize(*args)
+    finally:
+        metrics.serializing = False
+        metrics.serialize += time.perf_counter() - started - (metrics.db - db)
+
+
+class TimedSerializerMixin:
+    """Count a serializer's ``to_representation`` toward the request's ``serialize`` phase."""
+
+    def to_representation(self, instance):
+        return timed_serialization(super().to_representation, instance)
+
+
+def view_label(request):
+    """Name the view that served ``request``, as ``ViewSet.action`` for DRF views."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    cls = getattr(match.func, "cls", None)
+    if cls is None:
+        return match.view_name
+    method = request.method.lower()
+    actions = getattr(match.func, "actions", None) or {}
+    return f"{cls.__name__}.{actions.get(method, method)}"
+
+
+def finish_request_metrics(**kwargs):
+    """Record the current request into the histograms once its response is finished."""
+    metrics = _metrics.get()
+    if metrics is None:
+        return
+    _metrics.set(None)
+    if metrics.view is None:
+        return
+    total = time.perf_counter() - metrics.started
+    REQUEST_DURATION.observe(total, metrics.view, metrics.method, metrics.status)
+    for phase, seconds in metrics.phases(total).items():
+        PHASE_DURATION.observe(seconds, metrics.view, phase)
+    REQUEST_QUERIES.observe(metrics.queries, metrics.view)
+
+
+request_finished.connect(finish_request_metrics)
+
+
+def render_metrics():
+    """Return every histogram of this process in the Prometheus text format."""
+    return "\n".join(histogram.expose() for histogram in HISTOGRAMS) + "\n"
+
+
+def clear_metrics():
+    """Forget every observation."""
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+class RequestMetricsMiddleware:
+    """Measure each request's database, serialization and render time.
+
+    Adds a ``Server-Timing`` header (unless ``SERVER_TIMING`` is off) with
+    the time spent so far, and records the request into the histograms
+    served by ``/api/metrics/`` once the response is finished, so streamed
+    responses count their whole body. Place first in ``MIDDLEWARE``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django would run a sync hook on a worker thread for async requests.
+            self.process_template_response = self._aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        _metrics.set(metrics)
+        return self._finish(request, self.get_response(request), metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        _metrics.set(metrics)
+        return self._finish(request, await self.get_response(request), metrics)
+
+    def process_template_response(self, request, response):
+        """Time the render that follows, which runs after every template-response hook."""
+        return _time_render(response)
+
+    async def _aprocess_template_response(self, request, response):
+        return _time_render(response)
+
+    @staticmethod
+    def _finish(request, response, metrics):
+        metrics.view = view_label(request)
+        metrics.method = request.method
+        metrics.status = response.status_code
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = metrics.server_timing()
+        return response
+
+
+def _time_render(response):
+    """Add the time until ``response`` is rendered, less its queries, to the ``render`` phase."""
+    metrics = _metrics.get()
+    if metrics is None:
+        return response
+    started, db = time.perf_counter(), metrics.db
+
+    def rendered(response):
+        metrics.render += time.perf_counter() - started - (metrics.db - db)
+
+    response.add_post_render_callback(rendered)
+    return response
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party
     "rest_framework",
     "rest_framework_simplejwt",
@@ -41,7 +42,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "cropscience.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "cropscience.db.routers.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -74,24 +77,79 @@ WSGI_APPLICATION = "cropscience.wsgi.application"
 # Database — PostgreSQL
 # ---------------------------------------------------------------------------
 
+# Borrow connections from a per-process pool instead of opening one per request.
+DB_POOL = os.environ.get("DB_POOL", "True").lower() in ("true", "1", "yes")
+# Test idle connections with ``SELECT 1`` before reusing them.
+DB_HEALTH_CHECKS = os.environ.get("DB_HEALTH_CHECKS", "True").lower() in ("true", "1", "yes")
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "cropscience.db",
         "NAME": os.environ.get("DB_NAME", "infodecs_db"),
         "USER": os.environ.get("DB_USER", "infodecs_user"),
         "PASSWORD": os.environ.get("DB_PASSWORD", "12345"),
         "HOST": os.environ.get("DB_HOST", "localhost"),
         "PORT": os.environ.get("DB_PORT", "5432"),
+        # Pooled connections go back to the pool after every request;
+        # unpooled ones are kept open this many seconds.
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": DB_HEALTH_CHECKS,
+        # Per process: keep DB_POOL_MAX_SIZE x processes below max_connections.
+        "POOL": {
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "20")),
+            "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "3600")),
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            "check": DB_HEALTH_CHECKS,
+        }
+        if DB_POOL
+        else None,
         "TEST": {
             "NAME": os.environ.get("DB_NAME", "infodecs_db"),
         },
     }
 }
 
+# Read replicas as comma-separated ``host[:port][/name]`` entries; parts left
+# out match the primary. Each becomes a ``replicaN`` alias.
+DATABASE_REPLICAS = []
+for _index, _replica in enumerate(filter(None, os.environ.get("DB_REPLICAS", "").split(",")), start=1):
+    _address, _, _name = _replica.strip().partition("/")
+    _host, _, _port = _address.partition(":")
+    DATABASES[f"replica{_index}"] = {
+        **DATABASES["default"],
+        "HOST": _host or DATABASES["default"]["HOST"],
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "NAME": _name or DATABASES["default"]["NAME"],
+        # Tests read "replicas" through the primary's connection.
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{_index}")
+
+DATABASE_ROUTERS = ["cropscience.db.routers.ReplicaRouter"]
+
+# Replicas further behind the primary than this many seconds serve no reads.
+DB_REPLICA_MAX_LAG = float(os.environ.get("DB_REPLICA_MAX_LAG", "5"))
+# Seconds between lag measurements of each replica, per process.
+DB_REPLICA_CHECK_INTERVAL = float(os.environ.get("DB_REPLICA_CHECK_INTERVAL", "5"))
+
 # ---------------------------------------------------------------------------
-# Password validation
+# Passwords
 # ---------------------------------------------------------------------------
 
+# Project PBKDF2 hasher first so its iteration count applies; the rest verify legacy hashes.
+PASSWORD_HASHERS = [
+    "users.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# PBKDF2 iterations for new hashes; raising it rehashes passwords at next login.
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", "600000"))
+# Threads hashing passwords for the async login and registration views, per process.
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -126,7 +184,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -141,6 +199,33 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# ---------------------------------------------------------------------------
+# Background exports
+# ---------------------------------------------------------------------------
+
+EXPORT_ROOT = os.environ.get("EXPORT_ROOT", str(BASE_DIR / "exports"))
+EXPORT_JOB_WORKERS = int(os.environ.get("EXPORT_JOB_WORKERS", "2"))
+# Pending or running jobs whose process has not beaten for this long count as failed.
+EXPORT_JOB_STALE_SECONDS = int(os.environ.get("EXPORT_JOB_STALE_SECONDS", "120"))
+# Finished jobs older than this expire and their files are deleted.
+EXPORT_JOB_RETENTION_HOURS = int(os.environ.get("EXPORT_JOB_RETENTION_HOURS", "24"))
+
+# ---------------------------------------------------------------------------
+# Change feed
+# ---------------------------------------------------------------------------
+
+# Tombstones older than this are purged; tokens that predate a purge must resync.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+# ---------------------------------------------------------------------------
+# Authentication cache
+# ---------------------------------------------------------------------------
+
+# Users resolved from access tokens are cached per process for this many seconds.
+AUTH_USER_CACHE_TTL = float(os.environ.get("AUTH_USER_CACHE_TTL", "30"))
+# Most users each process keeps cached; 0 disables the cache.
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", "10000"))
+
 # ---------------------------------------------------------------------------
 # Simple JWT
 # ---------------------------------------------------------------------------
@@ -151,8 +236,27 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.TokenRefreshSerializer",
 }
 
+# Most blacklisted token ids each process remembers; 0 disables the cache.
+TOKEN_BLACKLIST_CACHE_SIZE = int(os.environ.get("TOKEN_BLACKLIST_CACHE_SIZE", "100000"))
+# Seconds between purges of expired tokens started by token refreshes; 0 disables them.
+TOKEN_PURGE_INTERVAL = float(os.environ.get("TOKEN_PURGE_INTERVAL", "3600"))
+# Expired tokens deleted per purge transaction.
+TOKEN_PURGE_BATCH_SIZE = int(os.environ.get("TOKEN_PURGE_BATCH_SIZE", "5000"))
+
+# ---------------------------------------------------------------------------
+# Request metrics
+# ---------------------------------------------------------------------------
+
+# Add a ``Server-Timing`` header with each response's database, serialization and render time.
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "True").lower() in ("true", "1", "yes")
+# Bearer token scrapers must send to read /api/metrics/; staff can always read it.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+# Serve /api/metrics/ to anyone, e.g. when only a private network reaches it.
+METRICS_PUBLIC = os.environ.get("METRICS_PUBLIC", "False").lower() in ("true", "1", "yes")
+
 # ---------------------------------------------------------------------------
 # drf-spectacular (Swagger / OpenAPI)
 # ---------------------------------------------------------------------------
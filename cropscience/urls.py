@@ -2,11 +2,15 @@ from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from .views import DatabaseHealthView, metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     # API endpoints
     path("api/auth/", include("users.urls")),
     path("api/crops/", include("crops.urls")),
+    path("api/health/database/", DatabaseHealthView.as_view(), name="health-database"),
+    path("api/metrics/", metrics_view, name="metrics"),
     # API documentation
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
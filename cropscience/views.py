@@ -0,0 +1,90 @@
+import hmac
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.http import HttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from .db.pool import pool_stats
+from .db.routers import replica_lag
+from .metrics import render_metrics
+
+# Content type of the Prometheus text exposition format.
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class DatabaseHealthView(APIView):
+    """Report database reachability, replica lag and this process's connection pool statistics."""
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        description=(
+            "Run `SELECT 1` on every configured database and return its latency, and for "
+            "read replicas how many seconds they trail the primary, plus the size, usage and "
+            "wait statistics of each connection pool in the serving process. Answers 503 when "
+            "a database is unreachable. Staff only."
+        ),
+        responses={200: OpenApiTypes.OBJECT, 503: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        databases, healthy = {}, True
+        for alias in connections:
+            started = time.perf_counter()
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                latency = (time.perf_counter() - started) * 1000
+                lag = replica_lag(alias) if alias in settings.DATABASE_REPLICAS else None
+            except DatabaseError as exc:
+                healthy = False
+                databases[alias] = {"status": "unavailable", "error": str(exc)}
+            else:
+                databases[alias] = {"status": "ok", "latency_ms": round(latency, 3)}
+                if lag is not None:
+                    databases[alias]["lag_seconds"] = round(lag, 3)
+        return Response(
+            {"databases": databases, "pools": pool_stats()},
+            status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+
+def metrics_view(request):
+    """Serve this process's request histograms in the Prometheus text format.
+
+    Scrapers send ``METRICS_TOKEN`` as a bearer token; staff may also read
+    them with their API token. ``METRICS_PUBLIC`` opens the endpoint to
+    anyone. A plain Django view, so token scrapes skip DRF's authentication
+    and rendering.
+    """
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    if not settings.METRICS_PUBLIC and not (token and hmac.compare_digest(header, f"Bearer {token}")):
+        user = _api_user(request) if header else None
+        if user is None:
+            return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+        if not user.is_staff:
+            return HttpResponse(status=403)
+    return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+
+def _api_user(request):
+    """Return the user ``request`` authenticates as through the API's authenticators, or None."""
+    drf_request = Request(request)
+    for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication().authenticate(drf_request)
+        except APIException:
+            return None
+        if result is not None:
+            return result[0]
+    return None
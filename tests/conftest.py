@@ -4,6 +4,13 @@ from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from crops.models import Crop, CropCategory
+from users.authentication import user_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_user_cache():
+    """Start every test without users cached by earlier ones."""
+    user_cache.clear()
 
 
 @pytest.fixture
@@ -0,0 +1,124 @@
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import resolve, reverse
+
+from users.passwords import aauthenticate
+
+
+@pytest.fixture(autouse=True)
+def fast_hashes(settings):
+    """Hash with few iterations so the tests stay quick."""
+    settings.PASSWORD_HASH_ITERATIONS = 1000
+
+
+@pytest.mark.django_db
+class TestAsyncAuthViews:
+    """Tests for the async register and login views."""
+
+    login_url = reverse("auth-login")
+    register_url = reverse("auth-register")
+
+    def test_views_are_async(self):
+        """Django serves both views as coroutines."""
+        assert iscoroutinefunction(resolve(self.login_url).func)
+        assert iscoroutinefunction(resolve(self.register_url).func)
+
+    def test_registered_user_can_log_in(self, api_client):
+        """A password hashed on the pool at registration verifies at login."""
+        payload = {
+            "username": "asyncuser",
+            "email": "Async@EXAMPLE.com",
+            "password": "StrongPass1!",
+            "password2": "StrongPass1!",
+        }
+        assert api_client.post(self.register_url, payload, format="json").status_code == 201
+
+        user = User.objects.get(username="asyncuser")
+        assert user.email == "Async@example.com"
+        assert user.password.startswith("pbkdf2_sha256$1000$")
+        response = api_client.post(
+            self.login_url, {"username": "asyncuser", "password": "StrongPass1!"}, format="json"
+        )
+        assert response.status_code == 200
+        assert set(response.json()) == {"refresh", "access"}
+
+    def test_login_upgrades_iterations(self, api_client, user, settings):
+        """Raising the iteration count rehashes the password at the next login."""
+        settings.PASSWORD_HASH_ITERATIONS = 2000
+
+        response = api_client.post(
+            self.login_url, {"username": "testuser", "password": "TestPass123!"}, format="json"
+        )
+
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$2000$")
+        assert user.check_password("TestPass123!")
+
+    def test_failed_login_keeps_hash(self, api_client, user):
+        """A wrong password is rejected with 401 and leaves the stored hash alone."""
+        stored = user.password
+
+        response = api_client.post(
+            self.login_url, {"username": "testuser", "password": "WrongPassword!"}, format="json"
+        )
+
+        assert response.status_code == 401
+        assert "WWW-Authenticate" in response
+        user.refresh_from_db()
+        assert user.password == stored
+
+    def test_inactive_user_cannot_log_in(self, api_client, user):
+        """Inactive users are refused like unknown ones."""
+        user.is_active = False
+        user.save()
+
+        response = api_client.post(
+            self.login_url, {"username": "testuser", "password": "TestPass123!"}, format="json"
+        )
+
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize(
+        "username, password, active",
+        [("testuser", "WrongPassword!", True), ("nobody", "TestPass123!", True), ("testuser", "TestPass123!", False)],
+    )
+    def test_failed_login_sends_signal(self, api_client, user, username, password, active):
+        """Wrong passwords, unknown users and inactive users send ``user_login_failed``, password masked."""
+        user.is_active = active
+        user.save()
+        received = []
+
+        def receiver(sender, credentials, request, **kwargs):
+            """Record the failure."""
+            received.append((sender, credentials, request))
+
+        user_login_failed.connect(receiver)
+        try:
+            response = api_client.post(self.login_url, {"username": username, "password": password}, format="json")
+        finally:
+            user_login_failed.disconnect(receiver)
+
+        assert response.status_code == 401
+        [(sender, credentials, request)] = received
+        assert sender == "django.contrib.auth"
+        assert credentials["username"] == username
+        assert credentials["password"] != password
+        assert request is not None
+
+    def test_other_backends_are_refused(self, settings):
+        """Backends ``aauthenticate`` cannot reproduce fail loudly instead of being skipped."""
+        settings.AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.RemoteUserBackend"]
+
+        with pytest.raises(ImproperlyConfigured):
+            async_to_sync(aauthenticate)("testuser", "TestPass123!")
+
+    def test_missing_credentials(self, api_client):
+        """Missing fields answer 400 naming them."""
+        response = api_client.post(self.login_url, {"username": "testuser"}, format="json")
+
+        assert response.status_code == 400
+        assert "password" in response.json()
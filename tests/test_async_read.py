@@ -0,0 +1,147 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from crops.exports import aiter_crop_rows, aiter_export, iter_crop_rows, iter_export
+from crops.models import Crop, CropCategory
+from crops.views import CropCategoryViewSet, CropViewSet
+
+LIST_PARAMS = [
+    {},
+    {"water_requirements": "low", "ordering": "-growth_duration_days"},
+    {"search": "wheat"},
+    {"search": "wheat", "search_mode": "fulltext"},
+    {"fuzzy": "Async Whaet", "fuzzy_threshold": "0.3"},
+    {"page_size": 2, "page": 2},
+    {"pagination": "cursor", "page_size": 2, "ordering": "created_at"},
+    {"fields": "id,name", "ordering": "-name"},
+]
+
+
+@pytest.fixture
+def crops(category):
+    """Create a handful of crops with distinct names, durations and water needs."""
+    return Crop.objects.bulk_create(
+        Crop(
+            name=f"Async Wheat {i}",
+            scientific_name=f"Triticum async {i}",
+            category=category,
+            growth_duration_days=60 + i * 7 % 5,
+            water_requirements=["low", "medium", "high"][i % 3],
+        )
+        for i in range(7)
+    )
+
+
+def fetch(viewset, actions, path, user, params=None, sync=False, **kwargs):
+    """Call ``viewset`` directly; with ``sync`` every action takes the sync dispatch path."""
+    initkwargs = {"async_actions": ()} if sync else {}
+    view = async_to_sync(viewset.as_view(actions, **initkwargs))
+    request = APIRequestFactory().get(path, params or {})
+    force_authenticate(request, user=user)
+    response = view(request, **kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+@pytest.mark.django_db
+class TestAsyncReadPath:
+    """The async list, retrieve and export actions answer exactly like the sync ones."""
+
+    def test_read_views_are_async(self):
+        """Django serves the crop and category routes as coroutines."""
+        assert iscoroutinefunction(resolve(reverse("crop-list")).func)
+        assert iscoroutinefunction(resolve(reverse("category-detail", args=[1])).func)
+
+    @pytest.mark.parametrize("params", LIST_PARAMS)
+    def test_crop_list_matches_sync(self, user, crops, params):
+        """Filters, search, ordering and both pagination modes give identical pages."""
+        path = reverse("crop-list")
+        actions = {"get": "list"}
+
+        async_response = fetch(CropViewSet, actions, path, user, params)
+        sync_response = fetch(CropViewSet, actions, path, user, params, sync=True)
+
+        assert async_response.status_code == sync_response.status_code == 200
+        assert async_response.content == sync_response.content
+        assert async_response["ETag"] == sync_response["ETag"]
+
+    def test_cursor_pages_match_sync(self, user, crops):
+        """Following ``next`` links walks the same rows in both paths."""
+        path = reverse("crop-list")
+        params = {"pagination": "cursor", "page_size": 3}
+        next_url = fetch(CropViewSet, {"get": "list"}, path, user, params).data["next"]
+        params["cursor"] = parse_qs(urlsplit(next_url).query)["cursor"][0]
+
+        async_page = fetch(CropViewSet, {"get": "list"}, path, user, params)
+        sync_page = fetch(CropViewSet, {"get": "list"}, path, user, params, sync=True)
+
+        assert async_page.content == sync_page.content
+
+    def test_retrieve_matches_sync(self, user, crop):
+        """Detail responses and validators are identical; unknown IDs answer 404."""
+        actions = {"get": "retrieve"}
+        path = reverse("crop-detail", args=[crop.id])
+
+        async_response = fetch(CropViewSet, actions, path, user, pk=str(crop.id))
+        sync_response = fetch(CropViewSet, actions, path, user, sync=True, pk=str(crop.id))
+
+        assert async_response.content == sync_response.content
+        assert async_response["Last-Modified"] == sync_response["Last-Modified"]
+        assert fetch(CropViewSet, actions, path, user, pk="0").status_code == 404
+        assert fetch(CropViewSet, actions, path, user, pk="abc").status_code == 404
+
+    def test_category_overview_matches_sync(self, user, crops):
+        """Prefetched previews and annotated counts render identically."""
+        CropCategory.objects.create(name="Async Empty")
+        path = reverse("category-list")
+        params = {"with_counts": "true", "preview": 2}
+
+        async_response = fetch(CropCategoryViewSet, {"get": "list"}, path, user, params)
+        sync_response = fetch(CropCategoryViewSet, {"get": "list"}, path, user, params, sync=True)
+
+        assert async_response.content == sync_response.content
+
+    def test_writes_still_work(self, auth_client, category):
+        """Non-read actions take the sync path."""
+        response = auth_client.post(
+            reverse("crop-list"),
+            {
+                "name": "Async Rye",
+                "scientific_name": "Secale async",
+                "category_id": category.id,
+                "growth_duration_days": 100,
+                "water_requirements": "low",
+            },
+            format="json",
+        )
+
+        assert response.status_code == 201
+
+    def test_async_export_reads_rows_off_the_event_loop(self, crops):
+        """Async export rows come from the database thread and match the sync ones."""
+        columns = ["id", "name", "category", "created_at"]
+
+        async def collect():
+            return [row async for row in aiter_crop_rows(Crop.objects.order_by("id"), columns, chunk_size=3)]
+
+        assert async_to_sync(collect)() == list(iter_crop_rows(Crop.objects.order_by("id"), columns))
+
+    @pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+    def test_async_export_encoding_matches_sync(self, export_format):
+        """The async encoders write the same bytes as the sync ones."""
+        columns = ["id", "name"]
+        rows = [[i, f"Crop, {i} \"quoted\""] for i in range(5000)]
+
+        async def arows():
+            for row in rows:
+                yield row
+
+        async def collect():
+            return b"".join([block async for block in aiter_export(arows(), export_format, columns)])
+
+        assert async_to_sync(collect)() == b"".join(iter_export(iter(rows), export_format, columns))
@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.authentication import user_cache
+
+
+def user_queries(queries):
+    """Return the captured queries that read ``auth_user``."""
+    return [q["sql"] for q in queries if 'FROM "auth_user"' in q["sql"]]
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Tests for the cached user lookup behind JWT authentication."""
+
+    url = reverse("category-list")
+
+    def test_repeat_requests_skip_user_query(self, auth_client):
+        """Only the first request for a user reads auth_user."""
+        with CaptureQueriesContext(connection) as first:
+            auth_client.get(self.url)
+        with CaptureQueriesContext(connection) as repeat:
+            response = auth_client.get(self.url)
+
+        assert response.status_code == 200
+        assert len(user_queries(first)) == 1
+        assert user_queries(repeat) == []
+
+    def test_deactivation_revokes_access(self, auth_client, user):
+        """Deactivating a cached user rejects its next request."""
+        assert auth_client.get(self.url).status_code == 200
+        user.is_active = False
+        user.save()
+
+        assert auth_client.get(self.url).status_code == 401
+
+    def test_changes_are_picked_up(self, auth_client, user):
+        """Saving a user evicts it so the next request reloads it."""
+        auth_client.get(self.url)
+        user.is_staff = True
+        user.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            auth_client.get(self.url)
+
+        assert len(user_queries(queries)) == 1
+
+    def test_deleted_user_is_rejected(self, auth_client, user):
+        """Deleting a cached user rejects its next request."""
+        auth_client.get(self.url)
+        user.delete()
+
+        assert auth_client.get(self.url).status_code == 401
+
+    def test_entries_expire(self, auth_client, settings):
+        """Entries older than the TTL are reloaded."""
+        settings.AUTH_USER_CACHE_TTL = 0.000001
+        auth_client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            auth_client.get(self.url)
+
+        assert len(user_queries(queries)) == 1
+
+    def test_cache_is_bounded(self, create_user, settings):
+        """The least recently used user is evicted beyond the size limit."""
+        settings.AUTH_USER_CACHE_SIZE = 2
+        users = [create_user(username=f"cached-{i}", email=f"cached-{i}@example.com") for i in range(3)]
+        for user in users:
+            user_cache.set(user.id, user, user_cache.generation())
+
+        assert user_cache.get(users[0].id) is None
+        assert user_cache.get(users[2].id) == users[2]
@@ -0,0 +1,148 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crops import bulk
+from crops.models import Crop, CropCategory
+
+
+def crop_payload(category, **overrides):
+    """Return a valid crop creation payload."""
+    payload = {
+        "name": "Bulk Oat",
+        "scientific_name": "Avena bulkus",
+        "category_id": category.id,
+        "growth_duration_days": 100,
+        "water_requirements": "medium",
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.django_db
+class TestBulkCropEndpoints:
+    """Tests for /api/crops/crops/bulk/."""
+
+    url = reverse("crop-bulk")
+
+    def test_bulk_create_query_count_is_constant(self, auth_client, category):
+        """Creating 50 crops costs the same number of queries as creating 2."""
+        other = CropCategory.objects.create(name="Bulk Legumes")
+
+        def post(count):
+            items = [crop_payload(category if i % 2 else other, name=f"Bulk {count}-{i}") for i in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = auth_client.post(self.url, items, format="json")
+            assert response.status_code == 201
+            return response.json()["results"], len(queries)
+
+        post(1)  # Warm up: creates the crop data version row.
+        _, small = post(2)
+        results, large = post(50)
+
+        assert large == small
+        assert [r["name"] for r in results] == [f"Bulk 50-{i}" for i in range(50)]
+        assert results[0]["category"]["name"] == "Bulk Legumes"
+        assert Crop.objects.filter(name__startswith="Bulk ").count() == 53
+
+    def test_atomic_mode_writes_nothing_on_error(self, auth_client, category):
+        """One invalid item rejects the whole request with per-item errors."""
+        items = [crop_payload(category), crop_payload(category, category_id=999999), {"name": ""}]
+        response = auth_client.post(self.url, items, format="json")
+
+        assert response.status_code == 400
+        errors = response.json()["errors"]
+        assert [e["index"] for e in errors] == [1, 2]
+        assert "category_id" in errors[0]["errors"]
+        assert not Crop.objects.filter(name="Bulk Oat").exists()
+
+    def test_best_effort_mode_writes_valid_items(self, auth_client, category):
+        """best_effort writes valid items and reports the rest with 207."""
+        items = [crop_payload(category), crop_payload(category, water_requirements="flood")]
+        response = auth_client.post(f"{self.url}?mode=best_effort", items, format="json")
+
+        assert response.status_code == 207
+        assert len(response.json()["results"]) == 1
+        assert response.json()["errors"][0]["index"] == 1
+        assert Crop.objects.filter(name="Bulk Oat").count() == 1
+
+    def test_duplicate_natural_keys_are_reported(self, auth_client, crop, category):
+        """Items repeating a stored or earlier natural key are rejected per item."""
+        items = [
+            crop_payload(category, name=crop.name, scientific_name=crop.scientific_name),
+            crop_payload(category),
+            crop_payload(category),
+        ]
+        response = auth_client.post(f"{self.url}?mode=best_effort", items, format="json")
+
+        assert response.status_code == 207
+        assert [e["index"] for e in response.json()["errors"]] == [0, 2]
+        assert Crop.objects.filter(name="Bulk Oat").count() == 1
+
+    def test_bulk_update(self, auth_client, crop, category):
+        """PATCH applies partial updates by id and refreshes updated_at."""
+        before = crop.updated_at
+        items = [{"id": crop.id, "growth_duration_days": 95}, {"id": 0, "name": "Missing"}]
+        response = auth_client.patch(f"{self.url}?mode=best_effort", items, format="json")
+
+        assert response.status_code == 207
+        assert response.json()["results"][0]["growth_duration_days"] == 95
+        assert response.json()["errors"] == [{"index": 1, "errors": {"id": ["Crop not found."]}}]
+        crop.refresh_from_db()
+        assert crop.growth_duration_days == 95
+        assert crop.updated_at > before
+
+    def test_repeated_ids_are_rejected(self, auth_client, crop):
+        """An id given twice is an item error instead of merging both updates."""
+        items = [{"id": crop.id, "growth_duration_days": 95}, {"id": crop.id, "name": "Renamed"}]
+        response = auth_client.patch(f"{self.url}?mode=best_effort", items, format="json")
+
+        assert response.status_code == 207
+        assert response.json()["errors"] == [
+            {"index": 1, "errors": {"id": ["Crop appears more than once in this request."]}}
+        ]
+        crop.refresh_from_db()
+        assert (crop.growth_duration_days, crop.name) == (95, "Test Wheat")
+
+    def test_concurrent_natural_key_clash_is_a_duplicate(self, auth_client, category, monkeypatch):
+        """A natural key taken between the duplicate check and the write is reported, not a 500."""
+        check = bulk.find_duplicates
+
+        def racing_check(indexed_crops):
+            duplicates = check(indexed_crops)
+            if not Crop.objects.filter(name="Bulk Oat").exists():
+                Crop.objects.create(**crop_payload(category))
+            return duplicates
+
+        monkeypatch.setattr(bulk, "find_duplicates", racing_check)
+        items = [crop_payload(category), crop_payload(category, name="Bulk Rye")]
+
+        response = auth_client.post(self.url, items, format="json")
+        assert response.status_code == 400
+        assert response.json()["errors"] == [{"index": 0, "errors": bulk.DUPLICATE_ERROR}]
+        assert not Crop.objects.filter(name="Bulk Rye").exists()
+
+        Crop.objects.filter(name="Bulk Oat").delete()
+        response = auth_client.post(f"{self.url}?mode=best_effort", items, format="json")
+        assert response.status_code == 207
+        assert [crop["name"] for crop in response.json()["results"]] == ["Bulk Rye"]
+        assert response.json()["errors"] == [{"index": 0, "errors": bulk.DUPLICATE_ERROR}]
+
+    def test_bulk_delete(self, auth_client, crop):
+        """DELETE removes crops by id in one transaction."""
+        response = auth_client.delete(self.url, {"ids": [crop.id]}, format="json")
+
+        assert response.status_code == 200
+        assert response.json()["deleted"] == [crop.id]
+        assert not Crop.objects.filter(id=crop.id).exists()
+
+        missing = auth_client.delete(self.url, {"ids": [crop.id]}, format="json")
+        assert missing.status_code == 400
+
+    def test_bulk_write_changes_list_etag(self, auth_client, category):
+        """Bulk writes invalidate conditional GET validators like single writes do."""
+        etag = auth_client.get(reverse("crop-list"))["ETag"]
+        auth_client.post(self.url, [crop_payload(category)], format="json")
+
+        assert auth_client.get(reverse("crop-list"), HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crops.models import Crop, CropCategory
+
+
+def make_categories(count, crops_each=4, start=0):
+    """Create ``count`` categories holding ``crops_each`` crops, numbered from ``start``."""
+    for i in range(start, start + count):
+        category = CropCategory.objects.create(name=f"Overview {i:02d}")
+        Crop.objects.bulk_create(
+            Crop(
+                name=f"Overview crop {i}-{j}",
+                scientific_name=f"Overviewus {i}-{j}",
+                category=category,
+                growth_duration_days=50 + j,
+                water_requirements="low",
+            )
+            for j in range(crops_each)
+        )
+
+
+@pytest.mark.django_db
+class TestCategoryOverview:
+    """Tests for ?with_counts= and ?preview= on /api/crops/categories/."""
+
+    list_url = reverse("category-list")
+
+    def test_counts_and_previews(self, auth_client):
+        """Each category carries its crop count and first crops by name."""
+        make_categories(2, crops_each=4)
+
+        response = auth_client.get(self.list_url, {"with_counts": "true", "preview": 2})
+
+        assert response.status_code == 200
+        first = response.json()["results"][0]
+        assert first["name"] == "Overview 00"
+        assert first["crop_count"] == 4
+        assert [c["name"] for c in first["crops"]] == ["Overview crop 0-0", "Overview crop 0-1"]
+        assert set(first["crops"][0]) == {"id", "name", "scientific_name", "water_requirements", "growth_duration_days"}
+
+    def test_fields_are_opt_in(self, auth_client):
+        """Without the parameters the representation is unchanged; each adds only its own field."""
+        make_categories(1)
+
+        plain = auth_client.get(self.list_url).json()["results"][0]
+        counted = auth_client.get(self.list_url, {"with_counts": "1"}).json()["results"][0]
+        previewed = auth_client.get(self.list_url, {"preview": 1}).json()["results"][0]
+
+        assert set(plain) == {"id", "name", "description", "created_at"}
+        assert set(counted) == set(plain) | {"crop_count"}
+        assert set(previewed) == set(plain) | {"crops"}
+
+    def test_query_count_does_not_grow_with_categories(self, auth_client):
+        """A page of many categories costs as many queries as a page of few."""
+        params = {"with_counts": "true", "preview": 3, "page_size": 50}
+        make_categories(2)
+        # Load the user into the authentication cache so both requests skip it.
+        auth_client.get(self.list_url)
+        with CaptureQueriesContext(connection) as few:
+            auth_client.get(self.list_url, params)
+        make_categories(20, start=2)
+        with CaptureQueriesContext(connection) as many:
+            response = auth_client.get(self.list_url, params)
+
+        assert len(response.json()["results"]) == 22
+        assert len(many) == len(few)
+
+    def test_retrieve_with_overview(self, auth_client, crop, category):
+        """The detail endpoint accepts the same options."""
+        url = reverse("category-detail", args=[category.id])
+
+        data = auth_client.get(url, {"with_counts": "true", "preview": 5}).json()
+
+        assert data["crop_count"] == 1
+        assert [c["id"] for c in data["crops"]] == [crop.id]
+
+    def test_crop_changes_invalidate_etag(self, auth_client, crop, category):
+        """With counts requested, the ETag follows crop writes too."""
+        params = {"with_counts": "true"}
+        etag = auth_client.get(self.list_url, params)["ETag"]
+        crop.delete()
+
+        response = auth_client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.json()["results"][0]["crop_count"] == 0
+
+    def test_invalid_preview(self, auth_client):
+        """Out of range previews answer 400."""
+        assert auth_client.get(self.list_url, {"preview": 99}).status_code == 400
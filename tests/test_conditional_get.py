@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from crops.models import Crop
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Tests for ETag / Last-Modified validators on crop and category endpoints."""
+
+    def test_list_etag_returns_304_without_main_query(self, auth_client, crop, django_assert_num_queries):
+        """A matching If-None-Match skips the list query and serialisation."""
+        url = reverse("crop-list")
+        first = auth_client.get(url)
+        assert "ETag" in first
+        assert "Last-Modified" in first
+
+        with django_assert_num_queries(1):
+            # Data versions only; the user is cached by the first request.
+            response = auth_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert response.status_code == 304
+        assert response["ETag"] == first["ETag"]
+
+    def test_list_etag_changes_after_write(self, auth_client, crop):
+        """Creating a crop invalidates the list validators."""
+        url = reverse("crop-list")
+        etag = auth_client.get(url)["ETag"]
+        Crop.objects.create(
+            name="Etag Barley",
+            scientific_name="Hordeum etag",
+            category=crop.category,
+            growth_duration_days=90,
+            water_requirements="low",
+        )
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_every_write_statement_changes_list_etag(self, auth_client, crop, category):
+        """Repeated deletes on one queryset, ``update()`` and raw SQL each change the ETag."""
+        url = reverse("crop-list")
+        crops = Crop.objects.filter(name__startswith="Gone")
+
+        def etag_after(write):
+            before = auth_client.get(url)["ETag"]
+            write()
+            return auth_client.get(url, HTTP_IF_NONE_MATCH=before).status_code
+
+        def add():
+            Crop.objects.create(
+                name="Gone Rye",
+                scientific_name="Secale gone",
+                category=category,
+                growth_duration_days=100,
+                water_requirements="low",
+            )
+
+        add()
+        assert etag_after(crops.delete) == 200
+        add()
+        assert etag_after(crops.delete) == 200
+        assert etag_after(lambda: Crop.objects.filter(pk=crop.pk).update(growth_duration_days=77)) == 200
+        with connection.cursor() as cursor:
+            assert etag_after(lambda: cursor.execute("UPDATE crops_crop SET description = 'raw'")) == 200
+            assert etag_after(lambda: cursor.execute("DELETE FROM crops_crop WHERE id < 0")) == 304
+
+    def test_detail_if_modified_since(self, auth_client, crop):
+        """If-Modified-Since returns 304 until the crop or its category changes."""
+        url = reverse("crop-detail", args=[crop.id])
+        last_modified = auth_client.get(url)["Last-Modified"]
+
+        assert auth_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+        crop.category.name = "Renamed Cereals"
+        crop.category.save()
+        etag = auth_client.get(url)["ETag"]
+        crop.category.description = "Changed again."
+        crop.category.save()
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_detail_of_missing_crop_is_404(self, auth_client, crop):
+        """Validators do not mask a missing object."""
+        url = reverse("crop-detail", args=[crop.id + 1000])
+
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH='"anything"').status_code == 404
+
+    def test_category_list_etag(self, auth_client, category):
+        """Category lists are validated by the category data version."""
+        url = reverse("category-list")
+        etag = auth_client.get(url)["ETag"]
+
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        category.name = "Changed Category"
+        category.save()
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
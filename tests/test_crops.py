@@ -1,5 +1,11 @@
+import csv
+import json
+from io import BytesIO, StringIO
+
 import pytest
+from django.db import connection
 from django.urls import reverse
+from openpyxl import load_workbook
 
 from crops.models import Crop, CropCategory
 
@@ -169,6 +175,87 @@ class TestCropEndpoints:
         assert data["count"] >= 1
         assert any("Test Wheat" in r["name"] for r in data["results"])
 
+    def test_fulltext_search_ranks_results(self, auth_client, category):
+        """Full-text search matches descriptions and ranks name matches first."""
+        Crop.objects.create(
+            name="Fulltext Sorghum",
+            scientific_name="Sorghum bicolor",
+            category=category,
+            description="Drought tolerant grain.",
+            growth_duration_days=110,
+            water_requirements="low",
+        )
+        Crop.objects.create(
+            name="Fulltext Millet",
+            scientific_name="Pennisetum glaucum",
+            category=category,
+            description="Often grown alongside sorghum.",
+            growth_duration_days=80,
+            water_requirements="low",
+        )
+
+        response = auth_client.get(self.list_url, {"search": "sorghum", "search_mode": "fulltext"})
+        names = [r["name"] for r in response.json()["results"]]
+
+        assert response.status_code == 200
+        assert names == ["Fulltext Sorghum", "Fulltext Millet"]
+
+    def test_fulltext_search_tracks_updates(self, auth_client, crop):
+        """The search vector follows edits to the crop."""
+        crop.description = "Resistant to rust fungus."
+        crop.save()
+
+        response = auth_client.get(self.list_url, {"search": "fungus", "search_mode": "fulltext"})
+
+        assert [r["id"] for r in response.json()["results"]] == [crop.id]
+
+    def test_invalid_search_mode(self, auth_client, crop):
+        """An unknown search mode returns 400."""
+        response = auth_client.get(self.list_url, {"search": "wheat", "search_mode": "magic"})
+
+        assert response.status_code == 400
+
+    def test_fuzzy_search_tolerates_typos(self, auth_client, category):
+        """Misspelled scientific names still find the crop, most similar first."""
+        wheat = Crop.objects.create(
+            name="Fuzzy Wheat",
+            scientific_name="Triticum aestivum",
+            category=category,
+            growth_duration_days=120,
+            water_requirements="medium",
+        )
+        durum = Crop.objects.create(
+            name="Fuzzy Durum",
+            scientific_name="Triticum durum",
+            category=category,
+            growth_duration_days=120,
+            water_requirements="medium",
+        )
+
+        response = auth_client.get(self.list_url, {"fuzzy": "Tritcum aestivm"})
+
+        assert response.status_code == 200
+        assert [r["id"] for r in response.json()["results"]] == [wheat.id]
+
+        assert durum.id not in [r["id"] for r in response.json()["results"]]
+        strict = auth_client.get(self.list_url, {"fuzzy": "Tritcum aestivm", "fuzzy_threshold": 0.9})
+        assert strict.json()["results"] == []
+
+    def test_fuzzy_threshold_leaves_the_session_alone(self, auth_client, crop):
+        """A request's threshold is not left on the connection for the next request."""
+        auth_client.get(self.list_url, {"fuzzy": "wheat", "fuzzy_threshold": 0.9})
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT show_limit()")
+            assert cursor.fetchone()[0] == pytest.approx(0.3)
+
+    @pytest.mark.parametrize("threshold", [2, 0.2, "x"])
+    def test_fuzzy_threshold_is_validated(self, auth_client, crop, threshold):
+        """A threshold above 1, below the index-backed 0.3, or not a number returns 400."""
+        response = auth_client.get(self.list_url, {"fuzzy": "wheat", "fuzzy_threshold": threshold})
+
+        assert response.status_code == 400
+
     def test_export_crops_excel(self, auth_client, crop):
         """Export endpoint returns an Excel file."""
         url = reverse("crop-export-crops")
@@ -182,6 +269,66 @@ class TestCropEndpoints:
         assert "crops_export_" in response["Content-Disposition"]
         assert response["Content-Disposition"].endswith('.xlsx"')
 
+    def test_export_crops_streams_rows(self, auth_client, crop):
+        """Export is streamed and contains a header row plus one row per crop."""
+        url = reverse("crop-export-crops")
+        response = auth_client.get(url)
+
+        assert response.streaming
+        workbook = load_workbook(BytesIO(b"".join(response.streaming_content)), read_only=True)
+        rows = list(workbook["Crops"].iter_rows(values_only=True))
+        assert rows[0][:3] == ("ID", "Name", "Scientific Name")
+        assert (crop.id, crop.name, crop.scientific_name, crop.category.name) in [
+            row[:4] for row in rows[1:]
+        ]
+
+    def test_export_csv_applies_filters_and_columns(self, auth_client, category):
+        """CSV export honours list filters and only contains the requested columns."""
+        Crop.objects.create(
+            name="Export High",
+            scientific_name="Exporthigh testus",
+            category=category,
+            growth_duration_days=150,
+            water_requirements="high",
+        )
+        Crop.objects.create(
+            name="Export Low",
+            scientific_name="Exportlow testus",
+            category=category,
+            growth_duration_days=70,
+            water_requirements="low",
+        )
+        url = reverse("crop-export-crops")
+        response = auth_client.get(
+            url,
+            {"format": "csv", "columns": "name,category", "water_requirements": "high"},
+        )
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/csv")
+        assert response["Content-Disposition"].endswith('.csv"')
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(StringIO(content)))
+        assert rows[0] == ["name", "category"]
+        assert ["Export High", category.name] in rows
+        assert ["Export Low", category.name] not in rows
+
+    def test_export_ndjson(self, auth_client, crop):
+        """NDJSON export emits one JSON object per crop keyed by column."""
+        url = reverse("crop-export-crops")
+        response = auth_client.get(url, {"format": "ndjson", "columns": "id,name", "search": crop.name})
+
+        assert response.status_code == 200
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [{"id": crop.id, "name": crop.name}]
+
+    def test_export_rejects_unknown_column(self, auth_client, crop):
+        """Unknown export columns or formats return 400."""
+        url = reverse("crop-export-crops")
+
+        assert auth_client.get(url, {"columns": "name,secret"}).status_code == 400
+        assert auth_client.get(url, {"format": "pdf"}).status_code == 400
+
     def test_filter_by_category(self, auth_client, category):
         """Filter crops by category ID returns only matching crops."""
         other_category = CropCategory.objects.create(name="Test Filter Legumes")
@@ -0,0 +1,156 @@
+import threading
+from functools import partial
+
+import psycopg2
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.urls import reverse
+
+from cropscience.db.pool import ConnectionPool, PoolTimeout, pool_stats
+
+pooled = pytest.mark.skipif(not settings.DATABASES["default"].get("POOL"), reason="DB_POOL is off")
+
+
+@pytest.fixture
+def make_pool(db):
+    """Factory for pools connecting to the test database; closed after the test."""
+    pools = []
+
+    def _make_pool(**options):
+        pool = ConnectionPool(**options)
+        pools.append(pool)
+        return pool
+
+    yield _make_pool
+    for pool in pools:
+        pool.close()
+
+
+@pytest.fixture
+def connect(db):
+    """Open a raw psycopg2 connection to the test database."""
+    return partial(psycopg2.connect, **connection.get_connection_params())
+
+
+class TestConnectionPool:
+    """Tests for the per-process connection pool."""
+
+    def test_returned_connection_is_reused(self, make_pool, connect):
+        """A returned connection is handed out again instead of opening another."""
+        pool = make_pool()
+        conn = pool.getconn(connect)
+        pool.putconn(conn)
+
+        assert pool.getconn(connect) is conn
+        assert pool.stats()["created"] == 1
+        assert pool.stats()["in_use"] == 1
+
+    def test_full_pool_times_out(self, make_pool, connect):
+        """Callers beyond ``max_size`` wait, then fail once the timeout passes."""
+        pool = make_pool(max_size=1, timeout=0.05)
+        pool.getconn(connect)
+
+        with pytest.raises(PoolTimeout):
+            pool.getconn(connect)
+        assert pool.stats()["timeouts"] == 1
+
+    def test_waiter_gets_returned_connection(self, make_pool, connect):
+        """A waiting caller receives the next returned connection and its wait is recorded."""
+        pool = make_pool(max_size=1, timeout=5)
+        conn = pool.getconn(connect)
+        timer = threading.Timer(0.1, pool.putconn, [conn])
+        timer.start()
+
+        assert pool.getconn(connect) is conn
+        timer.join()
+        assert pool.stats()["wait_max_ms"] >= 50
+
+    def test_open_transaction_is_rolled_back(self, make_pool, connect):
+        """Connections come back from the pool outside any transaction."""
+        pool = make_pool()
+        conn = pool.getconn(connect)
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        assert conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+
+        pool.putconn(conn)
+
+        assert pool.getconn(connect).info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def test_session_state_is_discarded(self, make_pool, connect):
+        """Settings, temporary tables and advisory locks do not outlive a borrow."""
+        pool = make_pool()
+        conn = pool.getconn(connect)
+        with conn.cursor() as cursor:
+            cursor.execute("SET statement_timeout = '1234ms'")
+            cursor.execute("CREATE TEMPORARY TABLE pool_leftover (id int)")
+            cursor.execute("SELECT pg_advisory_lock(4242)")
+        conn.commit()
+
+        pool.putconn(conn)
+
+        reused = pool.getconn(connect)
+        assert reused is conn
+        with reused.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            assert cursor.fetchone()[0] == "0"
+            cursor.execute("SELECT to_regclass('pool_leftover')")
+            assert cursor.fetchone()[0] is None
+            cursor.execute("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()")
+            assert cursor.fetchone()[0] == 0
+
+    def test_dead_connection_is_replaced(self, make_pool, connect):
+        """The health check swaps a connection the server dropped for a new one."""
+        pool = make_pool(check=True)
+        conn = pool.getconn(connect)
+        pool.putconn(conn)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [conn.info.backend_pid])
+
+        replacement = pool.getconn(connect)
+
+        assert replacement is not conn
+        assert pool.stats()["discarded"] == 1
+        assert pool.stats()["size"] == 1
+
+    def test_old_connections_are_not_reused(self, make_pool, connect):
+        """Connections past ``max_lifetime`` are closed when returned."""
+        pool = make_pool(max_lifetime=0)
+        conn = pool.getconn(connect)
+        pool.putconn(conn)
+
+        assert conn.closed
+        assert pool.stats()["size"] == 0
+
+
+@pytest.mark.django_db
+class TestDatabaseHealthView:
+    """Tests for the database health and pool statistics endpoint."""
+
+    url = reverse("health-database")
+
+    @pooled
+    def test_staff_see_pool_stats(self, auth_client, user):
+        """Staff get the database latency and the default alias's pool."""
+        user.is_staff = True
+        user.save()
+
+        response = auth_client.get(self.url)
+
+        assert response.status_code == 200
+        assert response.json()["databases"]["default"]["status"] == "ok"
+        assert "default" in {pool["alias"] for pool in response.json()["pools"]}
+        assert {"in_use", "waiting", "wait_avg_ms"} <= set(response.json()["pools"][0])
+
+    def test_requires_staff(self, auth_client):
+        """Regular users are refused."""
+        assert auth_client.get(self.url).status_code == 403
+
+    @pooled
+    def test_backend_borrows_from_pool(self):
+        """With ``POOL`` configured the default connection comes from a pool."""
+        connection.ensure_connection()
+
+        assert connection.pool is not None
+        assert any(pool["alias"] == "default" for pool in pool_stats())
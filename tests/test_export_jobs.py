@@ -0,0 +1,232 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from crops import jobs
+from crops.jobs import STALE_JOB_ERROR, expire_jobs, fail_stale_jobs, run_export_job
+from crops.models import Crop, ExportJob
+
+
+def wait_for_job(client, job_id, timeout=10):
+    """Poll the job resource until it leaves the pending/running states."""
+    url = reverse("export-job-detail", args=[job_id])
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        data = client.get(url).json()
+        if data["status"] in (ExportJob.Status.SUCCEEDED, ExportJob.Status.FAILED):
+            return data
+        time.sleep(0.05)
+    raise AssertionError(f"Export job {job_id} did not finish in {timeout}s.")
+
+
+@pytest.fixture
+def export_root(settings, tmp_path):
+    """Write export files to a temporary directory."""
+    settings.EXPORT_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExportJobEndpoints:
+    """Tests for /api/crops/crops/export-jobs/."""
+
+    list_url = reverse("export-job-list")
+
+    def test_job_builds_filtered_file(self, auth_client, crop, export_root):
+        """A job applies the list filters, reports progress and can be downloaded."""
+        Crop.objects.create(
+            name="Job Low",
+            scientific_name="Joblow testus",
+            category=crop.category,
+            growth_duration_days=70,
+            water_requirements="low",
+        )
+        payload = {"format": "csv", "columns": "name", "water_requirements": "medium"}
+        response = auth_client.post(self.list_url, payload, format="json")
+
+        assert response.status_code == 202
+        job = wait_for_job(auth_client, response.json()["id"])
+        assert job["status"] == "succeeded"
+        assert job["rows_written"] == job["rows_total"] == 1
+        assert job["progress"] == 1.0
+
+        download = auth_client.get(job["download_url"])
+        assert download.status_code == 200
+        assert b"".join(download.streaming_content).decode().splitlines() == ["name", crop.name]
+
+    def test_download_supports_range(self, auth_client, crop, export_root):
+        """A Range request returns 206 with only the requested bytes."""
+        response = auth_client.post(self.list_url, {"format": "csv"}, format="json")
+        job = wait_for_job(auth_client, response.json()["id"])
+        url = reverse("export-job-download", args=[job["id"]])
+        full = b"".join(auth_client.get(url).streaming_content)
+
+        partial = auth_client.get(url, HTTP_RANGE="bytes=5-")
+        assert partial.status_code == 206
+        assert partial["Content-Range"] == f"bytes 5-{len(full) - 1}/{len(full)}"
+        assert b"".join(partial.streaming_content) == full[5:]
+
+        stale = auth_client.get(url, HTTP_RANGE="bytes=5-", HTTP_IF_RANGE='"stale"')
+        assert stale.status_code == 200
+
+        beyond = auth_client.get(url, HTTP_RANGE=f"bytes={len(full)}-")
+        assert beyond.status_code == 416
+
+    def test_identical_export_is_deduplicated_until_data_changes(self, auth_client, crop, export_root):
+        """Repeating an export reuses the job until a crop changes."""
+        payload = {"format": "ndjson", "category": crop.category.id}
+        first = auth_client.post(self.list_url, payload, format="json").json()
+        wait_for_job(auth_client, first["id"])
+
+        repeat = auth_client.post(self.list_url, payload, format="json")
+        assert repeat.status_code == 200
+        assert repeat.json()["id"] == first["id"]
+
+        crop.growth_duration_days += 1
+        crop.save()
+        changed = auth_client.post(self.list_url, payload, format="json")
+        assert changed.status_code == 202
+        assert changed.json()["id"] != first["id"]
+        wait_for_job(auth_client, changed.json()["id"])
+
+    def test_stale_job_is_failed_and_built_again(self, auth_client, crop, export_root, settings):
+        """A job left running by a stopped process is failed and replaced, not returned."""
+        payload = {"format": "csv", "category": crop.category.id}
+        first = auth_client.post(self.list_url, payload, format="json").json()
+        wait_for_job(auth_client, first["id"])
+        # As a process that died mid-build leaves it.
+        ExportJob.objects.filter(pk=first["id"]).update(
+            status=ExportJob.Status.RUNNING,
+            heartbeat_at=timezone.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS + 1),
+        )
+
+        repeat = auth_client.post(self.list_url, payload, format="json")
+
+        assert repeat.status_code == 202
+        assert repeat.json()["id"] != first["id"]
+        assert wait_for_job(auth_client, repeat.json()["id"])["status"] == ExportJob.Status.SUCCEEDED
+        stale = ExportJob.objects.get(pk=first["id"])
+        assert (stale.status, stale.error) == (ExportJob.Status.FAILED, STALE_JOB_ERROR)
+
+    def test_job_failed_as_stale_while_running_stays_failed(self, crop, export_root, monkeypatch):
+        """A job swept as stale mid-build is not switched back to succeeded when it finishes."""
+        job = ExportJob.objects.create(params={"format": "csv"}, fingerprint="4" * 64)
+        iter_export = jobs.iter_export
+
+        def swept_mid_build(*args, **kwargs):
+            """Fail the job as the sweep would, then write the file as usual."""
+            ExportJob.objects.filter(pk=job.pk).update(status=ExportJob.Status.FAILED, error=STALE_JOB_ERROR)
+            yield from iter_export(*args, **kwargs)
+
+        monkeypatch.setattr(jobs, "iter_export", swept_mid_build)
+        run_export_job(job.pk)
+
+        job.refresh_from_db()
+        assert (job.status, job.error) == (ExportJob.Status.FAILED, STALE_JOB_ERROR)
+
+    def test_sweep_fails_only_stale_jobs(self, settings):
+        """The sweep fails unfinished jobs past the heartbeat timeout and leaves the rest."""
+        old = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS + 1)
+        stale = ExportJob.objects.create(params={"format": "csv"}, fingerprint="1" * 64, heartbeat_at=old)
+        live = ExportJob.objects.create(params={"format": "csv"}, fingerprint="2" * 64)
+        done = ExportJob.objects.create(
+            params={"format": "csv"}, fingerprint="3" * 64, heartbeat_at=old, status=ExportJob.Status.SUCCEEDED
+        )
+
+        assert fail_stale_jobs() == 1
+
+        statuses = dict(ExportJob.objects.values_list("pk", "status"))
+        assert statuses == {
+            stale.pk: ExportJob.Status.FAILED,
+            live.pk: ExportJob.Status.PENDING,
+            done.pk: ExportJob.Status.SUCCEEDED,
+        }
+
+    def test_invalid_parameters_are_rejected(self, auth_client, export_root):
+        """Unknown columns and invalid filters return 400 without creating a job."""
+        assert auth_client.post(self.list_url, {"columns": "secret"}, format="json").status_code == 400
+        assert auth_client.post(self.list_url, {"category": "abc"}, format="json").status_code == 400
+        assert not ExportJob.objects.exists()
+
+    def test_download_before_finish_conflicts(self, auth_client, user, export_root):
+        """Downloading an unfinished job returns 409."""
+        job = ExportJob.objects.create(params={"format": "csv"}, fingerprint="0" * 64, owner=user)
+        response = auth_client.get(reverse("export-job-download", args=[job.id]))
+
+        assert response.status_code == 409
+
+    def test_jobs_are_private_to_their_owner(self, auth_client, create_user, crop, export_root):
+        """Other users can neither list, count, poll nor download a job."""
+        created = auth_client.post(self.list_url, {"format": "csv"}, format="json")
+        job = wait_for_job(auth_client, created.json()["id"])
+        other = APIClient()
+        other.force_authenticate(create_user(username="other", email="other@example.com"))
+
+        assert auth_client.get(self.list_url).json()["count"] == 1
+        listed = other.get(self.list_url).json()
+        assert (listed["count"], listed["results"]) == (0, [])
+        assert other.get(reverse("export-job-detail", args=[job["id"]])).status_code == 404
+        assert other.get(reverse("export-job-download", args=[job["id"]])).status_code == 404
+
+    def test_identical_export_of_another_user_shares_only_the_file(
+        self, auth_client, user, create_user, crop, export_root
+    ):
+        """A second user gets a job of their own, finished at once, pointing at the built file."""
+        created = auth_client.post(self.list_url, {"format": "csv"}, format="json")
+        first = wait_for_job(auth_client, created.json()["id"])
+        downloaded = b"".join(auth_client.get(first["download_url"]).streaming_content)
+        other_user = create_user(username="other", email="other@example.com")
+        other = APIClient()
+        other.force_authenticate(other_user)
+
+        response = other.post(self.list_url, {"format": "csv"}, format="json")
+
+        assert response.status_code == 200
+        shared = response.json()
+        assert shared["id"] != first["id"]
+        assert shared["status"] == ExportJob.Status.SUCCEEDED
+        assert ExportJob.objects.get(pk=shared["id"]).owner == other_user
+        assert b"".join(other.get(shared["download_url"]).streaming_content) == downloaded
+
+    def test_superseded_export_is_expired_and_deleted(self, auth_client, crop, export_root):
+        """Once the data changes, the sweep expires a finished job and deletes its file."""
+        created = auth_client.post(self.list_url, {"format": "csv"}, format="json")
+        job = wait_for_job(auth_client, created.json()["id"])
+        path = ExportJob.objects.get(pk=job["id"]).file_path
+        assert expire_jobs() == 0
+
+        crop.growth_duration_days += 1
+        crop.save()
+
+        assert expire_jobs() == 1
+        assert not path.exists()
+        assert ExportJob.objects.get(pk=job["id"]).status == ExportJob.Status.EXPIRED
+        assert auth_client.get(reverse("export-job-download", args=[job["id"]])).status_code == 410
+        again = auth_client.post(self.list_url, {"format": "csv"}, format="json")
+        assert again.status_code == 202
+
+    def test_old_export_keeps_a_file_another_job_still_uses(
+        self, auth_client, create_user, crop, export_root, settings
+    ):
+        """An export past its retention expires, but its shared file stays while a newer job uses it."""
+        created = auth_client.post(self.list_url, {"format": "csv"}, format="json")
+        first = wait_for_job(auth_client, created.json()["id"])
+        other = APIClient()
+        other.force_authenticate(create_user(username="other", email="other@example.com"))
+        shared = other.post(self.list_url, {"format": "csv"}, format="json").json()
+        ExportJob.objects.filter(pk=first["id"]).update(
+            finished_at=timezone.now() - timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS, seconds=1)
+        )
+
+        assert expire_jobs() == 1
+
+        assert ExportJob.objects.get(pk=first["id"]).status == ExportJob.Status.EXPIRED
+        assert ExportJob.objects.get(pk=shared["id"]).file_path.exists()
+        assert other.get(shared["download_url"]).status_code == 200
+
+        assert expire_jobs(now=timezone.now() + timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS, seconds=1)) == 1
+        assert not ExportJob.objects.get(pk=shared["id"]).file_path.exists()
@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crops.models import Crop
+
+
+def main_query(queries, table):
+    """Return the SQL of the last query reading ``table``; counts and validators run first."""
+    matching = [q["sql"] for q in queries if f'FROM "{table}"' in q["sql"]]
+    assert matching
+    return matching[-1]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Tests for ?fields= / ?omit= on crop and category endpoints."""
+
+    list_url = reverse("crop-list")
+
+    def test_list_fields_trim_output_and_query(self, auth_client, crop):
+        """Only the requested fields are returned and selected."""
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(self.list_url, {"fields": "id,name"})
+
+        assert response.status_code == 200
+        assert response.json()["results"] == [{"id": crop.id, "name": crop.name}]
+        sql = main_query(queries, "crops_crop")
+        assert '"crops_crop"."scientific_name"' not in sql
+        assert '"crops_crop"."description"' not in sql
+
+    def test_detail_without_category_skips_join(self, auth_client, crop):
+        """Omitting the nested category drops the join and the description column."""
+        url = reverse("crop-detail", args=[crop.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(url, {"omit": "category,description"})
+
+        assert response.status_code == 200
+        assert "category" not in response.json()
+        assert "description" not in response.json()
+        sql = main_query(queries, "crops_crop")
+        assert "JOIN" not in sql
+        assert '"crops_crop"."description"' not in sql
+
+    def test_detail_with_category_keeps_join(self, auth_client, crop):
+        """Requesting the nested category still loads it with the crop."""
+        url = reverse("crop-detail", args=[crop.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(url, {"fields": "name,category"})
+
+        assert response.json() == {
+            "name": crop.name,
+            "category": {
+                "id": crop.category.id,
+                "name": crop.category.name,
+                "description": crop.category.description,
+                "created_at": response.json()["category"]["created_at"],
+            },
+        }
+        assert "JOIN" in main_query(queries, "crops_crop")
+
+    def test_cursor_pages_without_ordering_field(self, auth_client, crop):
+        """Keyset cursors work when neither id nor the ordering field is returned."""
+        params = {"pagination": "cursor", "page_size": 1, "fields": "scientific_name", "ordering": "name"}
+        Crop.objects.create(
+            name="Zz Rye",
+            scientific_name="Secale zz",
+            category=crop.category,
+            growth_duration_days=100,
+            water_requirements="low",
+        )
+        first = auth_client.get(self.list_url, params).json()
+        second = auth_client.get(first["next"]).json()
+
+        assert first["results"] == [{"scientific_name": crop.scientific_name}]
+        assert second["results"] == [{"scientific_name": "Secale zz"}]
+
+    def test_category_fields_and_etag(self, auth_client, category):
+        """Category lists honour fields, and each selection has its own ETag."""
+        url = reverse("category-list")
+        full = auth_client.get(url)
+        trimmed = auth_client.get(url, {"fields": "name"})
+
+        assert trimmed.json()["results"] == [{"name": category.name}]
+        assert full["ETag"] != trimmed["ETag"]
+
+    def test_unknown_field_is_rejected(self, auth_client, crop):
+        """Unknown field names answer 400 naming the parameter."""
+        response = auth_client.get(self.list_url, {"omit": "colour"})
+
+        assert response.status_code == 400
+        assert "omit" in response.json()
@@ -0,0 +1,151 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from crops.imports import BATCH_REJECTED_ERROR, import_crops
+from crops.models import Crop, CropCategory
+
+CSV_HEADER = "name,scientific_name,category,description,growth_duration_days,water_requirements\n"
+
+# Values of a valid imported row, before choosing its name and category.
+IMPORT_ROW = {
+    "scientific_name": "Secale importus",
+    "description": "",
+    "growth_duration_days": 110,
+    "water_requirements": "medium",
+}
+
+
+def csv_upload(*lines, name="crops.csv"):
+    """Return an uploaded CSV file with the export header and ``lines``."""
+    return SimpleUploadedFile(name, (CSV_HEADER + "".join(f"{line}\n" for line in lines)).encode())
+
+
+@pytest.mark.django_db
+class TestCropImport:
+    """Tests for /api/crops/crops/import/ and the import_crops command."""
+
+    url = reverse("crop-import-crops")
+
+    def test_csv_import_upserts_on_natural_key(self, auth_client, crop, category):
+        """Rows matching an existing crop update it; new rows are created."""
+        upload = csv_upload(
+            f"{crop.name},{crop.scientific_name},{category.name},Updated,90,low",
+            f"Import Rye,Secale importus,{category.name},,110,medium",
+        )
+        response = auth_client.post(self.url, {"file": upload}, format="multipart")
+
+        assert response.status_code == 200
+        assert response.json() == {"rows": 2, "written": 2, "error_count": 0, "errors": [], "dry_run": False}
+        crop.refresh_from_db()
+        assert (crop.description, crop.growth_duration_days, crop.water_requirements) == ("Updated", 90, "low")
+        assert Crop.objects.get(name="Import Rye").category == category
+        assert Crop.objects.count() == 2
+
+    def test_excel_export_round_trips(self, auth_client, crop):
+        """A workbook produced by the export imports back without changes."""
+        export = auth_client.get(reverse("crop-export-crops"))
+        upload = SimpleUploadedFile("crops.xlsx", b"".join(export.streaming_content))
+        Crop.objects.filter(pk=crop.pk).update(growth_duration_days=1)
+
+        response = auth_client.post(self.url, {"file": upload}, format="multipart")
+
+        assert response.status_code == 200
+        assert response.json()["written"] == 1
+        assert Crop.objects.get().growth_duration_days == crop.growth_duration_days
+
+    def test_atomic_import_reports_row_errors_and_writes_nothing(self, auth_client, category):
+        """Invalid rows are reported by spreadsheet row and roll the import back."""
+        upload = csv_upload(
+            f"Import Rye,Secale importus,{category.name},,110,medium",
+            "Import Oat,Avena importus,Unknown,,100,medium",
+            f"Import Pea,Pisum importus,{category.name},,soon,flood",
+        )
+        response = auth_client.post(self.url, {"file": upload}, format="multipart")
+
+        assert response.status_code == 400
+        body = response.json()
+        assert (body["written"], body["error_count"]) == (0, 2)
+        assert [error["row"] for error in body["errors"]] == [3, 4]
+        assert set(body["errors"][1]["errors"]) == {"growth_duration_days", "water_requirements"}
+        assert not Crop.objects.exists()
+
+    def test_best_effort_import_keeps_valid_rows(self, auth_client, category):
+        """best_effort writes the valid rows and answers 207."""
+        upload = csv_upload(
+            f"Import Rye,Secale importus,{category.name},,110,medium",
+            "Import Oat,Avena importus,Unknown,,100,medium",
+        )
+        response = auth_client.post(f"{self.url}?mode=best_effort", {"file": upload}, format="multipart")
+
+        assert response.status_code == 207
+        assert response.json()["written"] == 1
+        assert Crop.objects.filter(name="Import Rye").exists()
+
+    def test_best_effort_reports_a_rejected_batch_per_row(self, category):
+        """A batch the database refuses becomes row errors; other batches are kept."""
+        doomed = CropCategory.objects.create(name="Doomed")
+
+        def rows():
+            yield 2, {**IMPORT_ROW, "name": "Kept Rye", "category": category.name}
+            # Deleted after the categories were loaded, as a concurrent request might.
+            doomed.delete()
+            yield 3, {**IMPORT_ROW, "name": "Lost Rye", "category": doomed.name}
+            yield 4, {**IMPORT_ROW, "name": "Lost Oat", "category": doomed.name}
+
+        with connection.cursor() as cursor:
+            # Foreign keys are checked at commit, which tests never reach.
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        report = import_crops(rows(), atomic=False, batch_size=1)
+
+        assert (report["written"], report["error_count"]) == (1, 2)
+        assert report["errors"] == [
+            {"row": 3, "errors": BATCH_REJECTED_ERROR},
+            {"row": 4, "errors": BATCH_REJECTED_ERROR},
+        ]
+        assert list(Crop.objects.values_list("name", flat=True)) == ["Kept Rye"]
+
+    def test_dry_run_validates_without_writing(self, auth_client, category):
+        """dry_run reports errors but never writes."""
+        upload = csv_upload(
+            f"Import Rye,Secale importus,{category.name},,110,medium",
+            f"Import Oat,Avena importus,{category.name},,-,medium",
+        )
+        response = auth_client.post(f"{self.url}?dry_run=true", {"file": upload}, format="multipart")
+
+        assert response.status_code == 200
+        assert response.json()["dry_run"] is True
+        assert response.json()["error_count"] == 1
+        assert not Crop.objects.exists()
+
+    def test_rejects_unsupported_and_malformed_files(self, auth_client):
+        """Unknown file types, missing columns and broken workbooks are rejected."""
+        bad_files = [
+            SimpleUploadedFile("crops.txt", b"name\n"),
+            SimpleUploadedFile("crops.csv", b"name,category\nRye,Cereals\n"),
+            SimpleUploadedFile("crops.xlsx", b"not a zip"),
+        ]
+        for upload in bad_files:
+            response = auth_client.post(self.url, {"file": upload}, format="multipart")
+            assert response.status_code == 400
+            assert "file" in response.json()
+
+    def test_management_command(self, tmp_path, category):
+        """The command imports a file from disk and reports throughput."""
+        path = tmp_path / "crops.csv"
+        path.write_bytes(csv_upload(f"Import Rye,Secale importus,{category.name},,110,medium").read())
+        out = StringIO()
+
+        call_command("import_crops", str(path), stdout=out)
+
+        assert "1 rows read, 1 written, 0 invalid" in out.getvalue()
+        assert Crop.objects.filter(name="Import Rye").exists()
+
+    def test_unauthenticated_access_denied(self, api_client):
+        """Imports require authentication."""
+        response = api_client.post(self.url, {"file": BytesIO(b"")}, format="multipart")
+        assert response.status_code == 401
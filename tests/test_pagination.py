@@ -0,0 +1,156 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crops.models import Crop, CropCategory
+from crops.pagination import StandardPagination
+
+
+@pytest.fixture
+def many_crops(category):
+    """Create crops whose ordering fields contain plenty of ties."""
+    return Crop.objects.bulk_create(
+        Crop(
+            name=f"Keyset {i % 4}",
+            scientific_name=f"Keysetus {i}",
+            category=category,
+            growth_duration_days=60 + i % 3,
+            water_requirements="low",
+        )
+        for i in range(23)
+    )
+
+
+def walk(client, url, params, link="next"):
+    """Follow ``link`` from ``url`` and return the IDs of every page, in order."""
+    pages = []
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == 200
+        data = response.json()
+        pages.append([row["id"] for row in data["results"]])
+        if not data[link]:
+            return pages, data
+        response = client.get(data[link])
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Tests for ?pagination=cursor on /api/crops/crops/."""
+
+    list_url = reverse("crop-list")
+
+    @pytest.mark.parametrize(
+        "ordering",
+        ["name", "-name", "growth_duration_days", "-growth_duration_days", "created_at", "-created_at"],
+    )
+    def test_pages_cover_every_row_once(self, auth_client, many_crops, ordering):
+        """Walking forward visits every row exactly once in ordering order."""
+        params = {"pagination": "cursor", "page_size": 5, "ordering": ordering}
+        pages, _ = walk(auth_client, self.list_url, params)
+
+        ids = [pk for page in pages for pk in page]
+        field = ordering.lstrip("-")
+        expected = sorted(many_crops, key=lambda crop: (getattr(crop, field), crop.id))
+        if ordering.startswith("-"):
+            expected.reverse()
+        assert ids == [crop.id for crop in expected]
+        assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+
+    def test_previous_links_walk_back(self, auth_client, many_crops):
+        """Following previous links from the last page returns the same pages."""
+        params = {"pagination": "cursor", "page_size": 5, "ordering": "growth_duration_days"}
+        forward, last = walk(auth_client, self.list_url, params)
+        backward, _ = walk(auth_client, last["previous"], {}, link="previous")
+
+        assert backward == forward[-2::-1]
+
+    def test_rows_inserted_mid_walk_do_not_shift_pages(self, auth_client, many_crops, category):
+        """An insert before the cursor does not repeat rows on the next page."""
+        params = {"pagination": "cursor", "page_size": 5}
+        first = auth_client.get(self.list_url, params).json()
+        Crop.objects.create(
+            name="Keyset 0",
+            scientific_name="Keysetus early",
+            category=category,
+            growth_duration_days=60,
+            water_requirements="low",
+        )
+        second = auth_client.get(first["next"]).json()
+
+        assert not {row["id"] for row in first["results"]} & {row["id"] for row in second["results"]}
+        assert "count" not in second
+
+    def test_page_number_mode_stays_default(self, auth_client, many_crops):
+        """Without opting in, the list keeps page-number pagination."""
+        data = auth_client.get(self.list_url).json()
+
+        assert data["count"] == len(many_crops)
+
+    def test_invalid_cursor(self, auth_client, many_crops):
+        """A malformed or mismatched cursor returns 404."""
+        assert auth_client.get(self.list_url, {"cursor": "garbage"}).status_code == 404
+
+        first = auth_client.get(self.list_url, {"pagination": "cursor", "ordering": "name"}).json()
+        mismatched = auth_client.get(first["next"] + "&ordering=-created_at")
+        assert mismatched.status_code == 404
+
+
+@pytest.mark.django_db
+class TestApproximateCounts:
+    """Tests for estimated and cached counts in page-number mode."""
+
+    list_url = reverse("crop-list")
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start every test with an empty count cache."""
+        cache.clear()
+
+    def test_small_unfiltered_count_is_exact(self, auth_client, many_crops):
+        """Below the estimate threshold the count is exact and flagged as such."""
+        data = auth_client.get(self.list_url).json()
+
+        assert data["count"] == len(many_crops)
+        assert data["count_estimated"] is False
+
+    def test_large_unfiltered_count_is_estimated(self, auth_client, many_crops, monkeypatch):
+        """Above the threshold an unfiltered list reports the planner estimate."""
+        monkeypatch.setattr(StandardPagination, "estimate_count_threshold", 0)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {CropCategory._meta.db_table}")
+
+        data = auth_client.get(reverse("category-list")).json()
+
+        assert data["count_estimated"] is True
+        assert data["count"] == CropCategory.objects.count()
+
+    def test_filtered_count_is_cached_until_data_changes(
+        self, auth_client, many_crops, category, django_assert_num_queries
+    ):
+        """A repeated filtered list skips COUNT(*) until a crop changes."""
+        params = {"category": category.id, "water_requirements": "low"}
+        first = auth_client.get(self.list_url, params).json()
+
+        with django_assert_num_queries(2):
+            # Data version and page rows; no COUNT(*), and the user is cached.
+            repeat = auth_client.get(self.list_url, {**params, "page": 2}).json()
+
+        assert first["count"] == repeat["count"] == len(many_crops)
+        assert repeat["count_estimated"] is False
+
+        many_crops[0].delete()
+        assert auth_client.get(self.list_url, params).json()["count"] == len(many_crops) - 1
+
+    def test_fieldsets_share_the_cached_count(self, auth_client, many_crops, category):
+        """Projecting other fields of the same filtered list reuses its count."""
+        params = {"category": category.id, "water_requirements": "low"}
+        auth_client.get(self.list_url, {**params, "fields": "id,name"})
+
+        with CaptureQueriesContext(connection) as queries:
+            data = auth_client.get(self.list_url, {**params, "omit": "created_at"}).json()
+
+        assert data["count"] == len(many_crops)
+        assert not [query for query in queries if "COUNT(" in query["sql"]]
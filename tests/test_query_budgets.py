@@ -0,0 +1,278 @@
+import json
+from collections import Counter
+from typing import NamedTuple
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from crops.models import Crop, CropCategory
+from crops.serializers import CropCategorySerializer
+from crops.views import CropCategoryViewSet
+from users.authentication import user_cache
+
+# (categories, crops per category) of the datasets every budget is checked
+# against; the large one fills a 100-crop page and several category pages.
+SMALL_DATASET = (2, 3)
+LARGE_DATASET = (12, 15)
+
+
+class Budget(NamedTuple):
+    """Most queries and rows one request may cost.
+
+    ``rows`` counts rows returned or written by every statement, plus
+    ``rows_per_crop`` for each crop in the dataset, for endpoints whose
+    output grows with it.
+    """
+
+    queries: int
+    rows: int
+    rows_per_crop: int = 0
+
+
+def body(**data):
+    """Encode a JSON request body."""
+    return {"data": json.dumps(data), "content_type": "application/json"}
+
+
+def new_user_body(seeded):
+    """Registration body for a user not registered yet."""
+    seeded["registrations"] += 1
+    name = f"budget-user-{seeded['registrations']}"
+    return body(username=name, email=f"{name}@example.com", password="StrongPass1!", password2="StrongPass1!")
+
+
+def refresh_body(seeded):
+    """Body carrying a fresh refresh token for the test user."""
+    return body(refresh=str(RefreshToken.for_user(seeded["user"])))
+
+
+def crop_body(seeded):
+    """Body creating a crop with a name not used yet."""
+    seeded["created"] += 1
+    return body(
+        name=f"Budget crop {seeded['created']}",
+        scientific_name="Budgetus",
+        category_id=seeded["category"].id,
+        growth_duration_days=90,
+        water_requirements="low",
+    )
+
+
+# Endpoint -> (method, URL name, object whose id is in the URL, query parameters, body).
+ENDPOINTS = {
+    "crops.list": ("get", "crop-list", None, {}, None),
+    "crops.list.page-50": ("get", "crop-list", None, {"page_size": 50}, None),
+    "crops.list.page-100": ("get", "crop-list", None, {"page_size": 100}, None),
+    "crops.list.cursor": ("get", "crop-list", None, {"pagination": "cursor", "page_size": 50}, None),
+    "crops.list.filtered": (
+        "get",
+        "crop-list",
+        None,
+        {"water_requirements": "low", "search": "budget", "ordering": "-growth_duration_days"},
+        None,
+    ),
+    "crops.list.fields": ("get", "crop-list", None, {"fields": "id,name,category", "page_size": 50}, None),
+    "crops.retrieve": ("get", "crop-detail", "crop", {}, None),
+    "crops.create": ("post", "crop-list", None, {}, crop_body),
+    "crops.update": ("patch", "crop-detail", "crop", {}, lambda seeded: body(growth_duration_days=91)),
+    "crops.statistics": ("get", "crop-statistics", None, {}, None),
+    "crops.export": ("get", "crop-export-crops", None, {"format": "csv"}, None),
+    "categories.list": ("get", "category-list", None, {"page_size": 50}, None),
+    "categories.overview": (
+        "get",
+        "category-list",
+        None,
+        {"page_size": 50, "with_counts": "true", "preview": 5},
+        None,
+    ),
+    "categories.retrieve": ("get", "category-detail", "category", {"with_counts": "true", "preview": 5}, None),
+    "sync": ("get", "sync", None, {"limit": 500}, None),
+    "export-jobs.list": ("get", "export-job-list", None, {}, None),
+    "auth.register": ("post", "auth-register", None, {}, new_user_body),
+    "auth.login": ("post", "auth-login", None, {}, lambda seeded: body(username="testuser", password="TestPass123!")),
+    "auth.refresh": ("post", "auth-token-refresh", None, {}, refresh_body),
+    "auth.logout": ("post", "auth-logout", None, {}, refresh_body),
+}
+
+# Budgets hold what each request costs today on the large dataset. Raise
+# one only when a change needs the extra queries or rows.
+BUDGETS = {
+    "crops.list": Budget(queries=5, rows=15),
+    "crops.list.page-50": Budget(queries=5, rows=55),
+    "crops.list.page-100": Budget(queries=5, rows=105),
+    "crops.list.cursor": Budget(queries=3, rows=54),
+    "crops.list.filtered": Budget(queries=4, rows=14),
+    "crops.list.fields": Budget(queries=5, rows=55),
+    "crops.retrieve": Budget(queries=4, rows=4),
+    "crops.create": Budget(queries=5, rows=4),
+    "crops.update": Budget(queries=4, rows=4),
+    "crops.statistics": Budget(queries=2, rows=37),
+    "crops.export": Budget(queries=2, rows=1, rows_per_crop=1),
+    "categories.list": Budget(queries=5, rows=16),
+    "categories.overview": Budget(queries=6, rows=77),
+    "categories.retrieve": Budget(queries=4, rows=9),
+    "sync": Budget(queries=4, rows=14, rows_per_crop=1),
+    "export-jobs.list": Budget(queries=3, rows=3),
+    "auth.register": Budget(queries=3, rows=2),
+    "auth.login": Budget(queries=2, rows=2),
+    "auth.refresh": Budget(queries=8, rows=4),
+    "auth.logout": Budget(queries=3, rows=2),
+}
+
+
+class QueryLog:
+    """Execute wrapper recording each statement with the rows it returned or wrote."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        cursor = context["cursor"].cursor
+        query = {"sql": sql, "params": params, "rows": max(cursor.rowcount, 0)}
+        if getattr(cursor, "name", None):
+            # A server-side cursor only reports the rows of its last fetch.
+            query["rows"] = None
+        self.queries.append(query)
+        return result
+
+    def rows(self):
+        """Total rows; server-side cursor queries are counted by re-running them."""
+        total = 0
+        for query in self.queries:
+            if query["rows"] is None:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT count(*) FROM ({query['sql']}) AS q", query["params"])
+                    query["rows"] = cursor.fetchone()[0]
+            total += query["rows"]
+        return total
+
+    def report(self):
+        """List every statement, most repeated first, as N+1 queries repeat one statement."""
+        repeats = Counter(query["sql"] for query in self.queries)
+        lines = [f"{count}x {sql}" for sql, count in repeats.most_common() if count > 1]
+        lines += [f"  [{query['rows']} rows] {query['sql']}" for query in self.queries]
+        return "\n".join(lines)
+
+
+def seed(categories, crops_each, start=0):
+    """Create ``categories`` categories of ``crops_each`` crops, numbered from ``start``."""
+    for i in range(start, start + categories):
+        category = CropCategory.objects.create(name=f"Budget category {i:02d}")
+        Crop.objects.bulk_create(
+            Crop(
+                name=f"Budget crop {i}-{j}",
+                scientific_name=f"Budgetus {i}-{j}",
+                category=category,
+                growth_duration_days=40 + j,
+                water_requirements=["low", "medium", "high"][j % 3],
+            )
+            for j in range(crops_each)
+        )
+
+
+@pytest.fixture
+def seeded(user):
+    """Seed the small dataset; return the objects requests refer to."""
+    seed(*SMALL_DATASET)
+    category = CropCategory.objects.order_by("id").first()
+    return {
+        "user": user,
+        "category": category,
+        "crop": category.crops.order_by("id").first(),
+        "registrations": 0,
+        "created": 0,
+    }
+
+
+def grow(seeded):
+    """Grow the small dataset into the large one."""
+    small_categories, small_crops = SMALL_DATASET
+    large_categories, large_crops = LARGE_DATASET
+    for category in CropCategory.objects.filter(name__startswith="Budget category"):
+        Crop.objects.bulk_create(
+            Crop(
+                name=f"Budget crop {category.id}+{j}",
+                scientific_name=f"Budgetus {category.id}+{j}",
+                category=category,
+                growth_duration_days=40 + j,
+                water_requirements="low",
+            )
+            for j in range(large_crops - small_crops)
+        )
+    seed(large_categories - small_categories, large_crops, start=small_categories)
+
+
+def measure(client, endpoint, seeded):
+    """Send one request to ``endpoint`` with a cold user cache; return its ``QueryLog``."""
+    method, url_name, url_object, params, make_body = ENDPOINTS[endpoint]
+    url = reverse(url_name, args=[seeded[url_object].id] if url_object else [])
+    if params:
+        url += "?" + "&".join(f"{key}={value}" for key, value in params.items())
+    kwargs = make_body(seeded) if make_body else {}
+    user_cache.clear()
+    log = QueryLog()
+    with connection.execute_wrapper(log):
+        response = getattr(client, method)(url, **kwargs)
+        if response.streaming:
+            b"".join(response.streaming_content)
+    assert response.status_code < 400, response.content
+    return log
+
+
+def check_budget(endpoint, log):
+    """Fail with the statements run when ``log`` exceeds the endpoint's budget."""
+    budget = BUDGETS[endpoint]
+    max_rows = budget.rows + budget.rows_per_crop * Crop.objects.count()
+    queries, rows = len(log.queries), log.rows()
+    if queries > budget.queries or rows > max_rows:
+        pytest.fail(
+            f"{endpoint} ran {queries} queries (budget {budget.queries}) "
+            f"returning {rows} rows (budget {max_rows}):\n{log.report()}",
+            pytrace=False,
+        )
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    """Every endpoint stays within its query and row budget at every dataset size."""
+
+    def test_every_endpoint_has_a_budget(self):
+        """New endpoints in the harness need a budget, and budgets an endpoint."""
+        assert set(BUDGETS) == set(ENDPOINTS)
+
+    @pytest.mark.parametrize(
+        "endpoint",
+        [
+            # The feed serves rows once their transaction has finished, which a test transaction never does.
+            pytest.param(endpoint, marks=pytest.mark.django_db(transaction=True)) if endpoint == "sync" else endpoint
+            for endpoint in ENDPOINTS
+        ],
+    )
+    def test_within_budget(self, auth_client, seeded, endpoint):
+        """The query count is within budget and the same on the small and large datasets."""
+        small = measure(auth_client, endpoint, seeded)
+        check_budget(endpoint, small)
+        grow(seeded)
+        large = measure(auth_client, endpoint, seeded)
+        check_budget(endpoint, large)
+
+        assert len(large.queries) == len(small.queries), large.report()
+
+    def test_n_plus_one_is_reported(self, auth_client, seeded, monkeypatch):
+        """A field that queries per category fails with the repeated statement.
+
+        The list is served synchronously, as under WSGI; the async path
+        refuses such queries outright, which fails the request instead.
+        """
+        monkeypatch.setattr(CropCategoryViewSet, "async_actions", ())
+        monkeypatch.setitem(CropCategorySerializer._declared_fields, "crop_total", serializers.SerializerMethodField())
+        monkeypatch.setattr(CropCategorySerializer, "get_crop_total", lambda self, obj: obj.crops.count(), raising=False)
+        monkeypatch.setattr(CropCategorySerializer.Meta, "fields", [*CropCategorySerializer.Meta.fields, "crop_total"])
+        grow(seeded)
+
+        with pytest.raises(pytest.fail.Exception, match=r"(?s)ran \d+ queries.*12x SELECT COUNT\(\*\)"):
+            check_budget("categories.list", measure(auth_client, "categories.list", seeded))
@@ -0,0 +1,126 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crops.models import CropCategory
+
+# Crops seeded for the planner; large enough that a scan or sort is costed as such.
+SEED_ROWS = 20_000
+SEED_CATEGORIES = 5
+# Largest number of rows a plan may read sequentially or sort explicitly.
+ROW_THRESHOLD = 1_000
+
+# Searches find crop 12340, which is in the first category and needs medium
+# water, so every filter combination still has a page to query. Seeded names
+# are all trigram-similar to each other, so it is renamed for the fuzzy search.
+SEARCHES = {
+    "none": {},
+    "plain": {"search": "cropus 12340"},
+    "fulltext": {"search": "cropus 12340", "search_mode": "fulltext"},
+    "fuzzy": {"fuzzy": "Tritcum aestivm", "fuzzy_threshold": "0.4"},
+    # The lowest threshold accepted must still narrow through the trigram indexes.
+    "fuzzy_loosest": {"fuzzy": "Tritcum aestivm", "fuzzy_threshold": "0.3"},
+}
+ORDERINGS = [
+    None,
+    "name",
+    "-name",
+    "created_at",
+    "-created_at",
+    "growth_duration_days",
+    "-growth_duration_days",
+]
+PAGINATIONS = [{}, {"pagination": "cursor"}]
+
+
+@pytest.fixture
+def seeded_categories(db):
+    """Seed ``SEED_ROWS`` crops over ``SEED_CATEGORIES`` categories and analyse the table."""
+    categories = [CropCategory.objects.create(name=f"Plan category {i}") for i in range(SEED_CATEGORIES)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO crops_crop (
+                name, scientific_name, category_id, description,
+                growth_duration_days, water_requirements, created_at, updated_at
+            )
+            SELECT
+                'Plan crop ' || g,
+                'Planus cropus ' || g,
+                (%s::bigint[])[1 + g %% %s],
+                'Synthetic crop seeded for query plan tests.',
+                30 + g %% 200,
+                (ARRAY['low', 'medium', 'high'])[1 + g %% 3],
+                now() - g * interval '1 minute',
+                now()
+            FROM generate_series(1, %s) AS g
+            """,
+            [[category.id for category in categories], SEED_CATEGORIES, SEED_ROWS],
+        )
+        cursor.execute("UPDATE crops_crop SET name = 'Triticum aestivum' WHERE name = 'Plan crop 12340'")
+        cursor.execute("ANALYZE crops_crop")
+    return categories
+
+
+def page_query(client, params):
+    """Request a crop list page and return the SQL of its main query."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("crop-list"), params)
+    assert response.status_code == 200, response.content
+    selects = [
+        q["sql"] for q in queries if 'FROM "crops_crop"' in q["sql"] and "COUNT(" not in q["sql"].upper()
+    ]
+    return selects[-1]
+
+
+def plan_problems(sql):
+    """Return the nodes of ``sql``'s plan that scan or sort more than ``ROW_THRESHOLD`` rows."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    problems, nodes = [], [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get("Plans", []))
+        rows = node["Plan Rows"]
+        if rows <= ROW_THRESHOLD:
+            continue
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "crops_crop":
+            problems.append(f"Seq Scan of ~{rows} rows")
+        elif node["Node Type"] == "Sort":
+            problems.append(f"Sort of ~{rows} rows on {node.get('Sort Key')}")
+    return problems
+
+
+@pytest.mark.django_db
+class TestCropListQueryPlans:
+    """Every filter / search / ordering / pagination combination reads rows through an index."""
+
+    @pytest.mark.parametrize("filtering", ["none", "category", "water", "both"])
+    @pytest.mark.parametrize("search", list(SEARCHES))
+    def test_no_large_scans_or_sorts(self, auth_client, seeded_categories, filtering, search):
+        """No plan sequentially scans or sorts more than ``ROW_THRESHOLD`` crops."""
+        filters = {
+            "none": {},
+            "category": {"category": seeded_categories[0].id},
+            "water": {"water_requirements": "medium"},
+            "both": {"category": seeded_categories[0].id, "water_requirements": "medium"},
+        }[filtering]
+
+        regressions = []
+        for ordering in ORDERINGS:
+            for pagination in PAGINATIONS:
+                params = {**filters, **SEARCHES[search], **pagination}
+                if ordering:
+                    params["ordering"] = ordering
+                sql = page_query(auth_client, params)
+                for problem in plan_problems(sql):
+                    regressions.append(f"{params}: {problem}\n    {sql}")
+
+        assert not regressions, "\n".join(regressions)
@@ -0,0 +1,166 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from crops.models import Crop
+from cropscience.db import routers
+from cropscience.db.routers import ReplicaRouter, ReplicaRoutingMiddleware, read_from_replica, replica_monitor
+
+
+@pytest.fixture
+def replica(settings, db):
+    """Register a ``replica`` alias that reads through the test database connection."""
+    settings.DATABASE_REPLICAS = ["replica"]
+    connections["replica"] = connections[DEFAULT_DB_ALIAS]
+    replica_monitor.clear()
+    yield "replica"
+    del connections["replica"]
+    replica_monitor.clear()
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Record the alias every routed read goes to."""
+    aliases = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def record(self, model, **hints):
+        alias = db_for_read(self, model, **hints)
+        aliases.append(alias or DEFAULT_DB_ALIAS)
+        return alias
+
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", record)
+    return aliases
+
+
+def handle(view):
+    """Run ``view`` as a request through ``ReplicaRoutingMiddleware``; return its body."""
+    response = ReplicaRoutingMiddleware(view)(RequestFactory().get("/"))
+    response.close()
+    return response.content.decode()
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+    """Tests for sending safe reads to replicas and everything else to the primary."""
+
+    @pytest.mark.parametrize(
+        "url_name, params",
+        [
+            ("crop-list", {}),
+            ("crop-list", {"pagination": "cursor"}),
+            ("crop-statistics", {}),
+            ("category-list", {"with_counts": "true", "preview": 2}),
+        ],
+    )
+    def test_safe_reads_use_replica(self, auth_client, crop, replica, reads, url_name, params):
+        """List and statistics queries run on the replica once the user is authenticated."""
+        response = auth_client.get(reverse(url_name), params)
+
+        assert response.status_code == 200
+        assert reads[-1] == replica
+
+    def test_retrieve_uses_replica(self, auth_client, crop, replica, reads):
+        """Detail queries run on the replica."""
+        response = auth_client.get(reverse("crop-detail", args=[crop.id]))
+
+        assert response.json()["id"] == crop.id
+        assert reads[-1] == replica
+
+    def test_streamed_export_uses_replica(self, auth_client, crop, replica, reads):
+        """Export rows read while streaming still come from the replica."""
+        response = auth_client.get(reverse("crop-export-crops"), {"format": "csv"})
+        body = b"".join(response.streaming_content)
+
+        assert crop.name.encode() in body
+        assert reads[-1] == replica
+
+    def test_writes_use_primary(self, auth_client, category, replica, reads):
+        """Creating a crop reads nothing from the replica."""
+        response = auth_client.post(
+            reverse("crop-list"),
+            {
+                "name": "Replica Rye",
+                "scientific_name": "Secale replica",
+                "category_id": category.id,
+                "growth_duration_days": 100,
+                "water_requirements": "low",
+            },
+            format="json",
+        )
+
+        assert response.status_code == 201
+        assert replica not in reads
+
+    def test_reads_after_a_write_use_primary(self, category, replica):
+        """Within one request, reads after a write see the primary."""
+
+        def view(request):
+            read_from_replica()
+            before = Crop.objects.all().db
+            Crop.objects.create(
+                name="Written",
+                scientific_name="Scriptus",
+                category=category,
+                growth_duration_days=10,
+                water_requirements="low",
+            )
+            return HttpResponse(f"{before} {Crop.objects.all().db}")
+
+        assert handle(view) == f"{replica} {DEFAULT_DB_ALIAS}"
+
+    def test_state_does_not_outlive_request(self, replica):
+        """Reads after a finished request go to the primary again."""
+        handle(lambda request: HttpResponse(read_from_replica()))
+
+        assert routers.routing_state() is None
+        assert Crop.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_no_replicas_configured(self, auth_client, crop, reads):
+        """Without replicas every read uses the primary."""
+        auth_client.get(reverse("crop-list"))
+
+        assert set(reads) == {DEFAULT_DB_ALIAS}
+
+
+@pytest.mark.django_db
+class TestReplicaLagGuard:
+    """Tests for skipping replicas that trail the primary or cannot be reached."""
+
+    def test_measures_lag(self, replica):
+        """A server that is not in recovery has no lag."""
+        assert routers.replica_lag(replica) == 0
+
+    def test_lagging_replica_is_skipped(self, replica, settings, monkeypatch):
+        """Replicas trailing by more than ``DB_REPLICA_MAX_LAG`` serve no reads."""
+        monkeypatch.setattr(routers, "replica_lag", lambda alias: 30.0)
+        settings.DB_REPLICA_MAX_LAG = 5
+
+        assert handle(lambda request: HttpResponse(str(read_from_replica()))) == "None"
+
+        replica_monitor.clear()
+        settings.DB_REPLICA_MAX_LAG = 60
+        assert handle(lambda request: HttpResponse(read_from_replica())) == replica
+
+    def test_unreachable_replica_is_skipped(self, replica, monkeypatch):
+        """A failed measurement falls back to the primary."""
+
+        def unreachable(alias):
+            raise OperationalError("connection refused")
+
+        monkeypatch.setattr(routers, "replica_lag", unreachable)
+
+        assert handle(lambda request: HttpResponse(str(read_from_replica()))) == "None"
+
+    def test_lag_is_measured_once_per_interval(self, replica, settings, monkeypatch):
+        """Requests within ``DB_REPLICA_CHECK_INTERVAL`` reuse the last measurement."""
+        measured = []
+        monkeypatch.setattr(routers, "replica_lag", lambda alias: measured.append(alias) or 0.0)
+        settings.DB_REPLICA_CHECK_INTERVAL = 60
+
+        for _ in range(3):
+            handle(lambda request: HttpResponse(read_from_replica()))
+
+        assert measured == [replica]
@@ -0,0 +1,150 @@
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from crops.models import Crop
+from cropscience.metrics import REQUEST_DURATION, REQUEST_QUERIES, clear_metrics
+
+TIMING_RE = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?')
+
+
+@pytest.fixture(autouse=True)
+def empty_metrics():
+    """Start every test with no requests recorded."""
+    clear_metrics()
+
+
+def server_timing(response):
+    """Parse ``Server-Timing`` into ``{phase: ms}`` plus the query count under ``queries``."""
+    timings = {}
+    for name, duration, queries in TIMING_RE.findall(response["Server-Timing"]):
+        timings[name] = float(duration)
+        if queries:
+            timings["queries"] = int(queries)
+    return timings
+
+
+def observed(histogram, *labels):
+    """Return how many requests ``histogram`` recorded under ``labels``."""
+    samples = histogram.samples(labels)
+    return samples[0][-1] if samples else 0
+
+
+@pytest.fixture
+def crops(category):
+    """Create enough crops for serialization to register."""
+    return Crop.objects.bulk_create(
+        Crop(
+            name=f"Timed Crop {i}",
+            scientific_name=f"Tempus {i}",
+            category=category,
+            growth_duration_days=50 + i,
+            water_requirements="low",
+        )
+        for i in range(10)
+    )
+
+
+@pytest.mark.django_db
+class TestServerTiming:
+    """Tests for the per-request ``Server-Timing`` header."""
+
+    def test_list_reports_every_phase(self, auth_client, crops):
+        """The header names each phase and the query count the request ran."""
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(reverse("crop-list"), {"fields": "id,name,category"})
+
+        timings = server_timing(response)
+        assert set(timings) == {"db", "serialize", "render", "app", "total", "queries"}
+        assert timings["queries"] == len(queries)
+        assert timings["db"] > 0 and timings["serialize"] > 0 and timings["render"] > 0
+        assert timings["db"] + timings["serialize"] + timings["render"] <= timings["total"]
+
+    def test_nested_serializers_are_counted_once(self, auth_client, crops):
+        """Crop previews inside categories add no time beyond the outer serializer's."""
+        response = auth_client.get(reverse("category-list"), {"preview": 3, "with_counts": "true"})
+
+        timings = server_timing(response)
+        assert 0 < timings["serialize"] < timings["total"]
+
+    def test_async_requests_are_timed(self, user, crops):
+        """Requests served by the async handler report their queries too."""
+        header = f"Bearer {RefreshToken.for_user(user).access_token}"
+
+        async def get():
+            return await AsyncClient().get(reverse("crop-list"), headers={"Authorization": header})
+
+        response = async_to_sync(get)()
+
+        assert response.status_code == 200
+        assert server_timing(response)["queries"] > 0
+        assert observed(REQUEST_DURATION, "CropViewSet.list", "GET", 200) == 1
+
+    def test_header_can_be_disabled(self, auth_client, settings):
+        """``SERVER_TIMING = False`` drops the header but still records the request."""
+        settings.SERVER_TIMING = False
+
+        response = auth_client.get(reverse("category-list"))
+
+        assert "Server-Timing" not in response
+        assert observed(REQUEST_DURATION, "CropCategoryViewSet.list", "GET", 200) == 1
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Tests for the Prometheus histograms served by ``/api/metrics/``."""
+
+    url = reverse("metrics")
+
+    def test_requests_are_labelled_by_view_and_action(self, auth_client, api_client, crop, settings):
+        """Each request lands in its ``ViewSet.action`` series with its status."""
+        settings.METRICS_PUBLIC = True
+        auth_client.get(reverse("crop-list"))
+        auth_client.get(reverse("crop-detail", args=[crop.id]))
+        auth_client.get(reverse("crop-detail", args=[0]))
+        api_client.post(reverse("auth-register"), {"username": "m"}, format="json")
+
+        body = api_client.get(self.url).content.decode()
+
+        assert 'cropscience_request_duration_seconds_count{view="CropViewSet.list",method="GET",status="200"} 1' in body
+        assert 'cropscience_request_duration_seconds_count{view="CropViewSet.retrieve",method="GET",status="404"} 1' in body
+        assert 'cropscience_request_duration_seconds_count{view="RegisterView.post",method="POST",status="400"} 1' in body
+        assert 'cropscience_request_phase_seconds_bucket{view="CropViewSet.list",phase="db",le="+Inf"} 1' in body
+        assert body.startswith("# HELP cropscience_request_duration_seconds ")
+
+    def test_streamed_export_is_recorded_when_finished(self, auth_client, crops):
+        """Streamed rows count toward the request once the body has been sent."""
+        response = auth_client.get(reverse("crop-export-crops"), {"format": "csv"})
+        assert observed(REQUEST_QUERIES, "CropViewSet.export_crops") == 0
+
+        b"".join(response.streaming_content)
+
+        assert observed(REQUEST_QUERIES, "CropViewSet.export_crops") == 1
+        assert REQUEST_QUERIES.samples(("CropViewSet.export_crops",))[1] > 0
+
+    def test_token_is_required_when_configured(self, api_client, settings):
+        """With ``METRICS_TOKEN`` set, scrapes without it are refused."""
+        settings.METRICS_TOKEN = "scrape-secret"
+
+        assert api_client.get(self.url).status_code == 401
+        assert api_client.get(self.url, HTTP_AUTHORIZATION="Bearer wrong-secret").status_code == 401
+        response = api_client.get(self.url, HTTP_AUTHORIZATION="Bearer scrape-secret")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+
+    def test_closed_to_all_but_staff_by_default(self, auth_client, user):
+        """Without a token configured, only staff may read the metrics."""
+        assert APIClient().get(self.url).status_code == 401
+        assert auth_client.get(self.url).status_code == 403
+
+        user.is_staff = True
+        user.save()
+
+        assert auth_client.get(self.url).status_code == 200
@@ -0,0 +1,62 @@
+import pytest
+from django.db.models.signals import post_init
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from crops.models import Crop, CropCategory
+from crops.rows import RowSerializer
+from crops.serializers import CropCategorySerializer, CropListSerializer
+
+
+@pytest.fixture
+def crops(category):
+    """Create crops covering every water requirement and an empty description."""
+    other = CropCategory.objects.create(name="Rows Legumes", description="")
+    return [
+        Crop.objects.create(
+            name=f"Rows {i}",
+            scientific_name=f"Rowsus {i}",
+            category=category if i % 2 else other,
+            description="" if i % 3 else f"Crop number {i}.",
+            growth_duration_days=30 + i,
+            water_requirements=["low", "medium", "high"][i % 3],
+        )
+        for i in range(6)
+    ]
+
+
+@pytest.mark.django_db
+class TestRowSerializer:
+    """The values() fast path renders exactly what the model serializers render."""
+
+    @pytest.mark.parametrize(
+        ("serializer_class", "model"),
+        [(CropListSerializer, Crop), (CropCategorySerializer, CropCategory)],
+    )
+    def test_output_is_byte_identical(self, crops, serializer_class, model):
+        """Rows and instances render to the same JSON bytes."""
+        queryset = model.objects.order_by("pk")
+        rows = RowSerializer(serializer_class())
+
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        actual = JSONRenderer().render(rows.serialize(rows.prepare(queryset)))
+
+        assert actual == expected
+
+    @pytest.mark.parametrize("params", [{}, {"pagination": "cursor", "ordering": "-created_at"}])
+    def test_list_builds_no_model_instances(self, auth_client, crops, params):
+        """The crop list endpoint never instantiates Crop."""
+        created = []
+
+        def record(sender, instance, **kwargs):
+            created.append(instance)
+
+        post_init.connect(record, sender=Crop)
+        try:
+            response = auth_client.get(reverse("crop-list"), {"page_size": 4, **params})
+        finally:
+            post_init.disconnect(record, sender=Crop)
+
+        assert response.status_code == 200
+        assert len(response.json()["results"]) == 4
+        assert created == []
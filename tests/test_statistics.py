@@ -0,0 +1,128 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, Max, Min
+from django.urls import reverse
+
+from crops.models import Crop, CropCategory, CropStatistic
+
+
+def expected_groups():
+    """Return the per-group aggregates computed straight from the crops table."""
+    rows = Crop.objects.values("category_id", "water_requirements").annotate(
+        count=Count("id"), low=Min("growth_duration_days"), high=Max("growth_duration_days")
+    )
+    return {(r["category_id"], r["water_requirements"]): (r["count"], r["low"], r["high"]) for r in rows}
+
+
+def stored_groups():
+    """Return the per-group aggregates kept in the summary table."""
+    rows = CropStatistic.objects.values_list(
+        "category_id", "water_requirements", "crop_count", "duration_min", "duration_max"
+    )
+    return {(c, w): (n, low, high) for c, w, n, low, high in rows}
+
+
+def new_crop(category, name, days, water="low"):
+    """Create and return a crop."""
+    return Crop.objects.create(
+        name=name,
+        scientific_name=f"{name} stat",
+        category=category,
+        growth_duration_days=days,
+        water_requirements=water,
+    )
+
+
+@pytest.mark.django_db
+class TestCropStatistics:
+    """Tests for /api/crops/crops/statistics/ and its summary table."""
+
+    url = reverse("crop-statistics")
+
+    def test_summary_follows_every_write_path(self, auth_client, category):
+        """Saves, updates, deletes, bulk writes and cascades keep the summary exact."""
+        other = CropCategory.objects.create(name="Stat Legumes")
+        short = new_crop(category, "Stat A", 40)
+        long = new_crop(category, "Stat B", 200)
+        new_crop(other, "Stat C", 90, "high")
+        assert stored_groups() == expected_groups()
+
+        long.growth_duration_days = 100
+        long.save()
+        short.delete()
+        assert stored_groups() == expected_groups()
+
+        auth_client.post(
+            reverse("crop-bulk"),
+            [
+                {
+                    "name": f"Stat Bulk {i}",
+                    "scientific_name": "Bulkus",
+                    "category_id": other.id,
+                    "growth_duration_days": 10 + i,
+                    "water_requirements": "medium",
+                }
+                for i in range(5)
+            ],
+            format="json",
+        )
+        Crop.objects.filter(name="Stat C").update(water_requirements="low", category=category)
+        assert stored_groups() == expected_groups()
+
+        other.delete()
+        assert stored_groups() == expected_groups()
+
+    def test_endpoint_aggregates(self, auth_client, category):
+        """Totals, water distribution and durations are reported overall and per category."""
+        other = CropCategory.objects.create(name="Stat Legumes")
+        new_crop(category, "Stat A", 40)
+        new_crop(category, "Stat B", 100, "high")
+        new_crop(other, "Stat C", 91, "high")
+
+        data = auth_client.get(self.url).json()
+
+        assert data["crop_count"] == 3
+        assert data["water_requirements"] == {"low": 1, "medium": 0, "high": 2}
+        assert data["growth_duration_days"] == {"avg": 77.0, "min": 40, "max": 100}
+        by_name = {c["name"]: c for c in data["categories"]}
+        assert by_name["Stat Legumes"]["crop_count"] == 1
+        assert by_name[category.name]["growth_duration_days"] == {"avg": 70.0, "min": 40, "max": 100}
+
+        scoped = auth_client.get(self.url, {"water_requirements": "high", "category": category.id}).json()
+        assert scoped["crop_count"] == 1
+        assert scoped["growth_duration_days"]["avg"] == 100.0
+
+    def test_read_cost_does_not_grow_with_crops(self, auth_client, category, django_assert_max_num_queries):
+        """Reads only touch the summary table."""
+        Crop.objects.bulk_create(
+            Crop(
+                name=f"Stat {i}",
+                scientific_name="Statius",
+                category=category,
+                growth_duration_days=i,
+                water_requirements="low",
+            )
+            for i in range(200)
+        )
+        with django_assert_max_num_queries(3):
+            response = auth_client.get(self.url)
+
+        assert response.json()["crop_count"] == 200
+        assert response.json()["growth_duration_days"]["avg"] == 99.5
+
+    def test_rebuild_command_repairs_drift(self, category):
+        """rebuild_crop_statistics recomputes the table from the crops."""
+        new_crop(category, "Stat A", 40)
+        CropStatistic.objects.update(crop_count=99)
+        out = StringIO()
+
+        call_command("rebuild_crop_statistics", stdout=out)
+
+        assert stored_groups() == expected_groups()
+        assert "1 groups" in out.getvalue()
+
+    def test_invalid_filter(self, auth_client):
+        """Invalid filter values answer 400."""
+        assert auth_client.get(self.url, {"category": "abc"}).status_code == 400
@@ -0,0 +1,190 @@
+import json
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+from io import StringIO
+
+import psycopg2
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from crops.models import Crop, CropCategory
+from crops.sync import purge_tombstones
+
+
+def sync(client, token=None, **params):
+    """Fetch one page of the change feed."""
+    if token:
+        params["token"] = token
+    response = client.get(reverse("sync"), params)
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+# The feed serves rows once their transaction has finished, which a test
+# transaction never does.
+@pytest.mark.django_db(transaction=True)
+class TestSyncFeed:
+    """Tests for /api/crops/sync/."""
+
+    def test_initial_sync_returns_everything(self, auth_client, crop):
+        """Without a token the feed starts from the beginning."""
+        data = sync(auth_client)
+
+        assert [c["id"] for c in data["categories"]] == [crop.category_id]
+        assert data["crops"][0]["id"] == crop.id
+        assert data["crops"][0]["category"] == crop.category_id
+        assert data["deleted"] == []
+        assert data["has_more"] is False
+
+    def test_token_returns_only_later_changes(self, auth_client, crop, category):
+        """Only rows changed after the token are returned."""
+        token = sync(auth_client)["token"]
+        other = Crop.objects.create(
+            name="Sync Rye",
+            scientific_name="Secale sync",
+            category=category,
+            growth_duration_days=110,
+            water_requirements="low",
+        )
+        crop.description = "Changed."
+        crop.save()
+
+        data = sync(auth_client, token)
+
+        assert data["categories"] == []
+        assert [c["id"] for c in data["crops"]] == [other.id, crop.id]
+        assert data["crops"][1]["description"] == "Changed."
+        assert sync(auth_client, data["token"])["crops"] == []
+
+    def test_category_delete_reports_cascaded_crops(self, auth_client, crop, category):
+        """Deleting a category leaves tombstones for it and for its crops."""
+        token = sync(auth_client)["token"]
+        auth_client.delete(reverse("category-detail", args=[category.id]))
+
+        data = sync(auth_client, token)
+
+        assert sorted((d["type"], d["id"]) for d in data["deleted"]) == [
+            ("category", category.id),
+            ("crop", crop.id),
+        ]
+        assert sync(auth_client, data["token"])["deleted"] == []
+
+    def test_pages_follow_limit(self, auth_client, category):
+        """Small limits page through every change exactly once."""
+        CropCategory.objects.bulk_create(CropCategory(name=f"Sync {i}") for i in range(5))
+        seen, token = [], None
+        while True:
+            data = sync(auth_client, token, limit=2)
+            seen += [c["id"] for c in data["categories"]]
+            token = data["token"]
+            if not data["has_more"]:
+                break
+
+        assert sorted(seen) == sorted(CropCategory.objects.values_list("id", flat=True))
+        assert len(seen) == len(set(seen))
+
+    def test_crops_wait_for_their_categories(self, auth_client):
+        """With more categories pending than ``limit``, no crop arrives before its category."""
+        categories = CropCategory.objects.bulk_create(CropCategory(name=f"Sync {i}") for i in range(5))
+        Crop.objects.bulk_create(
+            Crop(
+                name=f"Sync crop {i}",
+                scientific_name=f"Syncus {i}",
+                category=category,
+                growth_duration_days=90,
+                water_requirements="low",
+            )
+            # The first crops reference the last categories.
+            for i, category in enumerate(reversed(categories))
+        )
+        received, crops, token = set(), [], None
+        while True:
+            data = sync(auth_client, token, limit=2)
+            received.update(c["id"] for c in data["categories"])
+            assert {c["category"] for c in data["crops"]} <= received
+            crops += data["crops"]
+            if not data["has_more"]:
+                break
+            token = data["token"]
+
+        assert received == {category.id for category in categories}
+        assert sorted(c["name"] for c in crops) == [f"Sync crop {i}" for i in range(5)]
+
+    def test_long_transaction_is_not_skipped(self, auth_client, category):
+        """Rows a long transaction commits after later ones were written still reach the client."""
+        token = sync(auth_client)["token"]
+        # A connection of its own, outside the pool, so the transaction stays open.
+        slow = psycopg2.connect(**connection.get_connection_params())
+        try:
+            with slow.cursor() as cursor:
+                # Take a transaction ID before the fast write, but write the crop after it
+                # commits: a crop write holds the data version row until its transaction ends.
+                cursor.execute("SELECT pg_current_xact_id()")
+                fast = Crop.objects.create(
+                    name="Fast Rye",
+                    scientific_name="Secale citum",
+                    category=category,
+                    growth_duration_days=90,
+                    water_requirements="high",
+                )
+                held = sync(auth_client, token)
+                assert held["crops"] == []
+
+                cursor.execute(
+                    "INSERT INTO crops_crop (name, scientific_name, category_id, description, "
+                    "growth_duration_days, water_requirements, created_at, updated_at, sync_xid) "
+                    "VALUES ('Slow Rye', 'Secale lentum', %s, '', 100, 'low', now(), now(), 0)",
+                    [category.id],
+                )
+            slow.commit()
+        finally:
+            slow.close()
+
+        data = sync(auth_client, held["token"])
+        assert [c["name"] for c in data["crops"]] == ["Slow Rye", "Fast Rye"]
+        assert data["crops"][1]["id"] == fast.id
+
+    def test_token_older_than_purged_tombstones_must_resync(self, auth_client, crop, settings):
+        """Once tombstones a token has not seen are purged, the feed answers 410."""
+        token = sync(auth_client)["token"]
+        crop.delete()
+        later = timezone.now() + timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+
+        assert purge_tombstones(now=later) == 1
+
+        response = auth_client.get(reverse("sync"), {"token": token})
+        assert response.status_code == 410
+        assert response.json()["code"] == "resync_required"
+        fresh = sync(auth_client)
+        assert sync(auth_client, fresh["token"])["deleted"] == []
+
+    def test_purge_keeps_recent_tombstones(self, auth_client, crop):
+        """The command leaves tombstones within the retention period, and their tokens work."""
+        token = sync(auth_client)["token"]
+        crop_id = crop.id
+        crop.delete()
+        out = StringIO()
+
+        call_command("purge_tombstones", stdout=out)
+
+        assert "Purged 0 tombstones." in out.getvalue()
+        assert sync(auth_client, token)["deleted"] == [{"type": "crop", "id": crop_id}]
+
+    def test_timestamp_tokens_must_resync(self, auth_client):
+        """Tokens of the former timestamp-ordered feed answer 410."""
+        positions = {stream: ["2026-10-01T00:00:00+00:00", 1] for stream in ("categories", "crops", "deleted")}
+        token = urlsafe_b64encode(json.dumps(positions).encode()).decode()
+
+        assert auth_client.get(reverse("sync"), {"token": token}).status_code == 410
+
+    def test_invalid_token_and_limit(self, auth_client):
+        """Malformed tokens and limits answer 400."""
+        assert auth_client.get(reverse("sync"), {"token": "garbage"}).status_code == 400
+        assert auth_client.get(reverse("sync"), {"limit": "0"}).status_code == 400
+
+    def test_unauthenticated_access_denied(self, api_client):
+        """The feed requires authentication."""
+        assert api_client.get(reverse("sync")).status_code == 401
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count, Max, Min, Sum
+from django.utils import timezone
+
+from crops.models import Crop, CropCategory, CropStatistic
+from crops.synthetic import generate_categories, generate_crops
+
+
+def drawn_values(crops):
+    """Return what was drawn for each crop, without the run-specific numbering."""
+    return [
+        (
+            crop.category_id,
+            crop.water_requirements,
+            crop.growth_duration_days,
+            crop.name.rsplit(" ", 1)[0],
+            crop.created_at,
+        )
+        for crop in crops.order_by("id")
+    ]
+
+
+def crop_indexes():
+    """Return the definitions of every index on the crop table."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT indexdef FROM pg_indexes WHERE tablename = 'crops_crop'")
+        return {row[0] for row in cursor.fetchall()}
+
+
+@pytest.mark.django_db
+class TestGenerateCrops:
+    """Tests for the synthetic dataset generator and ``generate_crops`` command."""
+
+    def test_distributions_follow_the_arguments(self):
+        """Water shares, duration bounds and category skew shape the generated crops."""
+        categories = generate_categories(20)
+        generated = generate_crops(
+            3000,
+            categories,
+            water_shares={"low": 1, "high": 3},
+            duration_mean=100,
+            duration_stddev=80,
+            duration_range=(30, 150),
+            category_skew=3,
+            batch_size=700,
+            seed=7,
+        )
+
+        assert generated == Crop.objects.count() == 3000
+        water = dict(Crop.objects.values_list("water_requirements").annotate(Count("id")))
+        assert set(water) == {"low", "high"}
+        assert 0.2 < water["low"] / 3000 < 0.3
+        bounds = Crop.objects.aggregate(low=Min("growth_duration_days"), high=Max("growth_duration_days"))
+        assert bounds == {"low": 30, "high": 150}
+        per_category = Crop.objects.values("category_id").annotate(n=Count("id")).order_by("-n")
+        assert per_category[0]["category_id"] == categories[0].id
+        assert per_category[0]["n"] > 5 * 3000 / 20
+        assert Crop.objects.values("name").distinct().count() == 3000
+        assert CropStatistic.objects.aggregate(total=Sum("crop_count"))["total"] == 3000
+
+    def test_seed_makes_runs_reproducible(self):
+        """Two runs with the same seed draw the same crops; names stay unique."""
+        categories = generate_categories(3)
+        generate_crops(500, categories, batch_size=200, seed=42)
+        first = drawn_values(Crop.objects.all())
+        Crop.objects.all().delete()
+
+        generate_crops(500, categories, batch_size=200, seed=42)
+
+        assert drawn_values(Crop.objects.all()) == first
+        assert len(first) == 500
+
+    def test_new_crops_are_updated_now(self):
+        """Generated crops carry the insert time as ``updated_at``, after any ``created_at``."""
+        before = timezone.now()
+        reference = datetime(2023, 6, 1, tzinfo=dt_timezone.utc)
+
+        generate_crops(200, generate_categories(2), seed=3, reference_time=reference)
+
+        bounds = Crop.objects.aggregate(
+            oldest=Min("created_at"), newest=Max("created_at"), updated=Min("updated_at")
+        )
+        assert bounds["updated"] >= before
+        assert reference - timedelta(days=3 * 365) <= bounds["oldest"] <= bounds["newest"] <= reference
+
+    def test_deferred_indexes_are_rebuilt(self):
+        """Loading with deferred indexes leaves the same indexes in place."""
+        before = crop_indexes()
+
+        generate_crops(300, generate_categories(2), batch_size=100, defer_indexes=True)
+
+        assert crop_indexes() == before
+        assert Crop.objects.count() == 300
+
+    def test_command_reuses_categories_and_rejects_bad_weights(self):
+        """Running twice adds crops to the same categories; unknown requirements fail."""
+        out = StringIO()
+        for _ in range(2):
+            call_command("generate_crops", crops=250, categories=20, batch_size=100, stdout=out)
+
+        assert Crop.objects.count() == 500
+        assert CropCategory.objects.count() == 20
+        assert CropCategory.objects.filter(name="Cereals 2").exists()
+        assert "250 crops generated in 20 categories" in out.getvalue()
+        with pytest.raises(CommandError, match="Unknown water requirement 'dry'"):
+            call_command("generate_crops", "--water", "low=1,dry=2", stdout=out)
+        with pytest.raises(CommandError, match="must not be in the future"):
+            call_command("generate_crops", "--reference-time", "2999-01-01", stdout=out)
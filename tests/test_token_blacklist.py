@@ -0,0 +1,99 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from users.blacklist import purge_expired_tokens, revoked_tokens
+from users.tokens import RefreshToken
+
+
+def make_tokens(count, expires_at, blacklisted=True):
+    """Create ``count`` outstanding tokens expiring at ``expires_at``."""
+    tokens = OutstandingToken.objects.bulk_create(
+        OutstandingToken(jti=f"purge-{expires_at.timestamp()}-{i}", token="x", expires_at=expires_at)
+        for i in range(count)
+    )
+    if blacklisted:
+        BlacklistedToken.objects.bulk_create(BlacklistedToken(token=token) for token in tokens)
+    return tokens
+
+
+@pytest.mark.django_db
+class TestTokenBlacklist:
+    """Tests for the cached blacklist behind refresh and logout."""
+
+    refresh_url = reverse("auth-token-refresh")
+
+    def test_rotated_token_cannot_be_reused(self, api_client, user):
+        """A refresh token is rejected after it has been rotated once."""
+        refresh = str(RefreshToken.for_user(user))
+
+        first = api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+        reused = api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+
+        assert first.status_code == 200
+        assert first.json()["refresh"] != refresh
+        assert reused.status_code == 401
+        rotated = api_client.post(self.refresh_url, {"refresh": first.json()["refresh"]}, format="json")
+        assert rotated.status_code == 200
+
+    def test_known_blacklisted_token_skips_database(self, api_client, user):
+        """Once seen as blacklisted, a token is rejected from the in-process cache."""
+        refresh = str(RefreshToken.for_user(user))
+        api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+        revoked_tokens.clear()
+        api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+
+        assert response.status_code == 401
+        assert len(queries) == 0
+
+    def test_blacklisting_twice_fails(self, user):
+        """Only the first of two uses of the same token blacklists it."""
+        refresh = RefreshToken.for_user(user)
+        refresh.blacklist()
+        revoked_tokens.clear()
+
+        with pytest.raises(TokenError):
+            RefreshToken(str(refresh), verify=False).blacklist()
+        assert BlacklistedToken.objects.filter(token__jti=refresh["jti"]).count() == 1
+
+    def test_logout_blacklists_refresh_token(self, auth_client, user):
+        """A logged out refresh token can neither refresh nor log out again."""
+        refresh = str(RefreshToken.for_user(user))
+        logout_url = reverse("auth-logout")
+
+        assert auth_client.post(logout_url, {"refresh": refresh}, format="json").status_code == 205
+        assert auth_client.post(self.refresh_url, {"refresh": refresh}, format="json").status_code == 401
+        assert auth_client.post(logout_url, {"refresh": refresh}, format="json").status_code == 400
+
+    def test_purge_removes_only_expired_tokens(self):
+        """Expired tokens go in batches with their blacklist entries; live ones stay."""
+        now = timezone.now()
+        make_tokens(5, now - timedelta(days=1))
+        make_tokens(2, now - timedelta(hours=1), blacklisted=False)
+        live = make_tokens(3, now + timedelta(days=1))
+
+        assert purge_expired_tokens(batch_size=2, now=now) == 7
+
+        assert set(OutstandingToken.objects.values_list("id", flat=True)) == {t.id for t in live}
+        assert BlacklistedToken.objects.count() == 3
+
+    def test_purge_command(self):
+        """purge_expired_tokens reports how many tokens it deleted."""
+        make_tokens(4, timezone.now() - timedelta(days=1))
+        out = StringIO()
+
+        call_command("purge_expired_tokens", "--batch-size", "3", stdout=out)
+
+        assert "4 expired tokens" in out.getvalue()
+        assert not OutstandingToken.objects.exists()
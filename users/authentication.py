@@ -0,0 +1,95 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """Bounded, thread-safe LRU of users keyed by their token id claim.
+
+    Entries expire ``AUTH_USER_CACHE_TTL`` seconds after they were loaded and
+    the least recently used entry is evicted once ``AUTH_USER_CACHE_SIZE`` is
+    reached. Each process holds its own cache: ``invalidate`` only reaches the
+    current process, so other workers see a change within the TTL at most.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; loads that started before one are not stored.
+        self._generation = 0
+
+    def generation(self):
+        """Return a marker to pass to ``set`` for a user about to be loaded."""
+        return self._generation
+
+    def get(self, user_id):
+        """Return the cached user for ``user_id``, or ``None``."""
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, user_id, user, generation):
+        """Cache ``user`` unless an invalidation happened since ``generation``."""
+        size = settings.AUTH_USER_CACHE_SIZE
+        ttl = settings.AUTH_USER_CACHE_TTL
+        if size <= 0 or ttl <= 0:
+            return
+        key = str(user_id)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (user, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Drop ``user_id`` so its next request reloads it."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that serves ``request.user`` from ``user_cache``.
+
+    Token validation is unchanged; only the per-request ``auth_user`` lookup
+    is skipped while the user is cached. Inactive users are never cached, and
+    saving or deleting a user evicts it (see ``users.signals``).
+    """
+
+    def get_user(self, validated_token):
+        """Return the user named by the token, loading it on a cache miss."""
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        user = user_cache.get(user_id)
+        if user is None:
+            generation = user_cache.generation()
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, generation)
+        # Requests may annotate request.user; keep those off the shared instance.
+        return copy.copy(user)
@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection, connections
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+logger = logging.getLogger(__name__)
+
+OUTSTANDING_TABLE = OutstandingToken._meta.db_table
+BLACKLISTED_TABLE = BlacklistedToken._meta.db_table
+
+# Records the token as outstanding if it is not already, then blacklists it.
+# Returns a row only when this statement did the blacklisting, so two
+# concurrent uses of the same refresh token cannot both succeed.
+BLACKLIST_SQL = f"""
+WITH outstanding AS (
+    INSERT INTO {OUTSTANDING_TABLE} (jti, token, expires_at)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (jti) DO UPDATE SET jti = EXCLUDED.jti
+    RETURNING id
+)
+INSERT INTO {BLACKLISTED_TABLE} (token_id, blacklisted_at)
+SELECT id, now() FROM outstanding
+ON CONFLICT (token_id) DO NOTHING
+RETURNING id
+"""
+
+# Deletes one batch of expired outstanding tokens along with their blacklist
+# entries. Rows locked by a concurrent purge are left to it.
+PURGE_SQL = f"""
+WITH expired AS (
+    SELECT id FROM {OUTSTANDING_TABLE}
+    WHERE expires_at <= %s
+    ORDER BY expires_at
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+), blacklisted AS (
+    DELETE FROM {BLACKLISTED_TABLE} WHERE token_id IN (SELECT id FROM expired)
+)
+DELETE FROM {OUTSTANDING_TABLE} WHERE id IN (SELECT id FROM expired)
+"""
+
+
+class RevokedTokens:
+    """Bounded, thread-safe set of ``jti`` values known to be blacklisted.
+
+    Blacklisting is permanent until the token expires, so a hit can be
+    trusted without asking the database; a miss still has to ask it, since
+    other processes blacklist tokens too. Entries are dropped once their
+    token expires, and the oldest entry is evicted beyond
+    ``TOKEN_BLACKLIST_CACHE_SIZE``.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, jti):
+        with self._lock:
+            expires = self._entries.get(jti)
+            if expires is None:
+                return False
+            if expires <= timezone.now():
+                del self._entries[jti]
+                return False
+            self._entries.move_to_end(jti)
+            return True
+
+    def add(self, jti, expires):
+        """Remember that ``jti`` is blacklisted until ``expires``."""
+        size = settings.TOKEN_BLACKLIST_CACHE_SIZE
+        if size <= 0:
+            return
+        with self._lock:
+            self._entries[jti] = expires
+            self._entries.move_to_end(jti)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+revoked_tokens = RevokedTokens()
+
+
+def is_blacklisted(jti):
+    """Return whether the token ``jti`` is blacklisted."""
+    if jti in revoked_tokens:
+        return True
+    expires = (
+        BlacklistedToken.objects.filter(token__jti=jti).values_list("token__expires_at", flat=True).first()
+    )
+    if expires is None:
+        return False
+    revoked_tokens.add(jti, expires)
+    return True
+
+
+def blacklist_token(token):
+    """Blacklist ``token``; return ``False`` if it already was.
+
+    Unlike simplejwt's ``get_or_create`` pair this is a single statement.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    expires = datetime_from_epoch(token["exp"])
+    with connection.cursor() as cursor:
+        cursor.execute(BLACKLIST_SQL, [jti, str(token), expires])
+        created = cursor.fetchone() is not None
+    revoked_tokens.add(jti, expires)
+    return created
+
+
+def purge_expired_tokens(batch_size=None, now=None):
+    """Delete expired outstanding tokens and their blacklist entries; return how many.
+
+    Rows go in batches of ``batch_size`` (default ``TOKEN_PURGE_BATCH_SIZE``),
+    each committed on its own, so locks stay short and the purge can be
+    interrupted without losing progress. An expired token fails verification
+    before the blacklist is consulted, so its rows are no longer needed.
+    """
+    batch_size = batch_size or settings.TOKEN_PURGE_BATCH_SIZE
+    now = now or timezone.now()
+    purged = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(PURGE_SQL, [now, batch_size])
+            deleted = cursor.rowcount
+        purged += deleted
+        if deleted < batch_size:
+            return purged
+
+
+# When this process last started a background purge.
+_last_purge = time.monotonic()
+_purge_lock = threading.Lock()
+
+
+def _run_purge():
+    """Purge expired tokens from a background thread."""
+    try:
+        purged = purge_expired_tokens()
+        logger.info("Purged %s expired tokens", purged)
+    except Exception:
+        logger.exception("Purging expired tokens failed")
+    finally:
+        connections.close_all()
+
+
+def schedule_purge():
+    """Start a background purge if ``TOKEN_PURGE_INTERVAL`` seconds have passed since the last one."""
+    global _last_purge
+    interval = settings.TOKEN_PURGE_INTERVAL
+    if interval <= 0:
+        return
+    with _purge_lock:
+        if time.monotonic() - _last_purge < interval:
+            return
+        _last_purge = time.monotonic()
+    threading.Thread(target=_run_purge, name="token-purge", daemon=True).start()
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """Django's PBKDF2-SHA256 hasher with iterations from ``PASSWORD_HASH_ITERATIONS``.
+
+    Stored hashes with a different count report ``must_update``, so raising
+    the setting rehashes each password at its owner's next login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from users.blacklist import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted JWT refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Tokens deleted per transaction.")
+
+    def handle(self, *args, **options):
+        purged = purge_expired_tokens(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} expired tokens."))
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+# The purge of expired tokens reads outstanding tokens by expiry.
+CREATE_EXPIRES_INDEX = """
+CREATE INDEX IF NOT EXISTS users_outstandingtoken_expires_at
+    ON token_blacklist_outstandingtoken (expires_at);
+"""
+
+DROP_EXPIRES_INDEX = """
+DROP INDEX IF EXISTS users_outstandingtoken_expires_at;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_EXPIRES_INDEX, DROP_EXPIRES_INDEX),
+    ]
@@ -0,0 +1,91 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import _clean_credentials, get_user_model, user_login_failed
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.exceptions import ImproperlyConfigured
+
+# The only backend ``aauthenticate`` reproduces; any other would be bypassed.
+SUPPORTED_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide pool that hashes passwords."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _executor
+
+
+async def run_hasher(func, *args):
+    """Run ``func(*args)`` on the password pool without blocking the event loop.
+
+    At most ``PASSWORD_HASH_WORKERS`` hashes run at once; further logins
+    queue for a worker instead of competing with other requests for CPU.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args))
+
+
+def _check_password(password, encoded):
+    """Return whether ``password`` matches ``encoded``, and its rehash if the hasher settings changed."""
+    outdated = []
+    valid = check_password(password, encoded, setter=outdated.append)
+    return valid, make_password(password) if outdated else None
+
+
+async def ahash_password(password):
+    """Return the hash of ``password``, computed on the password pool."""
+    return await run_hasher(make_password, password)
+
+
+async def aauthenticate(username, password, request=None):
+    """Return the user with these credentials, or ``None``.
+
+    The async counterpart of ``authenticate()`` with ``ModelBackend``, the
+    only backend it supports: other ``AUTHENTICATION_BACKENDS`` raise
+    ``ImproperlyConfigured`` rather than being skipped. Hashing runs on the
+    password pool, and a hash stored with outdated settings (such as a
+    lower ``PASSWORD_HASH_ITERATIONS``) is replaced on a successful login.
+    Failures send ``user_login_failed`` as ``authenticate()`` does;
+    ``user_logged_in`` belongs to session logins and is not sent.
+    """
+    if list(settings.AUTHENTICATION_BACKENDS) != SUPPORTED_BACKENDS:
+        raise ImproperlyConfigured(f"aauthenticate only supports AUTHENTICATION_BACKENDS = {SUPPORTED_BACKENDS}.")
+
+    UserModel = get_user_model()
+    try:
+        user = await UserModel._default_manager.aget(**{UserModel.USERNAME_FIELD: username})
+    except UserModel.DoesNotExist:
+        # Hash anyway so unknown usernames take as long as wrong passwords.
+        await ahash_password(password)
+        user = None
+    else:
+        valid, rehashed = await run_hasher(_check_password, password, user.password)
+        if not valid or not ModelBackend().user_can_authenticate(user):
+            user = None
+        elif rehashed:
+            user.password = rehashed
+            await user.asave(update_fields=["password"])
+
+    if user is None:
+        # Same sender as ``authenticate()``, so receivers filtering on it still fire.
+        await sync_to_async(user_login_failed.send)(
+            sender=auth.__name__,
+            credentials=_clean_credentials({"username": username, "password": password}),
+            request=request,
+        )
+    return user
@@ -1,5 +1,10 @@
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+
+from .blacklist import schedule_purge
+from .tokens import RefreshToken
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -25,11 +30,41 @@ class RegisterSerializer(serializers.ModelSerializer):
         return attrs
 
     def create(self, validated_data):
-        """Create a new user with the validated data."""
+        """Create a new user with the validated data.
+
+        ``RegisterView`` hashes the password off the event loop and passes
+        the result to ``save()`` as ``password_hash``; otherwise it is hashed here.
+        """
         validated_data.pop("password2")
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            email=validated_data.get("email", ""),
-            password=validated_data["password"],
+        password_hash = validated_data.pop("password_hash", None) or make_password(validated_data["password"])
+        user = User(
+            username=User.normalize_username(validated_data["username"]),
+            email=User.objects.normalize_email(validated_data.get("email", "")),
+            password=password_hash,
         )
+        user.save()
         return user
+
+
+class LoginSerializer(serializers.Serializer):
+    """Credentials accepted by, and tokens returned from, the login endpoint."""
+
+    username = serializers.CharField(write_only=True)
+    password = serializers.CharField(write_only=True, trim_whitespace=False, style={"input_type": "password"})
+    refresh = serializers.CharField(read_only=True)
+    access = serializers.CharField(read_only=True)
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Rotate refresh tokens through the cached, single-statement blacklist.
+
+    Each refresh also starts the periodic purge of expired tokens when it is due.
+    """
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        """Rotate the token and schedule the expired-token purge."""
+        data = super().validate(attrs)
+        schedule_purge()
+        return data
@@ -0,0 +1,24 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .blacklist import blacklist_token, is_blacklisted
+
+
+class RefreshToken(tokens.RefreshToken):
+    """Refresh token whose blacklist checks and writes go through ``users.blacklist``."""
+
+    def check_blacklist(self):
+        """Raise ``TokenError`` if this token is blacklisted."""
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Blacklist this token, raising ``TokenError`` if that already happened.
+
+        Raising here makes a refresh token that is replayed concurrently
+        rotate only once.
+        """
+        if not blacklist_token(self):
+            raise TokenError(_("Token is blacklisted"))
@@ -1,32 +1,84 @@
+import asyncio
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.contrib.auth.models import update_last_login
 from drf_spectacular.utils import extend_schema
-from rest_framework import generics, permissions, status
+from rest_framework import permissions, status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenObtainSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .passwords import aauthenticate, ahash_password
+from .serializers import LoginSerializer, RegisterSerializer
+from .tokens import RefreshToken
+
+
+class AsyncAPIView(APIView):
+    """``APIView`` whose handlers are coroutines, for use under ASGI.
+
+    DRF's parsing, permission checks, exception handling and rendering run
+    around the handler as usual. They run on the event loop, so subclasses
+    must not use authentication or throttling that queries the database.
+    """
 
-from .serializers import RegisterSerializer
+    view_is_async = True
 
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Return the view marked as a coroutine function for Django's handlers."""
+        return markcoroutinefunction(super().as_view(**initkwargs))
 
-class RegisterView(generics.CreateAPIView):
+    async def dispatch(self, request, *args, **kwargs):
+        """Async ``APIView.dispatch``: await the handler between DRF's usual steps."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            self.initial(request, *args, **kwargs)
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), handler)
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class RegisterView(AsyncAPIView):
     """Register a new user and return JWT tokens.
 
     **POST /api/auth/register/**
 
     No authentication required. Returns access and refresh tokens upon
-    successful registration so the user is immediately logged in.
+    successful registration so the user is immediately logged in. The
+    password is hashed on the password pool (see ``users.passwords``).
     """
 
-    serializer_class = RegisterSerializer
+    authentication_classes = ()
     permission_classes = [permissions.AllowAny]
 
-    @extend_schema(description="Register a new user account.")
-    def create(self, request, *args, **kwargs):
+    @extend_schema(
+        request=RegisterSerializer,
+        responses={201: RegisterSerializer},
+        description="Register a new user account.",
+    )
+    async def post(self, request):
         """Handle user registration and return JWT tokens."""
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        serializer = RegisterSerializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        password_hash = await ahash_password(serializer.validated_data["password"])
+        user = await sync_to_async(serializer.save)(password_hash=password_hash)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = await sync_to_async(RefreshToken.for_user)(user)
 
         return Response(
             {
@@ -44,6 +96,46 @@ class RegisterView(generics.CreateAPIView):
         )
 
 
+class LoginView(AsyncAPIView):
+    """Exchange credentials for a JWT refresh / access token pair.
+
+    **POST /api/auth/login/**
+
+    Behaves like simplejwt's ``TokenObtainPairView``, but the password is
+    checked on the password pool and rehashed there when the hasher
+    settings have changed since it was stored.
+    """
+
+    authentication_classes = ()
+    permission_classes = [permissions.AllowAny]
+
+    def get_authenticate_header(self, request):
+        """Keep failed logins at 401 even though the view authenticates nobody."""
+        return f'{jwt_settings.AUTH_HEADER_TYPES[0]} realm="api"'
+
+    @extend_schema(
+        request=LoginSerializer,
+        responses={200: LoginSerializer},
+        description="Obtain JWT tokens.",
+    )
+    async def post(self, request):
+        """Authenticate the credentials and return a token pair."""
+        serializer = LoginSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = await aauthenticate(**serializer.validated_data, request=request)
+        if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                TokenObtainSerializer.default_error_messages["no_active_account"],
+                "no_active_account",
+            )
+
+        refresh = await sync_to_async(RefreshToken.for_user)(user)
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            await sync_to_async(update_last_login)(None, user)
+
+        return Response({"refresh": str(refresh), "access": str(refresh.access_token)})
+
+
 class LogoutView(APIView):
     """Blacklist the provided refresh token to log out the user.
 